@@ -0,0 +1,315 @@
+"""Differential testing of every RSI implementation against the reference.
+
+lib.rsi.calculate_rsi is the reference. Every entry of IMPLEMENTATIONS is
+run on the same seeded series and checked against it according to its
+mode:
+
+    exact  bit-identical values and the same warm-up (None) positions
+    fast   the same warm-up positions and every value within
+           lib.numpy_backend.FAST_MAX_ABS_ERROR
+
+Chunked implementations split the series at random boundaries (and
+serialize RSIStream state through JSON at each one, as checkpoints do), so
+chunk-boundary handling is covered by the same comparison.
+
+Usage:
+    python src/bench/differential.py
+    python src/bench/differential.py --bars 10000000 --periods 2,14,200 --seeds 1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from array import array
+
+# Add src directory to path so lib and bench modules can be imported
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from lib.indicators import compute_indicators, parse_indicator_specs
+from lib.rsi import RSIStream, calculate_rsi, calculate_rsi_multi
+
+try:
+    from lib import numpy_backend
+except ImportError:
+    numpy_backend = None
+
+EXACT = "exact"
+FAST = "fast"
+
+# Matches numpy_backend.FAST_MAX_ABS_ERROR; repeated so the harness runs
+# without NumPy
+FAST_MAX_ABS_ERROR = 1e-9
+
+DEFAULT_BARS = 100000
+DEFAULT_PERIODS = (2, 14, 50)
+DEFAULT_SEEDS = 2
+
+_NAN = float("nan")
+
+
+def _random_walk(n, rng):
+    price, prices = 100.0, []
+    for _ in range(n):
+        prices.append(price)
+        price = max(0.01, price + rng.gauss(0, 1))
+    return prices
+
+
+def _geometric_walk(n, rng):
+    # Volatile enough to cover prices from about 1e-6 to 1e9, bounded there
+    price, prices = 1.0, []
+    for _ in range(n):
+        prices.append(price)
+        price = min(1e9, max(1e-6, price * (1 + rng.gauss(0, 0.05))))
+    return prices
+
+
+def _flat(n, rng):
+    return [rng.uniform(1, 1000)] * n
+
+
+def _all_gains(n, rng):
+    start = rng.uniform(1, 1000)
+    return [start + i * 0.25 for i in range(n)]
+
+
+def _all_losses(n, rng):
+    start = n * 0.25 + rng.uniform(1, 1000)
+    return [start - i * 0.25 for i in range(n)]
+
+
+def _flat_with_spikes(n, rng):
+    # Flat stretches of thousands of bars decay the averages toward the
+    # subnormal range, where precision is lost
+    prices, price = [], 100.0
+    while len(prices) < n:
+        prices.extend([price] * rng.randint(1, 20000))
+        price += rng.choice((-1.0, 1.0)) * rng.uniform(0.01, 5)
+    return prices[:n]
+
+
+def _tiny_changes(n, rng):
+    price, prices = 100.0, []
+    for _ in range(n):
+        prices.append(price)
+        price += rng.choice((-1, 0, 1)) * 1e-11
+    return prices
+
+
+def _alternating(n, rng):
+    step = rng.uniform(0.01, 2)
+    return [100.0 + (i % 2) * step for i in range(n)]
+
+
+# Series generators: name -> function(n, rng) returning n close prices
+SERIES = {
+    "random_walk": _random_walk,
+    "geometric": _geometric_walk,
+    "flat": _flat,
+    "all_gains": _all_gains,
+    "all_losses": _all_losses,
+    "flat_with_spikes": _flat_with_spikes,
+    "tiny_changes": _tiny_changes,
+    "alternating": _alternating,
+}
+
+
+def _rsi_multi(close, period, rng):
+    return calculate_rsi_multi(close, [period, period + 1])[0]
+
+
+def _rsi_stream(close, period, rng):
+    update = RSIStream(period).update
+    return [update(price)[0] for price in close]
+
+
+def _rsi_stream_chunked(close, period, rng):
+    """RSIStream resumed from a JSON checkpoint at random chunk boundaries."""
+    stream = RSIStream(period)
+    values = []
+    start = 0
+    while start < len(close):
+        stop = start + rng.choice((1, period, period + 1, rng.randint(1, 5000)))
+        update = stream.update
+        values.extend(update(price)[0] for price in close[start:stop])
+        stream = RSIStream.from_dict(json.loads(json.dumps(stream.to_dict())))
+        start = stop
+    return values
+
+
+def _indicators(close, period, rng):
+    specs = parse_indicator_specs(f"rsi:{period}")
+    return compute_indicators({"close": close}, specs)[f"rsi_{period}"]
+
+
+def _numpy(exact):
+    def run(close, period, rng):
+        return _none_gaps(numpy_backend.calculate_rsi(close, period, exact=exact).tolist())
+    return run
+
+
+def _numpy_matrix(exact):
+    def run(close, period, rng):
+        matrix = numpy_backend.calculate_rsi_matrix(close, [period + 1, period], exact=exact)
+        return _none_gaps(matrix[:, 1].tolist())
+    return run
+
+
+# Implementations under test: name -> (mode, function(close, period, rng))
+IMPLEMENTATIONS = {
+    "rsi_multi": (EXACT, _rsi_multi),
+    "rsi_stream": (EXACT, _rsi_stream),
+    "rsi_stream_chunked": (EXACT, _rsi_stream_chunked),
+    "indicators": (EXACT, _indicators),
+}
+if numpy_backend is not None:
+    IMPLEMENTATIONS.update({
+        "numpy_exact": (EXACT, _numpy(True)),
+        "numpy_matrix_exact": (EXACT, _numpy_matrix(True)),
+        "numpy_fast": (FAST, _numpy(False)),
+        "numpy_matrix_fast": (FAST, _numpy_matrix(False)),
+    })
+
+
+def compare(expected, actual, mode):
+    """Compare one implementation's RSI values with the reference's.
+
+    Args:
+        expected: Reference values (floats, None during warm-up).
+        actual: Values to check, the same shape.
+        mode: EXACT or FAST.
+
+    Returns:
+        Dict with "ok", "mismatches" (values breaking the mode's guarantee),
+        "first_mismatch" (index or None) and "max_abs_error".
+    """
+    if len(actual) != len(expected):
+        return {"ok": False, "mismatches": max(len(actual), len(expected)),
+                "first_mismatch": min(len(actual), len(expected)), "max_abs_error": None}
+    expected_bits = array("d", [_NAN if v is None else v for v in expected])
+    actual_bits = array("d", [_NAN if v is None else v for v in actual])
+    if expected_bits.tobytes() == actual_bits.tobytes():
+        return {"ok": True, "mismatches": 0, "first_mismatch": None, "max_abs_error": 0.0}
+
+    tolerance = 0.0 if mode == EXACT else FAST_MAX_ABS_ERROR
+    mismatches = 0
+    first = None
+    max_error = 0.0
+    for i, (e, a) in enumerate(zip(expected, actual)):
+        if e is None or a is None:
+            bad = (e is None) != (a is None)
+        else:
+            error = abs(a - e)
+            max_error = max(max_error, error)
+            bad = error > tolerance or (mode == EXACT and _bits(a) != _bits(e))
+        if bad:
+            mismatches += 1
+            if first is None:
+                first = i
+    return {"ok": not mismatches, "mismatches": mismatches, "first_mismatch": first,
+            "max_abs_error": max_error}
+
+
+def check(close_prices, period, names=None, seed=0):
+    """Run implementations on one series and compare each with the reference.
+
+    Args:
+        close_prices: List of closing prices.
+        period: RSI period.
+        names: IMPLEMENTATIONS keys to run (default: all).
+        seed: Seed for the chunk boundaries of chunked implementations.
+
+    Returns:
+        Dict mapping implementation name to its compare() result plus
+        "mode".
+    """
+    expected = calculate_rsi(close_prices, period)
+    results = {}
+    for name in names or IMPLEMENTATIONS:
+        mode, run = IMPLEMENTATIONS[name]
+        actual = run(close_prices, period, random.Random(seed))
+        results[name] = dict(compare(expected, actual, mode), mode=mode)
+    return results
+
+
+def run(bars=DEFAULT_BARS, periods=DEFAULT_PERIODS, seeds=DEFAULT_SEEDS, series=None,
+        names=None, log=None):
+    """Check every implementation on every series kind, period and seed.
+
+    Args:
+        bars: Length of each generated series.
+        periods: RSI periods.
+        seeds: Number of seeds per series kind.
+        series: SERIES keys to generate (default: all).
+        names: IMPLEMENTATIONS keys to run (default: all).
+        log: Optional callable receiving one line of text per check.
+
+    Returns:
+        List of failure dicts with "series", "seed", "period", "name" and
+        the compare() fields.
+    """
+    failures = []
+    for kind in series or SERIES:
+        for seed in range(seeds):
+            close = SERIES[kind](bars, random.Random(seed))
+            for period in periods:
+                for name, result in check(close, period, names, seed).items():
+                    if log is not None:
+                        log(f"{kind:18} seed={seed} period={period:<4} {name:20} "
+                            f"{result['mode']:5} {'ok' if result['ok'] else 'FAIL':4} "
+                            f"max_abs_error={result['max_abs_error']}")
+                    if not result["ok"]:
+                        failures.append(dict(result, series=kind, seed=seed,
+                                             period=period, name=name))
+    return failures
+
+
+def _bits(value):
+    return array("d", [value]).tobytes()
+
+
+def _none_gaps(values):
+    return [None if v != v else v for v in values]
+
+
+def _parse_ints(text):
+    return [int(part) for part in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check every RSI implementation against the reference loop")
+    parser.add_argument("--bars", type=int, default=DEFAULT_BARS,
+                        help=f"Bars per generated series (default: {DEFAULT_BARS})")
+    parser.add_argument("--periods", type=_parse_ints, default=list(DEFAULT_PERIODS),
+                        help="Comma-separated RSI periods (default: "
+                             f"{','.join(map(str, DEFAULT_PERIODS))})")
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS,
+                        help=f"Seeds per series kind (default: {DEFAULT_SEEDS})")
+    parser.add_argument("--series", type=lambda text: text.split(","), default=None,
+                        help=f"Series kinds to generate (default: all of {', '.join(SERIES)})")
+    parser.add_argument("--implementations", type=lambda text: text.split(","),
+                        default=None,
+                        help="Implementations to check (default: all of "
+                             f"{', '.join(IMPLEMENTATIONS)})")
+    args = parser.parse_args(argv)
+    for name in args.implementations or ():
+        if name not in IMPLEMENTATIONS:
+            parser.error(f"unknown implementation {name!r}")
+    for kind in args.series or ():
+        if kind not in SERIES:
+            parser.error(f"unknown series {kind!r}")
+
+    failures = run(args.bars, args.periods, args.seeds, args.series, args.implementations,
+                   log=print)
+    if failures:
+        print(f"{len(failures)} checks FAILED", file=sys.stderr)
+        sys.exit(1)
+    print("All checks passed")
+
+
+if __name__ == "__main__":
+    main()
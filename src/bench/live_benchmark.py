@@ -0,0 +1,84 @@
+"""Benchmark the live service: sustained ticks/s and tick-to-signal latency.
+
+Drives LiveSignalService with the synthetic stand-in feed for many symbols
+on a single event loop (one core) and reports p50/p99 latency.
+
+Usage:
+    python src/bench/live_benchmark.py --symbols 10000 --ticks 20
+    python src/bench/live_benchmark.py --symbols 10000 --rate 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add src directory to path so lib modules can be imported
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from lib.live import DEFAULT_QUEUE_SIZE, LiveSignalService, synthetic_feed
+
+
+def run_live_benchmark(symbols=10000, ticks_per_symbol=20, rate=None,
+                       queue_size=DEFAULT_QUEUE_SIZE, seed=0):
+    """Feed synthetic ticks through the service and measure it.
+
+    Args:
+        symbols: Number of symbols.
+        ticks_per_symbol: Ticks per symbol.
+        rate: Optional offered load in ticks/s; None measures peak throughput,
+            where latency includes queueing behind the backlog.
+        queue_size: Capacity of each symbol's queue.
+        seed: Synthetic feed seed.
+
+    Returns:
+        Dict with symbols, ticks, seconds, ticks_per_second, p50 and p99.
+    """
+    async def run():
+        service = LiveSignalService(queue_size=queue_size)
+        start = time.perf_counter()
+        await synthetic_feed(service, symbols, ticks_per_symbol, seed, rate)
+        await service.close()
+        elapsed = time.perf_counter() - start
+        stats = service.stats()
+        return {
+            "symbols": stats["symbols"],
+            "ticks": stats["ticks"],
+            "seconds": elapsed,
+            "ticks_per_second": stats["ticks"] / elapsed if elapsed else None,
+            "p50": stats["p50"],
+            "p99": stats["p99"],
+        }
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the live signal service")
+    parser.add_argument("--symbols", type=int, default=10000,
+                        help="Number of symbols (default: 10000)")
+    parser.add_argument("--ticks", type=int, default=20,
+                        help="Ticks per symbol (default: 20)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Offered load in ticks/s (default: as fast as possible)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Per-symbol queue capacity (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic feed seed (default: 0)")
+    parser.add_argument("-o", "--output", default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    result = run_live_benchmark(args.symbols, args.ticks, args.rate, args.queue_size,
+                                args.seed)
+    print(f"{result['ticks']} ticks for {result['symbols']} symbols in "
+          f"{result['seconds']:.2f} s: {result['ticks_per_second']:,.0f} ticks/s, "
+          f"p50 {result['p50'] * 1e6:.0f} us, p99 {result['p99'] * 1e6:.0f} us")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
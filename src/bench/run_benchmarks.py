@@ -0,0 +1,246 @@
+"""Benchmark every pipeline stage on seeded synthetic OHLCV data.
+
+Times each stage (best of --repeat runs) and records its peak traced memory
+in a separate tracemalloc run, then writes the results as JSON. Comparing
+against a stored baseline fails the run when any stage regresses by more
+than the threshold.
+
+Usage:
+    python src/bench/run_benchmarks.py --sizes 1000,100000 -o bench_results.json
+    python src/bench/run_benchmarks.py --save-baseline bench_baseline.json
+    python src/bench/run_benchmarks.py --baseline bench_baseline.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add src directory to path so lib and bench modules can be imported
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import main as main_module
+from bench.synthetic import cached_csv
+from lib.backtest import backtest
+from lib.csv_reader import read_csv, read_csv_columns
+from lib.json_writer import write_json, write_signal_rows
+from lib.mmap_reader import scan_column
+from lib.pipeline import make_row
+from lib.rsi import calculate_rsi
+from lib.signals import encode_signals, generate_signals
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_THRESHOLD = 0.25
+
+# Stages faster than this are compared as if they took this long, so timer
+# noise on microsecond stages does not count as a regression.
+MIN_COMPARED_SECONDS = 0.005
+
+
+def build_stages(csv_path, output_path):
+    """Prepare inputs for every stage and return [(name, callable)].
+
+    Inputs are computed up front so each callable times only its own stage.
+    """
+    columns = read_csv_columns(csv_path, ("date", "close"))
+    dates = columns["date"]
+    close_prices = list(columns["close"])
+    rsi_values = calculate_rsi(close_prices)
+    signals = generate_signals(rsi_values)
+    codes, _ = encode_signals(rsi_values)
+    rows = [make_row(d, c, r, s) for d, c, r, s in zip(dates, close_prices, rsi_values, signals)]
+    records = [{"date": d, "close": c, "rsi": r, "signal": s} for d, c, r, s in rows]
+
+    stages = [
+        ("read_csv", lambda: read_csv(csv_path)),
+        ("read_csv_columns", lambda: read_csv_columns(csv_path, ("date", "close"))),
+        ("scan_column", lambda: scan_column(csv_path)),
+        ("calculate_rsi", lambda: calculate_rsi(close_prices)),
+        ("generate_signals", lambda: generate_signals(rsi_values)),
+        ("encode_signals", lambda: encode_signals(rsi_values)),
+        ("backtest", lambda: backtest(close_prices, codes)),
+        ("write_json", lambda: write_json(records, output_path)),
+        ("write_signal_rows", lambda: write_signal_rows(rows, output_path)),
+        ("main", lambda: _run_main([csv_path, "-o", output_path])),
+        ("main --stream", lambda: _run_main([csv_path, "-o", output_path, "--stream"])),
+    ]
+    try:
+        from lib import numpy_backend
+    except ImportError:
+        pass
+    else:
+        stages.insert(3, ("calculate_rsi[numpy]",
+                          lambda: numpy_backend.calculate_rsi(close_prices)))
+    return stages
+
+
+def run_benchmarks(sizes, repeat=3, seed=0, data_dir=None):
+    """Benchmark every stage for each input size.
+
+    Args:
+        sizes: Row counts to benchmark.
+        repeat: Timed runs per stage; the fastest is reported.
+        seed: Seed for the synthetic data.
+        data_dir: Where synthetic CSVs are generated and reused (default:
+            a directory under the system temp dir).
+
+    Returns:
+        Results dict: {"meta": {...}, "results": [{"stage", "rows",
+        "seconds", "rows_per_second", "peak_bytes"}, ...]}.
+    """
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "rsi_bench_data")
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "output.json")
+        for rows in sizes:
+            csv_path = cached_csv(data_dir, rows, seed)
+            for name, func in build_stages(csv_path, output_path):
+                seconds = min(_time_once(func) for _ in range(repeat))
+                results.append({
+                    "stage": name,
+                    "rows": rows,
+                    "seconds": seconds,
+                    "rows_per_second": rows / seconds if seconds else None,
+                    "peak_bytes": _peak_memory(func),
+                })
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare benchmark results against a baseline.
+
+    A stage regresses when its time or peak memory exceeds the baseline by
+    more than `threshold` (a fraction, e.g. 0.25 = 25%). Stages missing from
+    either side are ignored.
+
+    Returns:
+        List of regression dicts: {"stage", "rows", "metric", "baseline",
+        "current", "ratio"}.
+    """
+    base = {(r["stage"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        reference = base.get((result["stage"], result["rows"]))
+        if reference is None:
+            continue
+        for metric, floor in (("seconds", MIN_COMPARED_SECONDS), ("peak_bytes", 1)):
+            before = max(reference[metric], floor)
+            after = max(result[metric], floor)
+            if after > before * (1.0 + threshold):
+                regressions.append({
+                    "stage": result["stage"],
+                    "rows": result["rows"],
+                    "metric": metric,
+                    "baseline": reference[metric],
+                    "current": result[metric],
+                    "ratio": after / before,
+                })
+    return regressions
+
+
+def format_table(results):
+    """Format results as a fixed-width text table."""
+    lines = [f"{'stage':<22} {'rows':>10} {'seconds':>10} {'rows/s':>12} {'peak MB':>9}"]
+    for r in results["results"]:
+        rate = f"{r['rows_per_second']:,.0f}" if r["rows_per_second"] else "-"
+        lines.append(f"{r['stage']:<22} {r['rows']:>10} {r['seconds']:>10.4f} "
+                     f"{rate:>12} {r['peak_bytes'] / 2**20:>9.2f}")
+    return "\n".join(lines)
+
+
+def _time_once(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _peak_memory(func):
+    """Peak traced allocation size while func runs, in bytes."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _run_main(argv):
+    """Run main.main() in-process with the given arguments, discarding output."""
+    saved = sys.argv
+    sys.argv = ["main.py"] + argv
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main_module.main()
+    finally:
+        sys.argv = saved
+
+
+def _parse_sizes(text):
+    try:
+        sizes = [int(part) for part in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid sizes: {text!r}")
+    if any(size < 1 for size in sizes):
+        raise argparse.ArgumentTypeError(f"sizes must be positive: {text!r}")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signal pipeline stages")
+    parser.add_argument("--sizes", type=_parse_sizes, default=list(DEFAULT_SIZES),
+                        help="Comma-separated row counts, 1000 to 10000000 "
+                             f"(default: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per stage; the fastest counts (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed (default: 0)")
+    parser.add_argument("--data-dir", default=None,
+                        help="Directory for generated CSV inputs (default: system temp)")
+    parser.add_argument("-o", "--output", default="bench_results.json",
+                        help="Results JSON file (default: bench_results.json)")
+    parser.add_argument("--baseline", default=None,
+                        help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown/memory growth as a fraction "
+                             f"(default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--save-baseline", default=None,
+                        help="Also write the results to this baseline file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeat, args.seed, args.data_dir)
+    print(format_table(results))
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+    print(f"Wrote results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} @ {r['rows']} rows: {r['metric']} "
+                  f"{r['baseline']:.6g} -> {r['current']:.6g} ({r['ratio']:.2f}x)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
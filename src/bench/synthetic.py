@@ -0,0 +1,76 @@
+"""Seeded synthetic OHLCV data for benchmarks and large-input tests."""
+
+import math
+import os
+import random
+from datetime import datetime, timedelta
+
+HEADER = "date,open,high,low,close,volume\n"
+
+# Bars start here and advance by `step_seconds` each row
+START = datetime(2020, 1, 1)
+
+
+def generate_rows(n, seed=0, step_seconds=60, start_price=100.0):
+    """Yield n CSV data lines of a seeded geometric random walk.
+
+    Every bar is internally consistent (low <= open, close <= high) and the
+    same (n, seed, step_seconds) always yields the same lines.
+
+    Args:
+        n: Number of rows.
+        seed: Random seed.
+        step_seconds: Time between consecutive bars (default: 1 minute).
+        start_price: Opening price of the first bar.
+
+    Yields:
+        Lines like "2020-01-01 00:00:00,100.00,100.31,99.87,100.12,48211\\n".
+    """
+    rng = random.Random(seed)
+    gauss = rng.gauss
+    uniform = rng.random
+    step = timedelta(seconds=step_seconds)
+    timestamp = START
+    close = start_price
+    for _ in range(n):
+        open_ = close
+        close = max(0.01, open_ * math.exp(gauss(0.0, 0.01)))
+        high = max(open_, close) * (1.0 + uniform() * 0.005)
+        low = min(open_, close) * (1.0 - uniform() * 0.005)
+        volume = int(1000 + uniform() * 99000)
+        yield (f"{timestamp:%Y-%m-%d %H:%M:%S},{open_:.2f},{high:.2f},"
+               f"{low:.2f},{close:.2f},{volume}\n")
+        timestamp += step
+
+
+def write_csv(filepath, n, seed=0, step_seconds=60):
+    """Write a synthetic OHLCV CSV file with n data rows.
+
+    Returns:
+        filepath.
+    """
+    with open(filepath, "w") as f:
+        f.write(HEADER)
+        batch = []
+        for line in generate_rows(n, seed, step_seconds):
+            batch.append(line)
+            if len(batch) == 10000:
+                f.write("".join(batch))
+                batch = []
+        f.write("".join(batch))
+    return filepath
+
+
+def cached_csv(directory, n, seed=0, step_seconds=60):
+    """Return a synthetic CSV in `directory`, generating it only once.
+
+    Files are named by their parameters, so repeated benchmark runs reuse
+    the same inputs instead of regenerating millions of rows.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"ohlcv_{n}_{seed}_{step_seconds}.csv")
+    if not os.path.exists(path):
+        tmp_path = path + ".tmp"
+        write_csv(tmp_path, n, seed, step_seconds)
+        os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,218 @@
+"""Backtester for generated signals, and a parallel parameter grid over it.
+
+The strategy is long/flat: a BUY enters a long position at that bar's
+close, a SELL exits at that bar's close, HOLD and pending bars keep the
+current position. An optional fee is charged as a fraction of equity on
+every entry and exit. A position still open on the last bar is marked to
+its close.
+
+Only BUY and SELL bars change anything, so backtest() jumps between them
+with bytes.find over the signal codes and never builds per-bar records.
+Equity inside a long segment is proportional to the close, so drawdown is
+taken from a running maximum of the segment's prices (itertools.accumulate)
+and flat segments cost nothing at all.
+"""
+
+import os
+from array import array
+from itertools import accumulate
+from operator import truediv
+
+from lib.csv_reader import read_csv_columns
+from lib.json_writer import write_json
+from lib.mmap_reader import scan_column
+from lib.profiling import NULL_PROFILER
+from lib.rsi import calculate_rsi, calculate_rsi_multi
+from lib.signals import BUY, SELL, encode_signals
+
+# Keys of the metrics dict returned by backtest, in output order
+METRIC_KEYS = ("bars", "trades", "wins", "total_return", "max_drawdown", "exposure")
+
+_BUY = bytes([BUY])
+_SELL = bytes([SELL])
+
+
+def backtest(close_prices, codes, fee=0.0):
+    """Simulate a long/flat strategy over one close series and its signals.
+
+    Args:
+        close_prices: Sequence of closing prices (array('d'), list or "d"
+            memoryview).
+        codes: array('b') (or bytes) of lib.signals codes, one per bar.
+        fee: Fraction of equity paid on each entry and each exit, in [0, 1).
+
+    A BUY at a non-positive (or NaN) close cannot be entered and is skipped.
+
+    Returns:
+        Dict with keys METRIC_KEYS: bars, trades (entries, including a
+        position still open at the end), wins (trades that ended with more
+        equity than they started with, after fees), total_return (final
+        equity / 1 - 1), max_drawdown (largest peak-to-trough fall of
+        equity, as a positive fraction) and exposure (fraction of
+        bar-to-bar intervals spent long).
+
+    Raises:
+        ValueError: If the inputs differ in length or fee is outside [0, 1).
+    """
+    n = len(close_prices)
+    if len(codes) != n:
+        raise ValueError(f"Got {n} close prices but {len(codes)} signal codes")
+    if not 0.0 <= fee < 1.0:
+        raise ValueError(f"Fee must be at least 0 and below 1, got {fee}")
+    raw = bytes(codes)
+    keep = 1.0 - fee
+
+    equity = peak = 1.0
+    max_drawdown = 0.0
+    trades = wins = held = 0
+    entry = raw.find(_BUY)
+    while entry >= 0:
+        entry_price = close_prices[entry]
+        if not entry_price > 0:
+            entry = raw.find(_BUY, entry + 1)
+            continue
+        exit_ = raw.find(_SELL, entry + 1)
+        stop = exit_ if exit_ >= 0 else n - 1
+        start_equity = equity
+        entry_equity = equity * keep
+
+        # In price units the previous equity peak is peak * entry_price /
+        # entry_equity, so equity / peak == price / running max of prices.
+        segment = close_prices[entry:stop + 1]
+        running_max = accumulate(segment, max, initial=peak * entry_price / entry_equity)
+        next(running_max)
+        running_max = list(running_max)
+        max_drawdown = max(max_drawdown, 1.0 - min(map(truediv, segment, running_max)))
+        scale = entry_equity / entry_price
+        peak = running_max[-1] * scale
+        equity = close_prices[stop] * scale
+
+        if exit_ >= 0:
+            equity *= keep
+            max_drawdown = max(max_drawdown, 1.0 - equity / peak)
+        trades += 1
+        wins += equity > start_equity
+        held += stop - entry
+        entry = raw.find(_BUY, stop + 1) if exit_ >= 0 else -1
+
+    return {
+        "bars": n,
+        "trades": trades,
+        "wins": wins,
+        "total_return": equity - 1.0,
+        "max_drawdown": max_drawdown,
+        "exposure": held / (n - 1) if n > 1 else 0.0,
+    }
+
+
+def run_grid(close_prices, periods, thresholds, fee=0.0, workers=None):
+    """Backtest every RSI period crossed with every threshold pair.
+
+    In one process, price changes are shared by all periods (see
+    calculate_rsi_multi). With several workers, each task is one period:
+    the close prices are placed once in a read-only
+    multiprocessing.shared_memory block that workers attach to by name,
+    so the price column is never pickled.
+
+    Args:
+        close_prices: Sequence of closing prices.
+        periods: List of RSI periods.
+        thresholds: List of (lower, upper) threshold pairs.
+        fee: Fraction of equity paid per entry and exit (see backtest).
+        workers: Worker processes (default: os.cpu_count()); 1 runs in this
+            process.
+
+    Returns:
+        List of dicts, one per (period, lower, upper) in period-major
+        order, each with "period", "lower", "upper" and the backtest
+        metrics.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(periods))
+    if workers == 1:
+        rsi_columns = calculate_rsi_multi(close_prices, periods)
+        return [result for period, rsi in zip(periods, rsi_columns)
+                for result in _backtest_thresholds(close_prices, rsi, period, thresholds, fee)]
+    return _run_grid_shared(close_prices, periods, thresholds, fee, workers)
+
+
+def run_backtest(csv_path, output_path, periods, thresholds, fee=0.0, workers=None,
+                 fmt="json", compact=False, cache=None, profiler=NULL_PROFILER,
+                 errors=None):
+    """Read a CSV's close prices, run the grid and write one result per combination.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path for the run_grid results.
+        periods: List of RSI periods.
+        thresholds: List of (lower, upper) threshold pairs.
+        fee: Fraction of equity paid per entry and exit.
+        workers: Worker processes for run_grid.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        cache: Optional lib.cache.ColumnCache to load parsed columns from.
+            Without one, the closes are read by lib.mmap_reader.scan_column.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising, and the column
+            cache is bypassed.
+
+    Returns:
+        Tuple (row_count, results) with results as returned by run_grid.
+    """
+    with profiler.stage("read") as stats:
+        if errors is not None:
+            close_prices = read_csv_columns(csv_path, ("close",), errors=errors)["close"]
+        elif cache is not None:
+            close_prices = cache.load(csv_path, ("close",))["close"]
+        else:
+            close_prices = scan_column(csv_path, "close")
+        stats["rows"] = row_count = len(close_prices)
+
+    with profiler.stage("backtest") as stats:
+        results = run_grid(close_prices, periods, thresholds, fee, workers)
+        stats["rows"] = row_count * len(results)
+
+    with profiler.stage("write") as stats:
+        stats["rows"] = write_json(results, output_path, fmt, compact)
+    return row_count, results
+
+
+def _run_grid_shared(close_prices, periods, thresholds, fee, workers):
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    prices = close_prices if isinstance(close_prices, array) else array("d", close_prices)
+    n = len(prices)
+    block = shared_memory.SharedMemory(create=True, size=max(8 * n, 1))
+    try:
+        block.buf[:8 * n] = memoryview(prices).cast("B")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_grid_worker, block.name, n, period, thresholds, fee)
+                       for period in periods]
+            return [result for future in futures for result in future.result()]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _grid_worker(name, n, period, thresholds, fee):
+    """Worker: attach to the shared close prices and backtest one period."""
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name)
+    results = _backtest_thresholds(block.buf[:8 * n].cast("d"), None, period, thresholds, fee)
+    block.close()
+    return results
+
+
+def _backtest_thresholds(close_prices, rsi, period, thresholds, fee):
+    """Backtest one period's RSI (computed here if None) for each threshold pair."""
+    if rsi is None:
+        rsi = calculate_rsi(close_prices, period)
+    results = []
+    for lower, upper in thresholds:
+        codes, _ = encode_signals(rsi, lower, upper)
+        result = {"period": period, "lower": lower, "upper": upper}
+        result.update(backtest(close_prices, codes, fee))
+        results.append(result)
+    return results
@@ -0,0 +1,131 @@
+"""Batch mode: run the signal pipeline over many CSV files in a process pool."""
+
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from lib.pipeline import SIGNALS, run_in_memory, run_streaming
+
+SUMMARY_FILENAME = "summary.json"
+
+
+def find_inputs(pattern):
+    """Expand a directory or glob pattern into a sorted list of CSV paths.
+
+    Args:
+        pattern: A directory (all *.csv files directly inside it) or a glob
+            pattern such as "data/*.csv".
+
+    Returns:
+        Sorted list of file paths.
+
+    Raises:
+        FileNotFoundError: If nothing matches.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    paths = sorted(p for p in glob.glob(pattern) if os.path.isfile(p))
+    if not paths:
+        raise FileNotFoundError(f"No CSV files match: {pattern}")
+    return paths
+
+
+def run_batch(inputs, output_dir, workers=None, fmt="json", compact=False, stream=False,
+              cache=None):
+    """Run the pipeline for each input file across a pool of worker processes.
+
+    Each input gets its own output file in `output_dir`, named after the input
+    (sample.csv -> sample.json). A failing file is recorded in the results and
+    does not stop the others. A combined summary is written to
+    `output_dir`/summary.json.
+
+    Args:
+        inputs: List of CSV file paths.
+        output_dir: Directory for per-file outputs and the summary (created if
+            missing).
+        workers: Number of worker processes (default: os.cpu_count()).
+        fmt: Output format, "json" or "jsonl".
+        compact: Write outputs without indentation.
+        stream: Use the chunked streaming pipeline for each file.
+        cache: Optional lib.cache.ColumnCache for parsed inputs (ignored
+            with stream=True).
+
+    Returns:
+        The summary dict: {"files": [...], "totals": {...}, "failed": n}.
+        Each file entry has "input" and "output" plus either "rows" and
+        "signals" or "error".
+
+    Raises:
+        ValueError: If two inputs would write to the same output file, or an
+            input would write the summary's file name.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    extension = ".jsonl" if fmt == "jsonl" else ".json"
+    jobs = []
+    seen = {}
+    for csv_path in inputs:
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        if stem in seen:
+            raise ValueError(
+                f"Inputs {seen[stem]} and {csv_path} would both write {stem}{extension}"
+            )
+        if stem + extension == SUMMARY_FILENAME:
+            raise ValueError(f"Input {csv_path} would write {SUMMARY_FILENAME}, "
+                             "which holds the batch summary")
+        seen[stem] = csv_path
+        output_path = os.path.join(output_dir, stem + extension)
+        jobs.append((csv_path, output_path, fmt, compact, stream, cache))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        results = [_process_file(job) for job in jobs]
+    else:
+        # Hand out several files per task so thousands of small files do not
+        # pay one round trip each
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_process_file, jobs, chunksize=chunksize))
+
+    summary = _summarize(results)
+    with open(os.path.join(output_dir, SUMMARY_FILENAME), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def _process_file(job):
+    """Worker: run one file through the pipeline, capturing its error if any."""
+    csv_path, output_path, fmt, compact, stream, cache = job
+    result = {"input": csv_path, "output": output_path}
+    try:
+        if stream:
+            rows, counts = run_streaming(csv_path, output_path, fmt=fmt, compact=compact)
+        else:
+            rows, counts = run_in_memory(csv_path, output_path, fmt=fmt, compact=compact,
+                                         cache=cache)
+    except Exception as e:  # one bad file must not abort the batch
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    result["rows"] = rows
+    result["signals"] = _signal_counts(counts)
+    return result
+
+
+def _signal_counts(counts):
+    """Convert pipeline counts (None = pending) to JSON-friendly keys."""
+    return {("pending" if s is None else s): counts[s] for s in SIGNALS}
+
+
+def _summarize(results):
+    totals = {"files": 0, "rows": 0}
+    totals.update(_signal_counts(dict.fromkeys(SIGNALS, 0)))
+    failed = 0
+    for result in results:
+        if "error" in result:
+            failed += 1
+            continue
+        totals["files"] += 1
+        totals["rows"] += result["rows"]
+        for key, value in result["signals"].items():
+            totals[key] += value
+    return {"files": results, "totals": totals, "failed": failed}
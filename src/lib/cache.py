@@ -0,0 +1,185 @@
+"""On-disk cache of parsed CSV columns in the binary columnar format."""
+
+import hashlib
+import os
+
+from lib.colfile import read_columns, write_columns
+from lib.csv_reader import COLUMN_ORDER, read_csv_columns
+
+# Bump when the cached layout or parsing rules change
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIRNAME = ".rsi_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".col"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+class ColumnCache:
+    """Cache of parsed OHLCV columns, one binary file per CSV input.
+
+    Entries are keyed by the input's absolute path and validated against its
+    mtime, size and SHA-256 content hash. When mtime and size are unchanged
+    the entry is trusted without reading the CSV; otherwise the content hash
+    decides, so a touched-but-identical file is still a hit. Cached columns
+    are memory-mapped, so a hit costs no float parsing at all.
+
+    When the cache directory grows past `max_bytes`, the least recently used
+    entries are deleted.
+
+    Attributes:
+        cache_dir: Directory for cache entries, or None to use
+            DEFAULT_CACHE_DIRNAME next to each input file.
+        max_bytes: Size bound for the cache directory.
+        rebuild: Ignore existing entries and re-parse every input.
+        hits: Number of loads served from the cache.
+        misses: Number of loads that parsed the CSV.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, rebuild=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.rebuild = rebuild
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, csv_path, columns=COLUMN_ORDER):
+        """Return the requested columns of `csv_path`, parsing only on a miss.
+
+        A miss parses and caches every column, so later loads of other
+        columns hit too. If a column that was not requested is malformed
+        (e.g. volume "N/A"), only the requested columns are parsed and
+        cached instead, so such a file loads exactly as read_csv_columns
+        would load it.
+
+        Args:
+            csv_path: Input CSV file path.
+            columns: Names of the columns to return.
+
+        Returns:
+            Dict mapping column name to values: memoryviews of float64 for the
+            numeric columns and a StringColumn for "date" on a hit, the
+            read_csv_columns buffers on a miss.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+            ValueError: If the CSV file is invalid (see read_csv_columns).
+        """
+        try:
+            stat = os.stat(csv_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+        entry_path = self.entry_path(csv_path)
+        content_hash = None
+        if not self.rebuild and os.path.exists(entry_path):
+            try:
+                metadata, cached = read_columns(entry_path)
+            except (OSError, ValueError):
+                metadata, cached = {}, {}
+            if metadata.get("version") == CACHE_VERSION and set(columns) <= set(cached):
+                if (metadata["mtime_ns"], metadata["size"]) == (stat.st_mtime_ns, stat.st_size):
+                    self._touch(entry_path)
+                    self.hits += 1
+                    return {name: cached[name] for name in columns}
+                content_hash = file_hash(csv_path)
+                if metadata["sha256"] == content_hash:
+                    # Same bytes with a new mtime: refresh the entry's key
+                    self._store(entry_path, csv_path, stat, content_hash, cached)
+                    self.hits += 1
+                    return {name: cached[name] for name in columns}
+
+        self.misses += 1
+        if content_hash is None:
+            content_hash = file_hash(csv_path)
+        try:
+            parsed = read_csv_columns(csv_path, COLUMN_ORDER)
+        except ValueError:
+            parsed = read_csv_columns(csv_path, columns)
+        if os.stat(csv_path).st_mtime_ns == stat.st_mtime_ns:
+            self._store(entry_path, csv_path, stat, content_hash, parsed)
+        return {name: parsed[name] for name in columns}
+
+    def entry_path(self, csv_path):
+        """Return the cache file path for a CSV input."""
+        abspath = os.path.abspath(csv_path)
+        cache_dir = self.cache_dir or os.path.join(os.path.dirname(abspath),
+                                                   DEFAULT_CACHE_DIRNAME)
+        key = hashlib.sha256(abspath.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(cache_dir, key + _ENTRY_SUFFIX)
+
+    def _store(self, entry_path, csv_path, stat, content_hash, columns):
+        """Write a cache entry, then evict; a read-only cache dir is not an error."""
+        metadata = {
+            "version": CACHE_VERSION,
+            "path": os.path.abspath(csv_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": content_hash,
+        }
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            write_columns(entry_path, {name: columns[name] for name in COLUMN_ORDER
+                                       if name in columns}, metadata)
+            evict(os.path.dirname(entry_path), self.max_bytes, keep=entry_path)
+        except OSError:
+            pass
+
+    def _touch(self, entry_path):
+        """Mark an entry as recently used for LRU eviction."""
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+
+def evict(cache_dir, max_bytes, keep=None, suffix=_ENTRY_SUFFIX):
+    """Delete least recently used entries until the directory fits max_bytes.
+
+    Recency is the entry's mtime, which ColumnCache refreshes on every hit.
+
+    Args:
+        cache_dir: Cache directory.
+        max_bytes: Size bound for all entries together.
+        keep: An entry path that must not be deleted (the one just written).
+        suffix: File name suffix identifying cache entries.
+
+    Returns:
+        Number of entries deleted.
+    """
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total += stat.st_size
+
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.samefile(path, keep):
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def file_hash(filepath):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
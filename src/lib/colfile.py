@@ -0,0 +1,232 @@
+"""Self-contained binary columnar file format with zero-copy mmap reads.
+
+Layout (all integers little-endian):
+
+    magic        8 bytes  b"RSICOL01"
+    header_size  4 bytes  uint32, size of the JSON header that follows
+    header       JSON: {"rows": n, "byteorder": ..., "metadata": {...},
+                        "columns": [{"name", "kind", "offset", "size", ...}]}
+    data         one block per column, each starting on an 8-byte boundary
+
+Column kinds:
+
+    "f8"   float64 values, n * 8 bytes
+    "i1"   int8 values, n bytes
+    "u1"   raw bytes (e.g. a bitmap), any length
+    "str"  UTF-8 strings: a uint64 offsets block of n + 1 entries (kept in
+           "offsets_offset") followed by the concatenated string bytes
+
+Readers map the file and return memoryviews straight into the mapping, so
+numeric columns are never copied or converted to Python objects up front.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"RSICOL01"
+
+_ALIGN = 8
+_ARRAY_KINDS = {"d": "f8", "b": "i1"}
+_KIND_TYPECODES = {"f8": "d", "i1": "b", "u1": "B"}
+
+
+class StringColumn:
+    """Read-only sequence of strings backed by a mapped "str" column block.
+
+    Items are decoded from UTF-8 only when accessed.
+    """
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringColumn index out of range")
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def __iter__(self):
+        offsets = self._offsets
+        data = self._data
+        start = offsets[0]
+        for i in range(1, len(offsets)):
+            end = offsets[i]
+            yield str(data[start:end], "utf-8")
+            start = end
+
+
+def write_columns(filepath, columns, metadata=None):
+    """Write named columns to a columnar file.
+
+    The file is written to a temporary name and renamed into place, so
+    readers never observe a partially written file.
+
+    Args:
+        filepath: Output file path.
+        columns: Dict (in column order) mapping name to values. Supported
+            values: array('d') -> "f8", array('b') -> "i1" (or memoryviews
+            of those formats, e.g. from read_columns), bytes or
+            bytearray -> "u1", and a list (or StringColumn, or DateColumn) of
+            str -> "str".
+        metadata: Optional JSON-serializable dict stored in the header.
+
+    Raises:
+        ValueError: If a column type is unsupported or the numeric columns
+            differ in length.
+    """
+    rows = None
+    blocks = []
+    entries = []
+    for name, values in columns.items():
+        entry = {"name": name}
+        typecode = getattr(values, "typecode", None) or getattr(values, "format", None)
+        if isinstance(values, (array, memoryview)) and typecode in _ARRAY_KINDS:
+            entry["kind"] = _ARRAY_KINDS[typecode]
+            payload = [values.tobytes()]
+            length = len(values)
+        elif isinstance(values, (bytes, bytearray)):
+            entry["kind"] = "u1"
+            payload = [bytes(values)]
+            length = None
+        elif hasattr(values, "string_blocks"):
+            # Already packed as offsets and bytes, e.g. a lib.csv_reader.DateColumn
+            entry["kind"] = "str"
+            offsets, data = values.string_blocks()
+            payload = [offsets.tobytes(), data]
+            length = len(values)
+        elif isinstance(values, (list, tuple, StringColumn)):
+            entry["kind"] = "str"
+            encoded = [v.encode("utf-8") for v in values]
+            offsets = array("Q", [0])
+            total = 0
+            for item in encoded:
+                total += len(item)
+                offsets.append(total)
+            payload = [offsets.tobytes(), b"".join(encoded)]
+            length = len(values)
+        else:
+            raise ValueError(f"Unsupported column type for {name!r}: {type(values).__name__}")
+
+        if length is not None:
+            if rows is None:
+                rows = length
+            elif length != rows:
+                raise ValueError(f"Column {name!r} has {length} rows, expected {rows}")
+        entries.append(entry)
+        blocks.append(payload)
+
+    # Offsets depend on the header size and the header holds the offsets, so
+    # reserve room for the header, lay out the blocks after it, and grow the
+    # reservation until the encoded header fits (it is padded with spaces).
+    reserved = 0
+    while True:
+        position = _align(len(MAGIC) + 4 + reserved)
+        for entry, payload in zip(entries, blocks):
+            if entry["kind"] == "str":
+                entry["offsets_offset"] = position
+                position = _align(position + len(payload[0]))
+            entry["offset"] = position
+            entry["size"] = len(payload[-1])
+            position = _align(position + entry["size"])
+        header = {
+            "rows": rows or 0,
+            "byteorder": sys.byteorder,
+            "metadata": metadata or {},
+            "columns": entries,
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        if len(header_bytes) <= reserved:
+            break
+        reserved = len(header_bytes) + 64
+    header_bytes = header_bytes.ljust(reserved)
+
+    tmp_path = f"{filepath}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for payload in blocks:
+                for part in payload:
+                    f.write(b"\0" * (_align(f.tell()) - f.tell()))
+                    f.write(part)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def read_header(filepath):
+    """Read only the JSON header of a columnar file.
+
+    Raises:
+        ValueError: If the file is not a columnar file.
+    """
+    with open(filepath, "rb") as f:
+        return _parse_header(f.read(len(MAGIC) + 4), f, filepath)
+
+
+def read_columns(filepath):
+    """Memory-map a columnar file and return its columns without copying.
+
+    Args:
+        filepath: Path written by write_columns.
+
+    Returns:
+        Tuple (metadata, columns). columns maps each name to a memoryview
+        cast to "d" (f8), "b" (i1) or "B" (u1), or a StringColumn. The views
+        keep the mapping alive; it is released when they are garbage
+        collected.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a columnar file.
+    """
+    with open(filepath, "rb") as f:
+        header = _parse_header(f.read(len(MAGIC) + 4), f, filepath)
+        mapped = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    swap = header["byteorder"] != sys.byteorder
+    columns = {}
+    for entry in header["columns"]:
+        kind = entry["kind"]
+        block = mapped[entry["offset"]:entry["offset"] + entry["size"]]
+        if kind == "str":
+            start = entry["offsets_offset"]
+            offsets = _cast(mapped[start:start + (header["rows"] + 1) * 8], "Q", swap)
+            columns[entry["name"]] = StringColumn(offsets, block)
+        else:
+            columns[entry["name"]] = _cast(block, _KIND_TYPECODES[kind], swap)
+    return header["metadata"], columns
+
+
+def _parse_header(prefix, f, filepath):
+    if len(prefix) < len(MAGIC) + 4 or prefix[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a columnar file: {filepath}")
+    (size,) = struct.unpack("<I", prefix[len(MAGIC):])
+    return json.loads(f.read(size).decode("utf-8"))
+
+
+def _cast(view, typecode, swap):
+    """Cast a byte view to `typecode`, copying only if byte order differs."""
+    if swap and typecode not in "bB":
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return memoryview(values)
+    return view.cast(typecode)
+
+
+def _align(position):
+    return -(-position // _ALIGN) * _ALIGN
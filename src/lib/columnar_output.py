@@ -0,0 +1,110 @@
+"""Typed columnar signal output for dataframe consumers.
+
+A columnar output is a lib.colfile file, so it needs no dependency to write
+or read and readers memory-map it with zero copies. Its columns are:
+
+    date       "str"  UTF-8 dates
+    close      "f8"   closing prices
+    rsi        "f8"   RSI rounded like the JSON output; NaN where null
+    rsi_valid  "u1"   null bitmap for rsi: bit i (LSB first within each
+                      byte, as in Arrow) is 1 where row i has an RSI
+    signal     "i1"   dictionary-encoded signal: an index into the
+                      "signal_dictionary" metadata list (null, "BUY", ...)
+
+With NumPy, np.frombuffer(columns["rsi"]) etc. are views into the mapping.
+"""
+
+from array import array
+
+from lib.colfile import read_columns, write_columns
+from lib.csv_reader import DateColumn
+from lib.signals import SIGNAL_NAMES
+
+# Stored in the metadata so readers can tell a signal output from other
+# columnar files (e.g. cache entries)
+SIGNAL_FILE_KIND = "rsi-signals"
+SIGNAL_FILE_VERSION = 1
+
+_NAN = float("nan")
+_VALID_DIGITS = bytes.maketrans(b"\0\1", b"01")
+
+
+def write_signal_columns(filepath, dates, close_prices, rsi_values, codes):
+    """Write one run's output as a columnar file.
+
+    Args:
+        filepath: Output file path.
+        dates: Sequence of date strings.
+        close_prices: array('d') (or "d" memoryview) of closing prices.
+        rsi_values: Sequence of RSI floats, None where not yet available.
+        codes: array('b') of lib.signals codes, as from encode_signals.
+
+    Returns:
+        Number of rows written.
+    """
+    rsi = array("d", [_NAN if v is None else round(v, 2) for v in rsi_values])
+    valid = bytes([v is not None for v in rsi_values])
+    write_columns(filepath, {
+        "date": dates if isinstance(dates, (list, DateColumn)) else list(dates),
+        "close": close_prices if isinstance(close_prices, (array, memoryview))
+        else array("d", close_prices),
+        "rsi": rsi,
+        "rsi_valid": pack_bitmap(valid),
+        "signal": codes,
+    }, metadata={
+        "kind": SIGNAL_FILE_KIND,
+        "version": SIGNAL_FILE_VERSION,
+        "signal_dictionary": list(SIGNAL_NAMES),
+    })
+    return len(rsi)
+
+
+def read_signal_columns(filepath):
+    """Memory-map a columnar output written by write_signal_columns.
+
+    Returns:
+        Tuple (dictionary, columns): the signal dictionary (list indexed by
+        the signal codes) and the columns as returned by
+        lib.colfile.read_columns.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a signal output.
+    """
+    try:
+        metadata, columns = read_columns(filepath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Output file not found: {filepath}")
+    if metadata.get("kind") != SIGNAL_FILE_KIND:
+        raise ValueError(f"Not a columnar signal output: {filepath}")
+    if metadata.get("version") != SIGNAL_FILE_VERSION:
+        raise ValueError(f"Unsupported columnar signal output version "
+                         f"{metadata.get('version')!r}: {filepath}")
+    return metadata["signal_dictionary"], columns
+
+
+def iter_signal_records(filepath):
+    """Yield the records of a columnar output as the JSON output holds them.
+
+    Each record is {"date", "close", "rsi", "signal"} with None for nulls,
+    so a columnar output can be compared with (or converted to) JSON.
+    """
+    dictionary, columns = read_signal_columns(filepath)
+    rsi, valid = columns["rsi"], columns["rsi_valid"]
+    close, signal = columns["close"], columns["signal"]
+    for i, date in enumerate(columns["date"]):
+        yield {
+            "date": date,
+            "close": close[i],
+            "rsi": rsi[i] if valid[i >> 3] >> (i & 7) & 1 else None,
+            "signal": dictionary[signal[i]],
+        }
+
+
+def pack_bitmap(flags):
+    """Pack a bytes object of 0/1 flags into an LSB-first bitmap."""
+    if not flags:
+        return b""
+    # Reversed so that flag 0 becomes the lowest bit of the little-endian int
+    bits = int(flags.translate(_VALID_DIGITS)[::-1], 2)
+    return bits.to_bytes((len(flags) + 7) // 8, "little")
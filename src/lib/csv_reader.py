@@ -1,52 +1,412 @@
 """CSV reader module for trading data files."""
 
 import csv
+import json
+from array import array
+from itertools import accumulate
 
 EXPECTED_COLUMNS = {"date", "open", "high", "low", "close", "volume"}
 
+# Column order used by read_csv_columns when no columns are requested
+COLUMN_ORDER = ("date", "open", "high", "low", "close", "volume")
 
-def read_csv(filepath):
+# Rows per chunk yielded by iter_csv_columns
+DEFAULT_CHUNK_SIZE = 65536
+
+# Bad rows kept in detail by a ParseErrors report; later ones are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class ParseErrors:
+    """Error report for lenient parsing: bad rows are skipped and recorded.
+
+    Pass an instance as `errors` to the readers to parse leniently. Each
+    recorded error is a dict {"line", "column", "value", "message"}, where
+    line is the 1-based line number in the file (the header is line 1) and
+    value is the offending field (None if the row is too short).
+
+    Attributes:
+        count: Number of rows skipped.
+        errors: Details of the first `limit` skipped rows.
+    """
+
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        self.limit = limit
+        self.count = 0
+        self.errors = []
+
+    def add(self, line, column, value, message):
+        """Record one skipped row."""
+        self.count += 1
+        if len(self.errors) < self.limit:
+            self.errors.append(
+                {"line": line, "column": column, "value": value, "message": message})
+
+    def to_dict(self):
+        return {"rows_skipped": self.count,
+                "truncated": self.count > len(self.errors),
+                "errors": self.errors}
+
+    def write(self, filepath):
+        """Write the report as JSON."""
+        with open(filepath, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class DateColumn:
+    """Growable sequence of date strings stored compactly.
+
+    A list holds one str object per row, several times the size of a short
+    date. DateColumn keeps the dates as one UTF-8 bytes buffer plus an
+    array of end offsets, the layout of a lib.colfile "str" column, and
+    decodes an item only when it is read. Appended dates are staged in a
+    plain list (so append() costs what list.append does) until pack().
+
+    Indexing, iteration, len(), slicing (which returns a list) and equality
+    with a list work as for a list of str.
+    """
+
+    def __init__(self, values=()):
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        self._ascii = True
+        self._staged = list(values)
+        self.append = self._staged.append
+
+    def pack(self):
+        """Move the staged dates into the compact buffers."""
+        staged = self._staged
+        if not staged:
+            return
+        text = "".join(staged)
+        data = text.encode("utf-8")
+        if len(data) == len(text):
+            lengths = map(len, staged)
+        else:
+            self._ascii = False
+            lengths = [len(value.encode("utf-8")) for value in staged]
+        ends = accumulate(lengths, initial=len(self._data))
+        next(ends)
+        self._offsets.extend(ends)
+        self._data += data
+        staged.clear()
+
+    def string_blocks(self):
+        """Return (offsets array('Q'), UTF-8 bytes) as a colfile "str" column stores them."""
+        self.pack()
+        return self._offsets, bytes(self._data)
+
+    def __len__(self):
+        return len(self._offsets) - 1 + len(self._staged)
+
+    def __getitem__(self, index):
+        self.pack()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DateColumn index out of range")
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def __delitem__(self, index):
+        """Drop the dates from index.start on (only tail slices are supported)."""
+        start, stop, step = index.indices(len(self))
+        if stop != len(self) or step != 1:
+            raise ValueError("DateColumn only supports deleting a tail slice")
+        self.pack()
+        del self._data[self._offsets[start]:]
+        del self._offsets[start + 1:]
+
+    def __iter__(self):
+        self.pack()
+        offsets = self._offsets
+        if self._ascii:
+            # Byte offsets are character offsets, so slice one decoded str
+            text = self._data.decode("ascii")
+            return map(text.__getitem__, map(slice, offsets, offsets[1:]))
+        data = self._data
+        return (str(data[start:end], "utf-8") for start, end in zip(offsets, offsets[1:]))
+
+    def __eq__(self, other):
+        if isinstance(other, (DateColumn, list)):
+            return len(self) == len(other) and all(map(str.__eq__, self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"DateColumn({list(self)!r})"
+
+
+def read_csv(filepath, errors=None):
     """Read a CSV file with OHLCV trading data.
 
     Args:
         filepath: Path to the CSV file.
+        errors: Optional ParseErrors. If given, malformed rows are skipped
+            and recorded in it instead of raising.
 
     Returns:
         List of dicts with keys: date (str), open, high, low, close, volume (float).
 
     Raises:
         FileNotFoundError: If the file does not exist.
-        ValueError: If the file is empty or has wrong columns.
+        ValueError: If the file is empty, has wrong columns, or (without
+            `errors`) a row is too short or has a non-numeric value; the
+            message names the line and column.
+    """
+    try:
+        with open(filepath, newline="") as f:
+            reader = csv.reader(f)
+            positions = _read_header(reader, filepath)
+            buffers = _new_buffers(COLUMN_ORDER)
+            _fill_all(reader, positions, buffers, errors, filepath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+    rows = [
+        {"date": date, "open": o, "high": h, "low": low, "close": c, "volume": v}
+        for date, o, h, low, c, v in zip(*buffers.values())
+    ]
+    if not rows:
+        raise ValueError(f"CSV file has no data rows: {filepath}")
+    return rows
+
+
+def read_csv_columns(filepath, columns=COLUMN_ORDER, as_numpy=False, errors=None):
+    """Read selected columns of an OHLCV CSV file into typed buffers.
+
+    Rows are parsed straight into one buffer per requested column, so no
+    per-row dict is built and unrequested fields are never converted. The
+    header is validated exactly like read_csv.
+
+    Args:
+        filepath: Path to the CSV file.
+        columns: Names of the columns to return (default: all six).
+        as_numpy: Return numeric columns as float64 NumPy arrays (zero-copy
+            views of the parsed buffers) instead of array('d').
+        errors: Optional ParseErrors. If given, malformed rows are skipped
+            and recorded in it instead of raising.
+
+    Returns:
+        Dict mapping each requested column name to its values: a DateColumn
+        for "date", array('d') (or a NumPy array) for the numeric columns.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, has wrong columns, an unknown
+            column is requested, or (without `errors`) a requested field is
+            missing or not numeric.
     """
+    _check_requested(columns)
+
     try:
         with open(filepath, newline="") as f:
-            reader = csv.DictReader(f)
-
-            if reader.fieldnames is None:
-                raise ValueError(f"CSV file is empty: {filepath}")
-
-            actual_columns = set(reader.fieldnames)
-            missing = EXPECTED_COLUMNS - actual_columns
-            if missing:
-                raise ValueError(
-                    f"CSV missing required columns: {sorted(missing)}. "
-                    f"Found: {sorted(actual_columns)}"
-                )
-
-            rows = []
-            for row in reader:
-                rows.append({
-                    "date": row["date"],
-                    "open": float(row["open"]),
-                    "high": float(row["high"]),
-                    "low": float(row["low"]),
-                    "close": float(row["close"]),
-                    "volume": float(row["volume"]),
-                })
-
-            if not rows:
+            reader = csv.reader(f)
+            positions = _read_header(reader, filepath)
+            buffers = _new_buffers(columns)
+            if not _fill_all(reader, positions, buffers, errors, filepath):
                 raise ValueError(f"CSV file has no data rows: {filepath}")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+    if as_numpy:
+        import numpy as np
+        for name in columns:
+            if name != "date":
+                buffers[name] = np.frombuffer(buffers[name], dtype=np.float64)
+    return buffers
+
+
+def iter_csv_columns(filepath, columns=COLUMN_ORDER, chunk_size=DEFAULT_CHUNK_SIZE,
+                     errors=None):
+    """Read selected columns of an OHLCV CSV file in bounded chunks.
+
+    Like read_csv_columns, but yields one dict of column buffers per chunk of
+    at most `chunk_size` rows, so memory use does not grow with file size.
+    Errors are raised lazily, when the first chunk is requested.
+
+    Args:
+        filepath: Path to the CSV file.
+        columns: Names of the columns to return (default: all six).
+        chunk_size: Maximum number of rows per chunk.
+        errors: Optional ParseErrors, as for read_csv_columns.
+
+    Yields:
+        Dicts mapping each requested column name to that chunk's values.
 
-            return rows
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, has wrong columns, an unknown
+            column is requested, or (without `errors`) a row is malformed.
+    """
+    _check_requested(columns)
+
+    try:
+        f = open(filepath, newline="")
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+    with f:
+        reader = csv.reader(f)
+        positions = _read_header(reader, filepath)
+        nrows = 0
+        while True:
+            buffers = _new_buffers(columns)
+            count = _fill_buffers(reader, positions, buffers, chunk_size, errors, filepath)
+            if not count:
+                break
+            nrows += count
+            yield buffers
+
+        if not nrows:
+            raise ValueError(f"CSV file has no data rows: {filepath}")
+
+
+def _check_requested(columns):
+    """Reject requested column names that are not OHLCV columns."""
+    unknown = [name for name in columns if name not in EXPECTED_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown columns requested: {unknown}. "
+            f"Available: {list(COLUMN_ORDER)}"
+        )
+
+
+def _read_header(reader, filepath):
+    """Read and validate the header row; return column name -> field index."""
+    header = next(reader, None)
+    _check_header(header, filepath)
+    # Later duplicates win, matching csv.DictReader
+    return {name: i for i, name in enumerate(header)}
+
+
+def _new_buffers(columns):
+    """Create empty column buffers: DateColumn for date, array('d') otherwise."""
+    return {name: DateColumn() if name == "date" else array("d") for name in columns}
+
+
+def _fill_buffers(reader, positions, buffers, limit=None, errors=None, filepath=None):
+    """Append up to `limit` data rows from a csv.reader to column buffers.
+
+    Blank lines are skipped and do not count towards `limit`. Dates are
+    packed into their DateColumn before returning. Values go
+    straight through float(), the fastest parser for plain decimals; a
+    malformed row is only examined after float() or indexing has failed,
+    so clean files pay nothing for the error handling.
+
+    Args:
+        reader: csv.reader positioned after the header.
+        positions: Column name -> field index, from _read_header.
+        buffers: Column buffers from _new_buffers.
+        limit: Maximum number of rows to append (default: all).
+        errors: Optional ParseErrors; if given, malformed rows are skipped
+            and recorded instead of raising.
+        filepath: File path for error messages.
+
+    Returns:
+        Number of data rows appended.
+
+    Raises:
+        ValueError: If a row is malformed and `errors` is None.
+    """
+    date_sink = None
+    if "date" in buffers:
+        date_sink = (buffers["date"].append, positions["date"])
+    float_sinks = [
+        (buffer.append, positions[name])
+        for name, buffer in buffers.items() if name != "date"
+    ]
+    # Fast path for the pipeline's usual request: the date plus one column
+    pair = date_sink is not None and len(float_sinks) == 1
+    if pair:
+        (append_date, date_index), (append_value, value_index) = date_sink, float_sinks[0]
+    start = len(next(iter(buffers.values()), ()))
+
+    nrows = 0
+    row = None
+    while True:
+        try:
+            if pair:
+                for row in reader:
+                    if not row:
+                        continue
+                    append_date(row[date_index])
+                    append_value(float(row[value_index]))
+                    nrows += 1
+                    if nrows == limit:
+                        break
+            else:
+                for row in reader:
+                    if not row:
+                        continue
+                    if date_sink is not None:
+                        date_sink[0](row[date_sink[1]])
+                    for append, index in float_sinks:
+                        append(float(row[index]))
+                    nrows += 1
+                    if nrows == limit:
+                        break
+            if date_sink is not None:
+                buffers["date"].pack()
+            return nrows
+        except (ValueError, IndexError):
+            # Drop the values of the bad row appended before the failure
+            for buffer in buffers.values():
+                del buffer[start + nrows:]
+            _reject_row(reader.line_num, row, positions, buffers, errors, filepath)
+
+
+def _fill_all(reader, positions, buffers, errors, filepath):
+    """Run _fill_buffers to the end of the file, one chunk at a time.
+
+    Packing the dates after every chunk bounds the staged str objects, so a
+    whole-file read never holds one per row.
+    """
+    nrows = 0
+    while True:
+        count = _fill_buffers(reader, positions, buffers, DEFAULT_CHUNK_SIZE, errors, filepath)
+        nrows += count
+        if count < DEFAULT_CHUNK_SIZE:
+            return nrows
+
+
+def _reject_row(line, row, positions, columns, errors, filepath):
+    """Find what is wrong with a row that failed to parse and report it.
+
+    `columns` are the names the row was read for; only the numeric OHLCV
+    columns among them are checked for a parsable value.
+    """
+    expected = max(positions.values()) + 1
+    for name in columns:
+        index = positions[name]
+        if index >= len(row):
+            column, value = name, None
+            message = f"Row on line {line} has {len(row)} fields, expected {expected}"
+            break
+        if name != "date" and name in EXPECTED_COLUMNS:
+            try:
+                float(row[index])
+            except ValueError:
+                column, value = name, row[index]
+                message = f"Invalid {name} value {value!r} on line {line}"
+                break
+    else:  # pragma: no cover - float() failed above, so one check must fail
+        raise AssertionError(f"Row on line {line} failed to parse but looks valid")
+
+    if errors is None:
+        raise ValueError(f"{message}: {filepath}")
+    errors.add(line, column, value, message)
+
+
+def _check_header(fieldnames, filepath):
+    """Validate a CSV header row, raising ValueError like read_csv does."""
+    if fieldnames is None:
+        raise ValueError(f"CSV file is empty: {filepath}")
+
+    actual_columns = set(fieldnames)
+    missing = EXPECTED_COLUMNS - actual_columns
+    if missing:
+        raise ValueError(
+            f"CSV missing required columns: {sorted(missing)}. "
+            f"Found: {sorted(actual_columns)}"
+        )
@@ -0,0 +1,159 @@
+"""Signal-change events: run-length encoded signals and their expansion.
+
+An event covers a run of consecutive bars with the same signal:
+{"start_date", "end_date", "length", "signal"}. Long histories change
+signal rarely, so the event list is far smaller than one record per bar.
+"""
+
+import bisect
+import json
+from itertools import repeat
+
+from lib.signals import SIGNAL_NAMES
+
+EVENT_KEYS = ("start_date", "end_date", "length", "signal")
+
+# bytes.translate table mapping every non-zero byte to 1
+_NONZERO_TO_ONE = bytes([0] + [1] * 255)
+
+
+def signal_runs(codes):
+    """Yield (start, stop) index ranges and code of each run of equal codes.
+
+    Run boundaries are found without a Python-level loop over every bar:
+    XOR-ing the codes with themselves shifted by one (as big integers) marks
+    each position where the next code differs, and bytes.find jumps from one
+    mark to the next.
+
+    Args:
+        codes: array('b') or bytes of lib.signals codes.
+
+    Yields:
+        Tuples (start, stop, code) with stop exclusive.
+    """
+    raw = bytes(codes)
+    n = len(raw)
+    if not n:
+        return
+    shifted = int.from_bytes(raw[1:] + b"\0", "big")
+    changes = (int.from_bytes(raw, "big") ^ shifted).to_bytes(n, "big")[:-1]
+    find = changes.translate(_NONZERO_TO_ONE).find
+    start = 0
+    while True:
+        last = find(1, start)
+        if last == -1:
+            yield start, n, raw[start]
+            return
+        yield start, last + 1, raw[start]
+        start = last + 1
+
+
+class EventBuilder:
+    """Turns chunks of (dates, codes) into events, joining runs across chunks.
+
+    feed() yields the events completed by a chunk; the run still open at the
+    end of the chunk is held back until a later chunk or finish() closes it.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._open = None
+
+    def feed(self, dates, codes):
+        """Yield events completed by this chunk of dates and signal codes."""
+        for start, stop, code in signal_runs(codes):
+            run = self._open
+            if run is not None:
+                if start == 0 and run[3] == code:
+                    run[1] = dates[stop - 1]
+                    run[2] += stop
+                    continue
+                yield self._event(run)
+            self._open = [dates[start], dates[stop - 1], stop - start, code]
+
+    def finish(self):
+        """Yield the final open event, if any."""
+        if self._open is not None:
+            yield self._event(self._open)
+            self._open = None
+
+    def _event(self, run):
+        self.count += 1
+        start_date, end_date, length, code = run
+        return {"start_date": start_date, "end_date": end_date, "length": length,
+                "signal": SIGNAL_NAMES[code]}
+
+
+def build_events(dates, codes):
+    """Return the list of events for whole date and signal code columns."""
+    builder = EventBuilder()
+    events = list(builder.feed(dates, codes))
+    events.extend(builder.finish())
+    return events
+
+
+def iter_events(filepath):
+    """Lazily read events written by --events-only (JSON array or JSON Lines).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid event JSON.
+    """
+    try:
+        f = open(filepath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Events file not found: {filepath}")
+    with f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        if first == "[":
+            events = json.loads(first + f.read())
+        else:
+            f.seek(0)
+            events = (json.loads(line) for line in f if line.strip())
+        for event in events:
+            if not isinstance(event, dict) or any(key not in event for key in EVENT_KEYS):
+                raise ValueError(f"Not a signal event in {filepath}: {event!r}")
+            yield event
+
+
+def expand_events(events):
+    """Lazily rebuild the per-bar signal sequence from events.
+
+    Zip the result with the input's dates to get the per-bar (date, signal)
+    view without ever materializing it.
+    """
+    for event in events:
+        yield from repeat(event["signal"], event["length"])
+
+
+class EventIndex:
+    """Random access to per-bar signals over an event list.
+
+    Lookups bisect the cumulative run lengths, so memory stays proportional
+    to the number of events rather than the number of bars.
+    """
+
+    def __init__(self, events):
+        self.events = list(events)
+        self._starts = []
+        total = 0
+        for event in self.events:
+            self._starts.append(total)
+            total += event["length"]
+        self._length = total
+
+    def __len__(self):
+        return self._length
+
+    def event_at(self, index):
+        """Return the event covering bar `index` (negative indices allowed)."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("bar index out of range")
+        return self.events[bisect.bisect_right(self._starts, index) - 1]
+
+    def __getitem__(self, index):
+        return self.event_at(index)["signal"]
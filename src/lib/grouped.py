@@ -0,0 +1,313 @@
+"""Grouped mode: RSI and signals per symbol for one CSV of interleaved tickers.
+
+Some vendors deliver a single file with a "symbol" column and the rows of
+thousands of tickers interleaved. read_grouped partitions the rows by
+symbol in one pass: the close prices end up contiguous per symbol, and an
+index of original row numbers keeps the file order recoverable.
+
+run_grouped computes RSI and signals for every group and writes one record
+per row, either grouped by symbol (first-appearance order) or in the
+original file order. With several workers, the grouped close prices and
+the RSI and signal outputs live in one multiprocessing.shared_memory block:
+workers attach to it by name and receive only group ranges, so no column
+data is pickled.
+"""
+
+import csv
+import os
+from array import array
+
+from lib.csv_reader import _read_header, _reject_row
+from lib.json_writer import write_json
+from lib.pipeline import signal_counts
+from lib.profiling import NULL_PROFILER
+from lib.rsi import calculate_rsi
+from lib.signals import SIGNAL_NAMES, encode_signals
+
+SYMBOL_COLUMN = "symbol"
+
+# Record orders accepted by run_grouped
+ORDERS = ("grouped", "original")
+
+# Below this many rows the pool start-up costs more than it saves
+MIN_PARALLEL_ROWS = 1 << 16
+
+_NAN = float("nan")
+
+
+class GroupedColumns:
+    """Rows of a multi-symbol CSV partitioned by symbol.
+
+    Attributes:
+        symbols: Symbols in order of first appearance; group g is symbols[g].
+        offsets: array('q') of len(symbols) + 1 group boundaries: group g
+            occupies positions offsets[g]:offsets[g + 1] of `close` and
+            `rows`.
+        close: array('d') of close prices, contiguous per group.
+        rows: array('q') mapping each grouped position to its original row
+            number (0-based data row), ascending within each group.
+        dates: Dates in original row order.
+    """
+
+    def __init__(self, symbols, offsets, close, rows, dates):
+        self.symbols = symbols
+        self.offsets = offsets
+        self.close = close
+        self.rows = rows
+        self.dates = dates
+
+    def __len__(self):
+        return len(self.close)
+
+    def group_ranges(self):
+        """Return [(start, stop)] grouped positions of each group."""
+        offsets = self.offsets
+        return [(offsets[g], offsets[g + 1]) for g in range(len(self.symbols))]
+
+    def positions(self):
+        """Return array('q') mapping each original row number to its grouped position."""
+        positions = array("q", bytes(8 * len(self.rows)))
+        for position, row in enumerate(self.rows):
+            positions[row] = position
+        return positions
+
+
+def read_grouped(filepath, errors=None):
+    """Read a CSV with a symbol column, partitioning its rows by symbol.
+
+    Args:
+        filepath: Path to the CSV file. It must have a "symbol" column in
+            addition to the usual OHLCV columns.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising.
+
+    Returns:
+        A GroupedColumns.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, lacks a required column, has no
+            data rows, or (without `errors`) has a malformed row.
+    """
+    try:
+        f = open(filepath, newline="")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+    with f:
+        reader = csv.reader(f)
+        positions = _read_header(reader, filepath)
+        if SYMBOL_COLUMN not in positions:
+            raise ValueError(f"CSV missing required column {SYMBOL_COLUMN!r} for grouped "
+                             f"mode. Found: {sorted(positions)}")
+        symbol_index, date_index = positions[SYMBOL_COLUMN], positions["date"]
+        close_index = positions["close"]
+
+        group_of = {}
+        group_close, group_rows = [], []
+        dates = []
+        append_date = dates.append
+        row = None
+        while True:
+            try:
+                for row in reader:
+                    if not row:
+                        continue
+                    symbol, date, close = row[symbol_index], row[date_index], row[close_index]
+                    close = float(close)
+                    group = group_of.get(symbol)
+                    if group is None:
+                        group = group_of[symbol] = len(group_close)
+                        group_close.append(array("d"))
+                        group_rows.append(array("q"))
+                    group_close[group].append(close)
+                    group_rows[group].append(len(dates))
+                    append_date(date)
+                break
+            except (ValueError, IndexError):
+                # Nothing is appended until every field has parsed
+                _reject_row(reader.line_num, row, positions,
+                            (SYMBOL_COLUMN, "date", "close"), errors, filepath)
+
+    if not dates:
+        raise ValueError(f"CSV file has no data rows: {filepath}")
+
+    offsets = array("q", [0])
+    for values in group_close:
+        offsets.append(offsets[-1] + len(values))
+    close = array("d")
+    rows = array("q")
+    for values, members in zip(group_close, group_rows):
+        close.extend(values)
+        rows.extend(members)
+    return GroupedColumns(list(group_of), offsets, close, rows, dates)
+
+
+def run_grouped(csv_path, output_path, order="grouped", workers=None, fmt="json",
+                compact=False, profiler=NULL_PROFILER, errors=None):
+    """Run RSI and signals per symbol and write one record per row.
+
+    Each record is {"symbol", "date", "close", "rsi", "signal"}, with the
+    RSI of the row's own symbol series.
+
+    Args:
+        csv_path: Input CSV file path (with a "symbol" column).
+        output_path: Output file path.
+        order: "grouped" to write each symbol's rows together, symbols in
+            order of first appearance; "original" for the file's row order.
+        workers: Worker processes (default: os.cpu_count()); 1 computes in
+            this process.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising.
+
+    Returns:
+        Tuple (row_count, counts, symbol_count), counts as for
+        lib.pipeline.run_in_memory, summed over all symbols.
+
+    Raises:
+        FileNotFoundError: If the CSV file does not exist.
+        ValueError: If the CSV is invalid or `order` is unknown.
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Unknown record order: {order!r}. Expected one of {list(ORDERS)}")
+
+    with profiler.stage("read+partition") as stats:
+        grouped = read_grouped(csv_path, errors)
+        stats["rows"] = row_count = len(grouped)
+
+    with profiler.stage("rsi+signals") as stats:
+        rsi, codes, code_counts = compute_grouped(grouped, workers)
+        stats["rows"] = row_count
+
+    records = _grouped_records if order == "grouped" else _original_records
+    with profiler.stage("records+write") as stats:
+        write_json(records(grouped, rsi, codes), output_path, fmt, compact)
+        stats["rows"] = row_count
+
+    totals = [sum(column) for column in zip(*code_counts)]
+    return row_count, signal_counts(totals), len(grouped.symbols)
+
+
+def compute_grouped(grouped, workers=None):
+    """Compute RSI and signal codes for every group of a GroupedColumns.
+
+    Args:
+        grouped: Result of read_grouped.
+        workers: Worker processes (default: os.cpu_count()).
+
+    Returns:
+        Tuple (rsi, codes, code_counts) in grouped position order: rsi is
+        array('d') with NaN where RSI is not yet available, codes is
+        array('b') of lib.signals codes and code_counts holds one
+        encode_signals count list per group.
+    """
+    n = len(grouped)
+    ranges = grouped.group_ranges()
+    workers = min(workers or os.cpu_count() or 1, len(ranges))
+    if workers == 1 or n < MIN_PARALLEL_ROWS:
+        rsi = array("d", bytes(8 * n))
+        codes = array("b", bytes(n))
+        counts = _compute_ranges(memoryview(grouped.close), memoryview(rsi),
+                                 memoryview(codes), ranges)
+        return rsi, codes, counts
+    return _compute_shared(grouped, ranges, workers)
+
+
+def _compute_shared(grouped, ranges, workers):
+    """Run _compute_ranges in a process pool over one shared-memory block."""
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    n = len(grouped)
+    block = shared_memory.SharedMemory(create=True, size=max(17 * n, 1))
+    try:
+        # Only short-lived views of the block are taken here, so close()
+        # never fails on exported buffers
+        block.buf[:8 * n] = memoryview(grouped.close).cast("B")
+        tasks = _plan_tasks(ranges, workers * 4)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_compute_shared_ranges, block.name, n, task)
+                       for task in tasks]
+            counts = [group_counts for future in futures for group_counts in future.result()]
+        rsi = array("d", bytes(block.buf[8 * n:16 * n]))
+        codes = array("b", bytes(block.buf[16 * n:17 * n]))
+    finally:
+        block.close()
+        block.unlink()
+    return rsi, codes, counts
+
+
+def _compute_shared_ranges(name, n, ranges):
+    """Worker: attach to the shared block by name and compute the given groups."""
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name)
+    counts = _compute_ranges(*_block_views(block.buf, n), ranges)
+    block.close()
+    return counts
+
+
+def _block_views(buf, n):
+    """Split a shared block into close (f8), rsi (f8) and codes (i1) views."""
+    return (buf[:8 * n].cast("d"), buf[8 * n:16 * n].cast("d"),
+            buf[16 * n:17 * n].cast("b"))
+
+
+def _compute_ranges(close, rsi, codes, ranges):
+    """Compute RSI and codes for each (start, stop) group into the output views."""
+    counts = []
+    for start, stop in ranges:
+        values = calculate_rsi(close[start:stop])
+        group_codes, group_counts = encode_signals(values)
+        rsi[start:stop] = array("d", [_NAN if v is None else v for v in values])
+        codes[start:stop] = group_codes
+        counts.append(group_counts)
+    return counts
+
+
+def _plan_tasks(ranges, count):
+    """Split consecutive group ranges into about `count` tasks of similar row totals."""
+    total = ranges[-1][1] - ranges[0][0]
+    target = max(1, -(-total // count))
+    tasks, current, size = [], [], 0
+    for start, stop in ranges:
+        current.append((start, stop))
+        size += stop - start
+        if size >= target:
+            tasks.append(current)
+            current, size = [], 0
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+def _record(symbol, date, close, rsi, code):
+    return {
+        "symbol": symbol,
+        "date": date,
+        "close": close,
+        "rsi": None if rsi != rsi else round(rsi, 2),
+        "signal": SIGNAL_NAMES[code],
+    }
+
+
+def _grouped_records(grouped, rsi, codes):
+    dates, close, rows, offsets = grouped.dates, grouped.close, grouped.rows, grouped.offsets
+    for group, symbol in enumerate(grouped.symbols):
+        for position in range(offsets[group], offsets[group + 1]):
+            yield _record(symbol, dates[rows[position]], close[position], rsi[position],
+                          codes[position])
+
+
+def _original_records(grouped, rsi, codes):
+    symbol_of = array("q", bytes(8 * len(grouped)))
+    for group in range(len(grouped.symbols)):
+        for position in range(grouped.offsets[group], grouped.offsets[group + 1]):
+            symbol_of[position] = group
+    symbols, dates, close = grouped.symbols, grouped.dates, grouped.close
+    for row, position in enumerate(grouped.positions()):
+        yield _record(symbols[symbol_of[position]], dates[row], close[position],
+                      rsi[position], codes[position])
@@ -0,0 +1,202 @@
+"""Append-aware reruns: resume RSI from a checkpoint saved next to the output.
+
+Input CSVs typically only grow. After a run, a checkpoint records how far
+the input was processed (byte offset and row count), the RSIStream state at
+that point, a SHA-256 hash of the processed prefix, and the output file's
+format and size. The next run verifies all of that, then parses only the
+bytes past the offset and appends their records to the existing output.
+Anything that does not match (edited history, different output options, a
+modified or missing output file) falls back to a full recompute, which
+writes exactly the same bytes a plain run would.
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+from lib.csv_reader import DEFAULT_CHUNK_SIZE, _check_header, _fill_buffers, _new_buffers
+from lib.json_writer import SignalRowWriter
+from lib.pipeline import SIGNALS, make_row
+from lib.profiling import NULL_PROFILER
+from lib.rsi import RSIStream
+
+# Bump when the checkpoint layout or the meaning of its fields changes
+CHECKPOINT_VERSION = 1
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def checkpoint_path(output_path):
+    """Return the checkpoint file path stored alongside `output_path`."""
+    return output_path + CHECKPOINT_SUFFIX
+
+
+def run_incremental(csv_path, output_path, fmt="json", compact=False,
+                    chunk_size=DEFAULT_CHUNK_SIZE, profiler=NULL_PROFILER):
+    """Run the streaming pipeline, resuming from a checkpoint when possible.
+
+    A checkpoint is only written when the input ends with a newline, so a
+    partially appended last row is never frozen into the saved state.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path; the checkpoint is written next to it.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        chunk_size: Maximum number of new rows parsed at once.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+
+    Returns:
+        Tuple (row_count, counts, new_rows, resumed): totals for the whole
+        file (counts as for run_in_memory), the number of rows processed by
+        this run, and whether it resumed from a checkpoint.
+
+    Raises:
+        FileNotFoundError: If the CSV file does not exist.
+        ValueError: If the file is empty, has wrong columns or no data rows.
+    """
+    try:
+        f = open(csv_path, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    with f:
+        end = os.fstat(f.fileno()).st_size
+        header_line = f.readline()
+        header = next(csv.reader([header_line.decode("utf-8")]), None)
+        _check_header(header, csv_path)
+        positions = {name: i for i, name in enumerate(header)}
+
+        digest = hashlib.sha256(header_line)
+        state = _load_checkpoint(output_path, fmt, compact, end)
+        if state is not None and not _extend_hash(f, digest, state["offset"],
+                                                  state["prefix_sha256"]):
+            state = None
+
+        if state is None:
+            f.seek(len(header_line))
+            digest = hashlib.sha256(header_line)
+            stream = RSIStream()
+            counts = dict.fromkeys(SIGNALS, 0)
+            rows, resume_count = 0, None
+        else:
+            stream = RSIStream.from_dict(state["rsi"])
+            counts = {None if k == "pending" else k: v for k, v in state["counts"].items()}
+            rows = resume_count = state["rows"]
+
+        offset = f.tell()
+        reader = csv.reader(_decoded_lines(f, end, digest))
+        update = stream.update
+        with SignalRowWriter(output_path, fmt, compact, resume_count) as writer:
+            while True:
+                with profiler.stage("read") as stats:
+                    chunk = _new_buffers(("date", "close"))
+                    stats["rows"] = _fill_buffers(reader, positions, chunk, chunk_size,
+                                                  filepath=csv_path)
+                if not stats["rows"]:
+                    break
+                with profiler.stage("rsi+signals") as stats:
+                    batch = []
+                    for date, close in zip(chunk["date"], chunk["close"]):
+                        rsi, signal = update(close)
+                        counts[signal] += 1
+                        batch.append(make_row(date, close, rsi, signal))
+                    stats["rows"] = len(batch)
+                with profiler.stage("write") as stats:
+                    writer.write_rows(batch)
+                    stats["rows"] = len(batch)
+        new_rows = writer.count - rows
+        rows = writer.count
+
+        if not rows:
+            _remove_checkpoint(output_path)
+            raise ValueError(f"CSV file has no data rows: {csv_path}")
+
+        f.seek(end - 1)
+        if end > offset and f.read(1) != b"\n":
+            # The last row may still be being written; recompute next time.
+            _remove_checkpoint(output_path)
+        else:
+            _save_checkpoint(output_path, {
+                "version": CHECKPOINT_VERSION,
+                "csv_path": os.path.abspath(csv_path),
+                "offset": end,
+                "rows": rows,
+                "prefix_sha256": digest.hexdigest(),
+                "rsi": stream.to_dict(),
+                "counts": {("pending" if s is None else s): counts[s] for s in SIGNALS},
+                "output": {"fmt": fmt, "compact": compact,
+                           "size": os.path.getsize(output_path)},
+            })
+
+    return rows, counts, new_rows, state is not None
+
+
+def _decoded_lines(f, end, digest):
+    """Yield decoded lines of `f` up to byte `end`, hashing the bytes read.
+
+    Reading stops at the size seen when the run started, so rows appended
+    while it runs are left for the next run instead of racing the checkpoint.
+    """
+    remaining = end - f.tell()
+    while remaining > 0:
+        line = f.readline(remaining)
+        if not line:
+            break
+        remaining -= len(line)
+        digest.update(line)
+        yield line.decode("utf-8")
+
+
+def _extend_hash(f, digest, offset, expected):
+    """Hash the input up to `offset` and compare with the saved prefix hash.
+
+    On a match the file is left positioned at `offset`, with `digest`
+    covering everything before it, so the new checkpoint's hash continues
+    from here instead of rereading the prefix.
+    """
+    remaining = offset - f.tell()
+    while remaining > 0:
+        block = f.read(min(_HASH_BLOCK_SIZE, remaining))
+        if not block:
+            return False
+        digest.update(block)
+        remaining -= len(block)
+    return digest.hexdigest() == expected
+
+
+def _load_checkpoint(output_path, fmt, compact, input_size):
+    """Return the saved checkpoint if it still applies, else None."""
+    try:
+        with open(checkpoint_path(output_path)) as f:
+            state = json.load(f)
+        output_size = os.path.getsize(output_path)
+    except (OSError, ValueError):
+        return None
+    try:
+        usable = (
+            state["version"] == CHECKPOINT_VERSION
+            and state["output"] == {"fmt": fmt, "compact": compact, "size": output_size}
+            and state["offset"] <= input_size
+        )
+    except (KeyError, TypeError):
+        return None
+    return state if usable else None
+
+
+def _save_checkpoint(output_path, state):
+    path = checkpoint_path(output_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _remove_checkpoint(output_path):
+    try:
+        os.unlink(checkpoint_path(output_path))
+    except FileNotFoundError:
+        pass
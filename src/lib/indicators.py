@@ -0,0 +1,297 @@
+"""Indicator registry with intermediates shared across indicators.
+
+Indicators are requested by spec strings such as "rsi", "sma:50" or
+"macd:12:26:9" and computed together over one IndicatorContext. The
+context memoizes intermediates (price changes, gains and losses, rolling
+sums, EMAs, true range), so e.g. "sma:20,bollinger:20" computes the
+20-bar rolling sum once and "ema:12,macd" shares the 12-bar EMA.
+
+Every output column has one value per bar, with None while the indicator
+is warming up.
+"""
+
+import math
+
+from lib.rsi import _gains_and_losses, _wilder_rsi
+
+
+class Indicator:
+    """A registered indicator.
+
+    Attributes:
+        name: Registry name, used in specs and output column names.
+        compute: Function (context, *params) -> list of output columns, in
+            the order of `outputs`.
+        defaults: Default parameter values; a spec may override a prefix.
+            Each given parameter is parsed as its default's type: int for
+            periods, float for e.g. the Bollinger width.
+        outputs: Output column suffixes appended to the spec key.
+        inputs: CSV columns the indicator reads.
+        decimals: Digits output values are rounded to.
+    """
+
+    def __init__(self, name, compute, defaults, outputs=("",), inputs=("close",), decimals=4):
+        self.name = name
+        self.compute = compute
+        self.defaults = defaults
+        self.outputs = outputs
+        self.inputs = inputs
+        self.decimals = decimals
+
+
+INDICATORS = {}
+
+
+def register(name, defaults, outputs=("",), inputs=("close",), decimals=4):
+    """Decorator adding an indicator function to INDICATORS."""
+    def decorate(compute):
+        INDICATORS[name] = Indicator(name, compute, defaults, outputs, inputs, decimals)
+        return compute
+    return decorate
+
+
+class IndicatorContext:
+    """Input columns plus memoized intermediates shared by all indicators.
+
+    Args:
+        columns: Dict mapping CSV column name to its values (any sequence
+            of floats), e.g. the result of read_csv_columns.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.length = len(columns["close"])
+        self._memo = {}
+
+    def memo(self, key, compute):
+        """Return the intermediate cached under `key`, computing it once."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute()
+            return value
+
+    def gains_and_losses(self):
+        return self.memo("gains_losses", lambda: _gains_and_losses(self.columns["close"]))
+
+    def rolling_sum(self, column, period):
+        return self.memo(("sum", column, period),
+                         lambda: _rolling_sum(self.columns[column], period))
+
+    def rolling_std(self, column, period):
+        return self.memo(("std", column, period),
+                         lambda: _rolling_std(self.columns[column], period))
+
+    def sma(self, column, period):
+        def compute():
+            return [None if s is None else s / period
+                    for s in self.rolling_sum(column, period)]
+        return self.memo(("sma", column, period), compute)
+
+    def ema(self, column, period):
+        return self.memo(("ema", column, period),
+                         lambda: _ema(self.columns[column], period))
+
+    def true_range(self):
+        def compute():
+            high, low, close = (self.columns[c] for c in ("high", "low", "close"))
+            ranges = [high[0] - low[0]] if self.length else []
+            for i in range(1, self.length):
+                prev = close[i - 1]
+                ranges.append(max(high[i] - low[i], abs(high[i] - prev), abs(low[i] - prev)))
+            return ranges
+        return self.memo("true_range", compute)
+
+
+@register("rsi", (14,), decimals=2)
+def _rsi(context, period):
+    if context.length < period + 1:
+        return [[None] * context.length]
+    gains, losses = context.gains_and_losses()
+    return [_wilder_rsi(gains, losses, period)]
+
+
+@register("sma", (20,))
+def _sma(context, period):
+    return [context.sma("close", period)]
+
+
+@register("ema", (20,))
+def _ema_indicator(context, period):
+    return [context.ema("close", period)]
+
+
+@register("macd", (12, 26, 9), outputs=("", "_signal", "_hist"))
+def _macd(context, fast, slow, signal):
+    fast_ema = context.ema("close", fast)
+    slow_ema = context.ema("close", slow)
+    line = [None if f is None or s is None else f - s for f, s in zip(fast_ema, slow_ema)]
+    signal_line = _ema(line, signal)
+    hist = [None if s is None else m - s for m, s in zip(line, signal_line)]
+    return [line, signal_line, hist]
+
+
+@register("bollinger", (20, 2.0), outputs=("_middle", "_upper", "_lower"))
+def _bollinger(context, period, width):
+    middle = context.sma("close", period)
+    stds = context.rolling_std("close", period)
+    upper, lower = [], []
+    for mean, std in zip(middle, stds):
+        if mean is None:
+            upper.append(None)
+            lower.append(None)
+            continue
+        upper.append(mean + width * std)
+        lower.append(mean - width * std)
+    return [middle, upper, lower]
+
+
+@register("atr", (14,), inputs=("high", "low", "close"))
+def _atr(context, period):
+    ranges = context.true_range()
+    atr = [None] * min(period - 1, len(ranges))
+    if len(ranges) < period:
+        return [atr]
+    value = sum(ranges[:period]) / period
+    atr.append(value)
+    for tr in ranges[period:]:
+        value = (value * (period - 1) + tr) / period
+        atr.append(value)
+    return [atr]
+
+
+def parse_indicator_specs(text):
+    """Parse "rsi,sma:50,macd:12:26:9" into [(key, Indicator, params)].
+
+    The key is the indicator name, plus its parameters when any are given
+    ("sma_50"), and prefixes the indicator's output columns.
+
+    Raises:
+        ValueError: On an unknown indicator, too many parameters, a period
+            that is not a positive integer, another parameter that is not a
+            positive number, or a duplicate spec.
+    """
+    specs = []
+    keys = set()
+    for part in text.split(","):
+        name, *raw_params = part.strip().split(":")
+        indicator = INDICATORS.get(name)
+        if indicator is None:
+            raise ValueError(f"Unknown indicator: {name!r}. Available: {sorted(INDICATORS)}")
+        if len(raw_params) > len(indicator.defaults):
+            raise ValueError(f"Too many parameters for {name}: {part!r}")
+        given = [_parse_param(default, raw, part)
+                 for default, raw in zip(indicator.defaults, raw_params)]
+        params = tuple(given) + indicator.defaults[len(given):]
+        key = "_".join([name] + [str(p) if isinstance(p, int) else f"{p:g}" for p in given])
+        if key in keys:
+            raise ValueError(f"Indicator requested twice: {part!r}")
+        keys.add(key)
+        specs.append((key, indicator, params))
+    return specs
+
+
+def required_columns(specs):
+    """Return the CSV columns needed by parsed specs, in COLUMN_ORDER order."""
+    needed = {column for _, indicator, _ in specs for column in indicator.inputs}
+    return [c for c in ("open", "high", "low", "close", "volume") if c in needed]
+
+
+def compute_indicators(columns, specs):
+    """Compute every requested indicator over one shared context.
+
+    Args:
+        columns: Dict of input columns (must include required_columns(specs)).
+        specs: Result of parse_indicator_specs.
+
+    Returns:
+        Dict mapping output column name to its values, in spec order.
+    """
+    context = IndicatorContext(columns)
+    results = {}
+    for key, indicator, params in specs:
+        for suffix, values in zip(indicator.outputs, indicator.compute(context, *params)):
+            results[key + suffix] = values
+    return results
+
+
+def output_decimals(specs):
+    """Return {output column name: decimals} for rounding written values."""
+    return {key + suffix: indicator.decimals
+            for key, indicator, _ in specs for suffix in indicator.outputs}
+
+
+def _parse_param(default, raw, part):
+    """Parse one spec parameter as a positive value of its default's type."""
+    kind = "integer" if isinstance(default, int) else "number"
+    try:
+        value = int(raw) if kind == "integer" else float(raw)
+    except ValueError:
+        value = None
+    if value is None or not 0 < value < math.inf:
+        raise ValueError(f"Invalid parameter {raw.strip()!r} in {part.strip()!r}: "
+                         f"expected a positive {kind}")
+    return value
+
+
+def _rolling_sum(values, period):
+    """Sums of each `period`-long window ending at each index (None before)."""
+    n = len(values)
+    sums = [None] * min(period - 1, n)
+    if n < period:
+        return sums
+    total = math.fsum(values[:period])
+    sums.append(total)
+    for i in range(period, n):
+        total += values[i] - values[i - period]
+        sums.append(total)
+    return sums
+
+
+def _rolling_std(values, period):
+    """Population standard deviation of each `period`-long window (None before).
+
+    Works on deviations from the window mean rather than on sum(v * v) -
+    n * mean**2, which cancels catastrophically when the spread is tiny
+    next to the price level. The mean and the sum of squared deviations are
+    slid one value at a time (Welford's update) and recomputed from the
+    window every `period` values, so rounding error cannot build up over
+    long series.
+    """
+    n = len(values)
+    stds = [None] * min(period - 1, n)
+    mean = sq_dev = 0.0
+    for end in range(period, n + 1):
+        if (end - period) % period == 0:
+            window = values[end - period:end]
+            mean = math.fsum(window) / period
+            sq_dev = math.fsum((v - mean) ** 2 for v in window)
+        else:
+            new, old = values[end - 1], values[end - 1 - period]
+            new_mean = mean + (new - old) / period
+            sq_dev += (new - old) * (new - new_mean + old - mean)
+            mean = new_mean
+        stds.append(math.sqrt(max(sq_dev, 0.0) / period))
+    return stds
+
+
+def _ema(values, period):
+    """Exponential moving average seeded with the SMA of its first window.
+
+    Leading None values are skipped; the first EMA value appears once
+    `period` non-None values have been seen.
+    """
+    n = len(values)
+    start = 0
+    while start < n and values[start] is None:
+        start += 1
+    result = [None] * min(start + period - 1, n)
+    if n - start < period:
+        return result
+    alpha = 2.0 / (period + 1)
+    value = sum(values[start:start + period]) / period
+    result.append(value)
+    for v in values[start + period:]:
+        value += alpha * (v - value)
+        result.append(value)
+    return result
@@ -1,14 +1,248 @@
 """JSON writer module for trading signal output."""
 
 import json
+import os
+from json.encoder import encode_basestring_ascii
 
+FORMATS = ("json", "jsonl")
 
-def write_json(records, filepath="output.json"):
+# Typed binary output, written by lib.columnar_output rather than this module
+COLUMNAR_FORMAT = "columnar"
+
+_INFINITY = float("inf")
+
+# One record of the fixed schema, laid out exactly as json.dumps lays it out
+# for each format: indented array element, compact, and JSON Lines.
+_TEMPLATES = {
+    ("json", False): '{\n    "date": %s,\n    "close": %s,\n    "rsi": %s,\n    "signal": %s\n  }',
+    ("json", True): '{"date":%s,"close":%s,"rsi":%s,"signal":%s}',
+    ("jsonl", False): '{"date": %s, "close": %s, "rsi": %s, "signal": %s}\n',
+    ("jsonl", True): '{"date":%s,"close":%s,"rsi":%s,"signal":%s}\n',
+}
+
+_SIGNAL_LITERALS = {None: "null", "BUY": '"BUY"', "SELL": '"SELL"', "HOLD": '"HOLD"'}
+
+
+def write_json(records, filepath="output.json", fmt="json", compact=False):
     """Write signal records to a JSON file.
 
+    Records are encoded and written one at a time, so `records` may be any
+    iterable (including a generator) and is never held in memory as a whole.
+    With the defaults the file is byte-identical to
+    json.dump(list(records), f, indent=2).
+
+    Args:
+        records: Iterable of dicts with keys: date, close, rsi, signal.
+        filepath: Output file path (default: output.json).
+        fmt: "json" for one JSON array, "jsonl" for one record per line.
+        compact: Drop indentation and spaces after separators.
+
+    Returns:
+        Number of records written.
+    """
+    _check_format(fmt)
+    if fmt == "jsonl":
+        separators = (",", ":") if compact else None
+        encode = lambda record: json.dumps(record, separators=separators) + "\n"
+    elif compact:
+        encode = lambda record: json.dumps(record, separators=(",", ":"))
+    else:
+        # Nested lines gain one indent level inside the top-level array;
+        # encoded JSON strings never contain a raw newline.
+        encode = lambda record: json.dumps(record, indent=2).replace("\n", "\n  ")
+    return _write(map(encode, records), filepath, fmt, compact)
+
+
+def write_signal_rows(rows, filepath="output.json", fmt="json", compact=False):
+    """Write (date, close, rsi, signal) tuples with a hand-rolled encoder.
+
+    Produces exactly the bytes write_json would for the equivalent dicts, but
+    formats each row straight into a fixed template instead of building and
+    walking a dict per record.
+
     Args:
-        records: List of dicts with keys: date, close, rsi, signal.
+        rows: Iterable of (date, close, rsi, signal) tuples. date is a str,
+            close a float, rsi a float or None, signal a str or None.
         filepath: Output file path (default: output.json).
+        fmt: "json" for one JSON array, "jsonl" for one record per line.
+        compact: Drop indentation and spaces after separators.
+
+    Returns:
+        Number of rows written.
+    """
+    with SignalRowWriter(filepath, fmt, compact) as writer:
+        writer.write_rows(rows)
+    return writer.count
+
+
+class SignalRowWriter:
+    """Incremental form of write_signal_rows for output built in pieces.
+
+    Call write_rows() any number of times, then close() (or use it as a
+    context manager) to finish the JSON array. The file is identical to one
+    write_signal_rows call with all rows. When the with block raises, the
+    writer aborts instead, so a failed run never leaves a complete-looking
+    output behind.
+
+    Pass resume_count to continue a finished output file that already holds
+    that many rows: the closing bracket is removed and new rows are appended
+    as if the writer had never been closed.
+
+    Attributes:
+        count: Number of rows written so far.
     """
-    with open(filepath, "w") as f:
-        json.dump(records, f, indent=2)
+
+    def __init__(self, filepath, fmt="json", compact=False, resume_count=None):
+        _check_format(fmt)
+        self.count = 0
+        self._fmt = fmt
+        self._compact = compact
+        self._encode = _row_encoder(_TEMPLATES[fmt, compact])
+        self._filepath = filepath
+        if resume_count is None:
+            self._file = open(filepath, "w")
+        else:
+            self._file = _reopen_for_append(filepath, fmt, compact, resume_count)
+            self.count = resume_count
+
+    def write_rows(self, rows):
+        """Encode and write an iterable of (date, close, rsi, signal) tuples."""
+        encoded = map(self._encode, rows)
+        write = self._file.write
+        if self._fmt == "jsonl":
+            for text in encoded:
+                write(text)
+                self.count += 1
+            return
+
+        opening, separator = ("[", ",") if self._compact else ("[\n  ", ",\n  ")
+        for text in encoded:
+            write(separator if self.count else opening)
+            write(text)
+            self.count += 1
+
+    def close(self):
+        """Finish the output (closing bracket for json) and close the file."""
+        if self._file.closed:
+            return
+        if self._fmt == "json":
+            if not self.count:
+                self._file.write("[]")
+            else:
+                self._file.write("]" if self._compact else "\n]")
+        self._file.close()
+
+    def abort(self):
+        """Close the file and remove the partial output without finishing it."""
+        if self._file.closed:
+            return
+        self._file.close()
+        _remove_partial(self._filepath)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _reopen_for_append(filepath, fmt, compact, count):
+    """Strip the closing bracket of a finished output and open it for appending.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file does not end the way a finished output with
+            `count` records does.
+    """
+    if fmt == "jsonl":
+        closing = b""
+    elif not count:
+        closing = b"[]"
+    else:
+        closing = b"]" if compact else b"\n]"
+    try:
+        f = open(filepath, "rb+")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Output file not found: {filepath}")
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - len(closing)))
+        if size < len(closing) or f.read() != closing:
+            raise ValueError(f"Cannot append to {filepath}: it is not a finished {fmt} output")
+        f.truncate(size - len(closing))
+    return open(filepath, "a")
+
+
+def _row_encoder(template):
+    """Return a function encoding one (date, close, rsi, signal) tuple."""
+    signal_literals = _SIGNAL_LITERALS
+
+    def encode(row):
+        date, close, rsi, signal = row
+        return template % (
+            encode_basestring_ascii(date),
+            _encode_number(close),
+            _encode_number(rsi),
+            signal_literals[signal],
+        )
+
+    return encode
+
+
+def _write(encoded, filepath, fmt, compact):
+    """Write pre-encoded records, adding array brackets and separators for json.
+
+    `encoded` may be a lazy generator that raises partway through (e.g. on
+    a malformed CSV row); the partial file is then removed, as by
+    SignalRowWriter.abort.
+    """
+    count = 0
+    try:
+        with open(filepath, "w") as f:
+            if fmt == "jsonl":
+                for text in encoded:
+                    f.write(text)
+                    count += 1
+                return count
+
+            opening, separator, closing = (("[", ",", "]") if compact
+                                           else ("[\n  ", ",\n  ", "\n]"))
+            for text in encoded:
+                f.write(separator if count else opening)
+                f.write(text)
+                count += 1
+            f.write(closing if count else "[]")
+    except BaseException:
+        _remove_partial(filepath)
+        raise
+    return count
+
+
+def _remove_partial(filepath):
+    """Delete a partially written output; devices such as /dev/null are left alone."""
+    try:
+        if os.path.isfile(filepath):
+            os.unlink(filepath)
+    except OSError:
+        pass
+
+
+def _encode_number(value):
+    """Encode a float or None the way the json module does."""
+    if type(value) is not float:
+        return json.dumps(value)
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format: {fmt!r}. Expected one of {list(FORMATS)}")
@@ -0,0 +1,400 @@
+"""Asyncio live-feed service: incremental RSI and signals per symbol.
+
+Ticks arrive from any number of concurrent sources (TCP connections, files
+being appended to, or the synthetic stand-in feed). Each symbol has its own
+bounded queue and RSIStream; a full queue makes its source wait, so
+backpressure reaches the producer instead of growing memory without bound.
+
+TCP tick lines are "symbol,date,open,high,low,close,volume". Followed files
+are ordinary OHLCV CSVs (with header) whose symbol is the file name stem.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from array import array
+
+from lib.csv_reader import _check_header
+from lib.rsi import RSIStream
+
+DEFAULT_QUEUE_SIZE = 1024
+
+# Latency samples kept for percentiles; older samples are overwritten
+MAX_LATENCY_SAMPLES = 1_000_000
+
+
+class LatencyStats:
+    """Tick-to-signal latency samples with percentile summaries (seconds)."""
+
+    def __init__(self, max_samples=MAX_LATENCY_SAMPLES):
+        self.count = 0
+        self._samples = array("d")
+        self._max_samples = max_samples
+
+    def add(self, seconds):
+        if len(self._samples) < self._max_samples:
+            self._samples.append(seconds)
+        else:
+            self._samples[self.count % self._max_samples] = seconds
+        self.count += 1
+
+    def percentile(self, fraction):
+        """Return the given percentile (0.5 = p50) or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        return {"count": self.count, "p50": self.percentile(0.5), "p99": self.percentile(0.99)}
+
+
+class LiveSignalService:
+    """Keeps incremental RSI state per symbol and emits a signal per tick.
+
+    Args:
+        period: RSI period.
+        queue_size: Capacity of each symbol's tick queue.
+        on_signal: Callback receiving one (symbol, date, close, rsi, signal)
+            tuple per processed tick, in per-symbol arrival order.
+        on_error: Optional callback(symbol, date, exception) for ticks whose
+            processing raised (e.g. in on_signal). Without it the first such
+            error is raised by close(). Either way the symbol's worker keeps
+            going, so drain() and submit() never wait on a dead worker.
+    """
+
+    def __init__(self, period=14, queue_size=DEFAULT_QUEUE_SIZE, on_signal=None,
+                 on_error=None):
+        self.period = period
+        self.queue_size = queue_size
+        self.on_signal = on_signal
+        self.on_error = on_error
+        self.latency = LatencyStats()
+        self.ticks = 0
+        self._error = None
+        self._queues = {}
+        self._streams = {}
+        self._workers = []
+
+    @property
+    def symbols(self):
+        return list(self._streams)
+
+    async def submit(self, symbol, date, close, received_at=None):
+        """Queue one tick, waiting while the symbol's queue is full.
+
+        Args:
+            symbol: Instrument symbol.
+            date: Bar timestamp (str).
+            close: Closing price (float).
+            received_at: time.perf_counter() when the tick arrived; defaults
+                to now. Latency is measured from this point to the signal.
+        """
+        queue = self._queues.get(symbol)
+        if queue is None:
+            queue = self._add_symbol(symbol)
+        if received_at is None:
+            received_at = time.perf_counter()
+        await queue.put((date, close, received_at))
+
+    async def drain(self):
+        """Wait until every queued tick has been processed."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    async def close(self):
+        """Process remaining ticks, then stop the per-symbol workers.
+
+        Raises:
+            Exception: The first error raised while processing a tick, when
+                no on_error callback was given.
+        """
+        await self.drain()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def stats(self):
+        """Return throughput and latency figures for processed ticks."""
+        summary = self.latency.summary()
+        summary["symbols"] = len(self._streams)
+        summary["ticks"] = self.ticks
+        return summary
+
+    def state(self):
+        """Return {symbol: RSIStream.to_dict()} so a restart can resume."""
+        return {symbol: stream.to_dict() for symbol, stream in self._streams.items()}
+
+    def restore(self, state):
+        """Load per-symbol RSI state saved by state(); call before submitting."""
+        for symbol, stream_state in state.items():
+            self._add_symbol(symbol, RSIStream.from_dict(stream_state))
+
+    def _add_symbol(self, symbol, stream=None):
+        queue = asyncio.Queue(self.queue_size)
+        self._queues[symbol] = queue
+        self._streams[symbol] = stream or RSIStream(self.period)
+        self._workers.append(asyncio.create_task(self._run_symbol(symbol, queue)))
+        return queue
+
+    async def _run_symbol(self, symbol, queue):
+        update = self._streams[symbol].update
+        on_signal = self.on_signal
+        add_latency = self.latency.add
+        clock = time.perf_counter
+        while True:
+            date, close, received_at = await queue.get()
+            try:
+                rsi, signal = update(close)
+                if on_signal is not None:
+                    on_signal((symbol, date, close, rsi, signal))
+                add_latency(clock() - received_at)
+                self.ticks += 1
+            except Exception as e:  # one failing tick must not stall the symbol
+                if self.on_error is not None:
+                    self.on_error(symbol, date, e)
+                elif self._error is None:
+                    self._error = e
+            finally:
+                queue.task_done()
+
+
+def parse_tick(line):
+    """Parse a "symbol,date,open,high,low,close,volume" line.
+
+    Returns:
+        Tuple (symbol, date, close).
+
+    Raises:
+        ValueError: If the line is malformed.
+    """
+    fields = line.rstrip("\r\n").split(",")
+    if len(fields) != 7:
+        raise ValueError(f"Expected 7 fields in tick line, got {len(fields)}: {line!r}")
+    return fields[0], fields[1], float(fields[5])
+
+
+async def serve_tcp(service, host="127.0.0.1", port=0, on_error=None):
+    """Start a TCP server that feeds tick lines from every client to `service`.
+
+    Each connection is read line by line; when a symbol's queue is full the
+    reader stops pulling bytes, so TCP flow control slows the client down.
+
+    Args:
+        service: LiveSignalService receiving the ticks.
+        host: Address to bind.
+        port: Port to bind (0 picks a free port).
+        on_error: Optional callback(line, exception) for malformed lines,
+            which are otherwise skipped silently.
+
+    Returns:
+        The asyncio Server (its sockets give the bound port).
+    """
+    async def handle(reader, writer):
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                received_at = time.perf_counter()
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                try:
+                    symbol, date, close = parse_tick(line)
+                except ValueError as e:
+                    if on_error is not None:
+                        on_error(line, e)
+                    continue
+                await service.submit(symbol, date, close, received_at)
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def follow_file(service, filepath, poll_interval=0.1, from_start=True, stop=None,
+                      on_error=None):
+    """Feed rows appended to an OHLCV CSV file into `service`.
+
+    The symbol is the file name stem. Only complete lines are consumed; a
+    partially written last line waits for its newline. Malformed lines are
+    skipped, as for serve_tcp.
+
+    Args:
+        service: LiveSignalService receiving the ticks.
+        filepath: CSV file with the standard OHLCV header.
+        poll_interval: Seconds to sleep at end of file before polling again.
+        from_start: Replay existing rows first (False starts at the end).
+        stop: Optional asyncio.Event; following ends once it is set and the
+            file has no more complete lines.
+        on_error: Optional callback(line, exception) for malformed lines,
+            which are otherwise skipped silently.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the header is missing required columns.
+    """
+    symbol = os.path.splitext(os.path.basename(filepath))[0]
+    try:
+        f = open(filepath, newline="")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+    with f:
+        header = await _read_complete_line(f, poll_interval, stop)
+        if header is None:
+            return
+        names = header.rstrip("\r\n").split(",")
+        _check_header(names, filepath)
+        date_index = names.index("date")
+        close_index = names.index("close")
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+
+        while True:
+            line = await _read_complete_line(f, poll_interval, stop)
+            if line is None:
+                return
+            if not line.strip():
+                continue
+            fields = line.rstrip("\r\n").split(",")
+            try:
+                if len(fields) <= max(date_index, close_index):
+                    raise ValueError(f"Expected {len(names)} fields in CSV line, "
+                                     f"got {len(fields)}: {line!r}")
+                close = float(fields[close_index])
+            except ValueError as e:
+                if on_error is not None:
+                    on_error(line, e)
+                continue
+            await service.submit(symbol, fields[date_index], close)
+
+
+async def _read_complete_line(f, poll_interval, stop):
+    """Return the next newline-terminated line, or None once stop is set."""
+    pending = ""
+    while True:
+        chunk = f.readline()
+        if chunk:
+            pending += chunk
+            if pending.endswith("\n"):
+                return pending
+            continue
+        if stop is not None and stop.is_set():
+            return None
+        await asyncio.sleep(poll_interval)
+
+
+async def synthetic_feed(service, symbols=100, ticks_per_symbol=100, seed=0, rate=None):
+    """Local stand-in feed: interleaved random-walk ticks for many symbols.
+
+    Args:
+        service: LiveSignalService receiving the ticks.
+        symbols: Number of symbols (named SYM00000, SYM00001, ...).
+        ticks_per_symbol: Ticks generated for each symbol.
+        seed: Random seed.
+        rate: Optional ticks per second across all symbols; None sends as
+            fast as the service accepts them.
+
+    Returns:
+        Number of ticks submitted.
+    """
+    rng = random.Random(seed)
+    names = [f"SYM{i:05d}" for i in range(symbols)]
+    prices = [100.0] * symbols
+    interval = 1.0 / rate if rate else 0.0
+    sent = 0
+    start = time.perf_counter()
+    for tick in range(ticks_per_symbol):
+        date = f"T{tick:08d}"
+        for i, symbol in enumerate(names):
+            prices[i] = max(0.01, prices[i] + rng.uniform(-1.0, 1.0))
+            await service.submit(symbol, date, prices[i])
+            sent += 1
+            if interval:
+                delay = start + sent * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        # Let consumers run between rounds even when no queue is full
+        await asyncio.sleep(0)
+    return sent
+
+
+async def run_live(output_path, period=14, listen=None, follow=(), duration=None,
+                   queue_size=DEFAULT_QUEUE_SIZE, on_listen=None, on_error=None):
+    """Run the service until cancelled or `duration` elapses.
+
+    Every processed tick is written to `output_path` as one JSON line with
+    symbol, date, close, rsi and signal keys.
+
+    Args:
+        output_path: JSON Lines file receiving the signals.
+        period: RSI period.
+        listen: Optional (host, port) to accept TCP tick feeds on.
+        follow: CSV files to follow as they are appended to.
+        duration: Optional seconds to run before shutting down cleanly.
+        queue_size: Capacity of each symbol's tick queue.
+        on_listen: Optional callback(host, port) once the server is bound.
+        on_error: Optional callback(line, exception) for malformed TCP or
+            followed-file lines, which are skipped.
+
+    Returns:
+        The service's stats() plus "seconds" and "ticks_per_second".
+
+    Raises:
+        FileNotFoundError: If a followed file does not exist; like any other
+            follower error, this stops the service as soon as it happens.
+    """
+    with open(output_path, "w") as out:
+        write = out.write
+        dumps = json.dumps
+
+        def emit(event):
+            symbol, date, close, rsi, signal = event
+            write(dumps({"symbol": symbol, "date": date, "close": close,
+                         "rsi": None if rsi is None else round(rsi, 2),
+                         "signal": signal}) + "\n")
+
+        service = LiveSignalService(period, queue_size, emit)
+        stop = asyncio.Event()
+        server = None
+        if listen is not None:
+            server = await serve_tcp(service, *listen, on_error=on_error)
+            if on_listen is not None:
+                on_listen(*server.sockets[0].getsockname()[:2])
+        followers = [asyncio.create_task(follow_file(service, path, stop=stop,
+                                                     on_error=on_error))
+                     for path in follow]
+
+        start = time.perf_counter()
+        waiter = asyncio.ensure_future(
+            asyncio.Event().wait() if duration is None else asyncio.sleep(duration))
+        try:
+            # Followers only return once stopped, so one finishing early has
+            # failed (e.g. a missing file) and ends the run at once.
+            await asyncio.wait([waiter, *followers], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+            stop.set()
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+            results = await asyncio.gather(*followers, return_exceptions=True)
+            await service.close()
+            out.flush()
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    elapsed = time.perf_counter() - start
+    stats = service.stats()
+    stats["seconds"] = elapsed
+    stats["ticks_per_second"] = stats["ticks"] / elapsed if elapsed else None
+    return stats
@@ -0,0 +1,190 @@
+"""Memory-mapped scanner for single numeric columns of OHLCV CSV files.
+
+For close-only workloads the general readers do far more work than needed:
+they decode every line to str and split every row in Python. scan_column
+maps the file and works on large newline-aligned blocks of raw bytes
+instead. Each block is split on commas in one C call, and the requested
+field of every row is picked out with a stride slice. The floats are
+parsed by map(float, ...), so no Python-level loop runs per row.
+
+The fast path assumes plain, unquoted CSV with exactly one field per header
+column. A block containing quotes or rows of any other length is parsed
+with the csv module instead, which accepts the same rows read_csv does and
+reports the offending line of the rest.
+"""
+
+import csv
+import io
+import mmap
+import os
+from array import array
+
+from lib.csv_reader import EXPECTED_COLUMNS, _check_header
+
+# Bytes of CSV handled per block; bounds the transient split() lists
+DEFAULT_BLOCK_SIZE = 1 << 22
+
+# Files smaller than this are scanned in-process even when workers > 1
+MIN_PARALLEL_BYTES = 1 << 24
+
+
+def scan_column(filepath, column="close", workers=1, block_size=DEFAULT_BLOCK_SIZE):
+    """Read one numeric column of an OHLCV CSV file into an array('d').
+
+    The header is validated exactly like read_csv, and so are the rows: a
+    row needs every OHLCV field, and extra trailing fields are ignored.
+    Blank lines are skipped.
+
+    Args:
+        filepath: Path to the CSV file.
+        column: Numeric column to read (default: close).
+        workers: Processes scanning newline-aligned byte ranges in parallel;
+            1 (the default) scans in-process.
+        block_size: Approximate bytes per block.
+
+    Returns:
+        array('d') with one value per data row.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is empty, has wrong columns, has a row
+            missing an OHLCV field or with a non-numeric value, or `column`
+            is not a numeric OHLCV column.
+    """
+    if column not in EXPECTED_COLUMNS or column == "date":
+        raise ValueError(f"Not a numeric OHLCV column: {column!r}")
+
+    out = array("d")
+    with _map_file(filepath) as mm:
+        data_start, ncols, positions = _read_layout(mm, filepath)
+        min_fields = max(positions[name] for name in EXPECTED_COLUMNS) + 1
+        layout = (ncols, min_fields, positions[column], column, filepath)
+
+        # Number the first line of every block so errors name the right line
+        tasks = []
+        line = 2
+        for start, stop in _plan_blocks(mm, data_start, block_size):
+            tasks.append((start, stop, line))
+            line += mm[start:stop].count(b"\n")
+
+        size = len(mm) - data_start
+        if workers > 1 and len(tasks) > 1 and size >= MIN_PARALLEL_BYTES:
+            from concurrent.futures import ProcessPoolExecutor
+
+            chunks = [None] * len(tasks)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_scan_file_blocks, filepath, tasks[i::workers], layout)
+                           for i in range(min(workers, len(tasks)))]
+                for i, future in enumerate(futures):
+                    chunks[i::workers] = future.result()
+            for raw in chunks:
+                out.frombytes(raw)
+        else:
+            for start, stop, line in tasks:
+                out.extend(_scan_block(mm[start:stop], line, layout))
+    if not out:
+        raise ValueError(f"CSV file has no data rows: {filepath}")
+    return out
+
+
+class _map_file:
+    """Context manager mapping a file read-only (empty files map to b"")."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def __enter__(self):
+        try:
+            self._file = open(self.filepath, "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"CSV file not found: {self.filepath}")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._map = None
+            return b""
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def __exit__(self, *exc):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+def _read_layout(mm, filepath):
+    """Validate the header; return (data start, field count, column -> index)."""
+    end = mm.find(b"\n")
+    if end == -1:
+        end = len(mm)
+    header = next(csv.reader([mm[:end].decode("utf-8").rstrip("\r")]), None) if mm else None
+    _check_header(header, filepath)
+    # Later duplicates win, matching csv.DictReader
+    positions = {name: i for i, name in enumerate(header)}
+    return end + 1, len(header), positions
+
+
+def _plan_blocks(mm, start, block_size):
+    """Split [start, len(mm)) into (start, stop) ranges ending after a newline."""
+    blocks = []
+    size = len(mm)
+    while start < size:
+        stop = mm.find(b"\n", min(start + block_size, size) - 1)
+        stop = size if stop == -1 else stop + 1
+        blocks.append((start, stop))
+        start = stop
+    return blocks
+
+
+# Every byte but comma and newline, deleted to expose the row layout of a block
+_NOT_SKELETON = bytes(b for b in range(256) if b not in b",\n")
+
+
+def _scan_block(block, first_line, layout):
+    """Parse the requested column of one block into an array('d')."""
+    ncols, min_fields, index, column, filepath = layout
+    if b'"' not in block and 0 < index < ncols - 1:
+        parts = block.split(b",")
+        step = ncols - 1
+        rows, misaligned = divmod(len(parts) - 1, step)
+        lines = block.count(b"\n")
+        # Rows of exactly ncols fields without blank lines in between hold one
+        # newline in each slot where a row ends and the next begins, and none
+        # anywhere else; joining those slots and dropping all but commas and
+        # newlines must then leave ",\n" once per row.
+        if not misaligned and rows - 1 <= lines <= rows:
+            skeleton = b",".join(parts[::step]).translate(None, _NOT_SKELETON)
+            if skeleton == (b",\n" * rows)[:rows + lines]:
+                try:
+                    return array("d", map(float, parts[index::step]))
+                except ValueError:
+                    pass
+    # Quoted fields, first/last column, ragged rows, blank lines, or an error
+    return _scan_block_rows(block, first_line, layout)
+
+
+def _scan_block_rows(block, first_line, layout):
+    """Row-by-row fallback for _scan_block with precise error messages."""
+    ncols, min_fields, index, column, filepath = layout
+    values = array("d")
+    reader = csv.reader(io.StringIO(block.decode("utf-8")))
+    for row in reader:
+        if not row:
+            continue
+        line = first_line + reader.line_num - 1
+        if len(row) < min_fields:
+            raise ValueError(
+                f"Row on line {line} has {len(row)} fields, expected {ncols}: {filepath}"
+            )
+        try:
+            values.append(float(row[index]))
+        except ValueError:
+            raise ValueError(
+                f"Invalid {column} value {row[index]!r} on line {line}: {filepath}"
+            )
+    return values
+
+
+def _scan_file_blocks(filepath, tasks, layout):
+    """Worker: map the file and scan the given blocks; return their values as bytes."""
+    with _map_file(filepath) as mm:
+        return [_scan_block(mm[start:stop], line, layout).tobytes()
+                for start, stop, line in tasks]
@@ -0,0 +1,214 @@
+"""NumPy array backend for the RSI pipeline.
+
+Importing this module requires NumPy. The pure-Python functions in
+``lib.rsi`` stay the reference implementation and the fallback when NumPy is
+not installed.
+
+Every function computing RSI has two modes:
+
+    fast   (default) Wilder smoothing runs as a closed-form block scan (see
+           wilder_smooth). Each RSI value is within FAST_MAX_ABS_ERROR of
+           the reference: the scan only reorders float operations on
+           non-negative values, so the averages' rounding error stays
+           relative (about MAX_BLOCK ulps, 1e-13), and RSI moves by at most
+           25 points per unit of relative error in avg_gain / avg_loss.
+           The exception is an average decaying toward the subnormal
+           range, where relative precision is lost; such series are
+           smoothed exactly.
+    exact  Bit-identical to lib.rsi.calculate_rsi. Price changes and the
+           final RSI formula are vectorized (elementwise IEEE operations
+           round the same as Python floats), and only the smoothing
+           recursion runs as a scalar loop, in the reference's order.
+
+bench/differential.py checks both guarantees against the reference.
+"""
+
+import math
+from itertools import accumulate
+
+import numpy as np
+
+from lib.signals import BUY, HOLD, PENDING, SELL
+
+# Largest absolute difference between a fast-mode RSI value and the reference
+FAST_MAX_ABS_ERROR = 1e-9
+
+# Upper bound on the number of bars smoothed by one closed-form block scan.
+MAX_BLOCK = 1024
+
+# Largest decay**-k factor allowed inside a block, keeping the scaled
+# cumulative sums far away from float64 overflow.
+_MAX_BLOCK_GROWTH_LOG10 = 100.0
+
+# Positive averages below this make the block scan fall back to the exact
+# loop: carry * decay**k stays a normal float for every k in a block only
+# while the carry is above 1e-208 (see _MAX_BLOCK_GROWTH_LOG10).
+_MIN_FAST_AVERAGE = 1e-200
+
+
+def calculate_rsi(close_prices, period=14, exact=False):
+    """Calculate RSI using Wilder's smoothing on NumPy arrays.
+
+    Args:
+        close_prices: Sequence or array of closing prices.
+        period: RSI period (default 14).
+        exact: Match lib.rsi.calculate_rsi bit for bit instead of to within
+            FAST_MAX_ABS_ERROR.
+
+    Returns:
+        float64 array the same length as close_prices. The first `period`
+        entries are NaN (not enough data), mirroring None in lib.rsi.
+    """
+    close = np.asarray(close_prices, dtype=np.float64)
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+
+    # Need at least period+1 prices to compute one RSI value
+    if n < period + 1:
+        return rsi
+
+    gains, losses = _gains_and_losses(close)
+    rsi[period:] = _smoothed_rsi(gains, losses, period, exact)
+    return rsi
+
+
+def calculate_rsi_matrix(close_prices, periods, exact=False):
+    """Calculate RSI for several periods from one shared diff/gain/loss pass.
+
+    Args:
+        close_prices: Sequence or array of closing prices.
+        periods: Sequence of RSI periods.
+        exact: Match lib.rsi bit for bit (see calculate_rsi).
+
+    Returns:
+        float64 array of shape (len(close_prices), len(periods)); column j
+        equals calculate_rsi(close_prices, periods[j]).
+    """
+    close = np.asarray(close_prices, dtype=np.float64)
+    n = close.shape[0]
+    matrix = np.full((n, len(periods)), np.nan)
+    gains, losses = _gains_and_losses(close)
+    for j, period in enumerate(periods):
+        if n >= period + 1:
+            matrix[period:, j] = _smoothed_rsi(gains, losses, period, exact)
+    return matrix
+
+
+def signal_codes(rsi, lowers, uppers):
+    """Map RSI values to int8 signal codes with per-column thresholds.
+
+    Args:
+        rsi: float64 array, 1-D or 2-D (bars x columns); NaN means pending.
+        lowers: BUY threshold, a scalar or one value per column.
+        uppers: SELL threshold, a scalar or one value per column.
+
+    Returns:
+        int8 array of lib.signals codes (PENDING, BUY, SELL, HOLD) with the
+        same shape as rsi.
+    """
+    rsi = np.asarray(rsi, dtype=np.float64)
+    lowers = np.asarray(lowers, dtype=np.float64)
+    uppers = np.asarray(uppers, dtype=np.float64)
+    codes = np.full(rsi.shape, HOLD, dtype=np.int8)
+    codes[rsi > uppers] = SELL
+    codes[rsi < lowers] = BUY
+    codes[np.isnan(rsi)] = PENDING
+    return codes
+
+
+def _gains_and_losses(close):
+    changes = np.diff(close)
+    return np.maximum(changes, 0.0), np.abs(np.minimum(changes, 0.0))
+
+
+def _smoothed_rsi(gains, losses, period, exact=False):
+    smooth = wilder_smooth_exact if exact else wilder_smooth
+    return rsi_from_averages(smooth(gains, period), smooth(losses, period))
+
+
+def wilder_smooth_exact(values, period):
+    """Wilder's smoothing in the reference's operation order (see wilder_smooth).
+
+    Returns:
+        float64 array of length len(values) - period + 1, bit-identical to
+        the averages of lib.rsi._wilder_rsi.
+    """
+    seed = sum(values[:period].tolist()) / period
+    keep = period - 1
+    smoothed = accumulate(values[period:].tolist(),
+                          lambda avg, value: (avg * keep + value) / period, initial=seed)
+    return np.fromiter(smoothed, np.float64, count=values.shape[0] - period + 1)
+
+
+def wilder_smooth(values, period):
+    """Run Wilder's smoothing over a non-negative series.
+
+    The first output is the simple mean of the first `period` values; every
+    later output follows avg = (avg * (period - 1) + value) / period.
+
+    The recursion is a first-order linear filter, so instead of stepping bar
+    by bar it is evaluated in closed form over blocks of up to MAX_BLOCK bars:
+    inside a block, y[j] = decay**(j+1) * carry + cumsum(v * decay**-k)[j] *
+    decay**j / period. Only the carry between blocks is a Python-level loop.
+
+    Scaling by decay**-k loses precision once an average nears the
+    subnormal range (after thousands of zero values in a row, e.g. a long
+    flat stretch), so such series, and any with non-finite values, are
+    smoothed by wilder_smooth_exact instead.
+
+    Args:
+        values: 1-D float64 array of non-negative values (gains or losses).
+        period: Smoothing period.
+
+    Returns:
+        float64 array of length len(values) - period + 1.
+    """
+    # Seed with the same left-to-right sum the reference loop uses
+    seed = sum(values[:period].tolist()) / period
+    rest = values[period:]
+    m = rest.shape[0]
+
+    if period == 1:
+        return np.concatenate(([seed], rest))
+
+    decay = (period - 1) / period
+    block = int(_MAX_BLOCK_GROWTH_LOG10 / -math.log10(decay))
+    block = max(1, min(MAX_BLOCK, block, m))
+
+    smoothed = np.empty(m + 1)
+    smoothed[0] = seed
+    if m == 0:
+        return smoothed
+
+    nblocks = -(-m // block)
+    padded = np.zeros(nblocks * block)
+    padded[:m] = rest
+    padded = padded.reshape(nblocks, block)
+
+    powers = decay ** np.arange(block)
+    # Zero-state response of every block, computed for all blocks at once
+    zero_state = np.cumsum(padded / powers, axis=1) * (powers / period)
+    growth = powers * decay
+
+    # Propagate the carry (last smoothed value) from block to block
+    carries = np.empty(nblocks)
+    carry = seed
+    last_growth = float(growth[-1])
+    for k, tail in enumerate(zero_state[:, -1].tolist()):
+        carries[k] = carry
+        carry = tail + last_growth * carry
+
+    full = zero_state + growth * carries[:, None]
+    smoothed[1:] = full.reshape(-1)[:m]
+    if not np.isfinite(smoothed).all() or (
+            (smoothed > 0) & (smoothed < _MIN_FAST_AVERAGE)).any():
+        return wilder_smooth_exact(values, period)
+    return smoothed
+
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """Vectorized counterpart of lib.rsi._compute_rsi, edge cases included."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rsi = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+    rsi = np.where(avg_gain == 0, 0.0, rsi)
+    return np.where(avg_loss == 0, 100.0, rsi)
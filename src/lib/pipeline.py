@@ -0,0 +1,437 @@
+"""Pipeline runners: CSV -> RSI -> signals -> JSON, in memory or streamed."""
+
+import sys
+from array import array
+
+from lib.csv_reader import (COLUMN_ORDER, DEFAULT_CHUNK_SIZE, iter_csv_columns,
+                             read_csv_columns)
+from lib.events import EventBuilder, build_events
+from lib.indicators import compute_indicators, output_decimals, required_columns
+from lib.json_writer import COLUMNAR_FORMAT, SignalRowWriter, write_json, write_signal_rows
+from lib.profiling import NULL_PROFILER
+from lib.rsi import DEFAULT_PERIOD, RSIStream, calculate_rsi, calculate_rsi_multi
+from lib.rules import evaluate_rules, rule_columns
+from lib.signals import LOWER_THRESHOLD, SIGNAL_NAMES, UPPER_THRESHOLD, encode_signals
+
+# Signal values in summary order; None means RSI is still warming up
+SIGNALS = ("BUY", "SELL", "HOLD", None)
+
+
+def run_in_memory(csv_path, output_path, backend="python", fmt="json", compact=False,
+                  cache=None, profiler=NULL_PROFILER, errors=None, results_cache=None,
+                  exact=False):
+    """Run the whole pipeline with every stage materialized in memory.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path.
+        backend: RSI backend, "python" or "numpy" (falls back to python if
+            NumPy is not installed).
+        exact: Make the numpy backend bit-identical to the python one (see
+            calculate_rsi_with_backend).
+        fmt: Output format, "json", "jsonl" or "columnar" (see
+            lib.columnar_output).
+        compact: Write without indentation (ignored for columnar).
+        cache: Optional lib.cache.ColumnCache to load parsed columns from.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising, and the column
+            cache is bypassed so it never holds a leniently parsed file.
+        results_cache: Optional lib.results_cache.ResultsCache. On a hit,
+            reading, RSI and signals are skipped and the cached columns go
+            straight to output; on a miss the computed columns are stored.
+            Lenient runs bypass it, like `cache`.
+
+    Returns:
+        Tuple (row_count, counts) where counts maps each signal in SIGNALS
+        to the number of bars that produced it.
+    """
+    cached = key = None
+    if results_cache is not None and errors is None:
+        with profiler.stage("cache") as stats:
+            # Exact results are the python backend's, so they share its entries
+            key = results_cache.key(csv_path, DEFAULT_PERIOD, LOWER_THRESHOLD,
+                                    UPPER_THRESHOLD, "python" if exact else backend)
+            cached = results_cache.get(key, csv_path)
+            stats["rows"] = len(cached) if cached is not None else 0
+
+    if cached is not None:
+        dates, close_prices, rsi_values, codes = (cached.dates, cached.close, cached.rsi,
+                                                  cached.codes)
+        row_count = len(codes)
+        raw = bytes(codes)
+        counts = signal_counts([raw.count(code) for code in range(len(SIGNAL_NAMES))])
+    else:
+        with profiler.stage("read") as stats:
+            dates, close_prices = _read_date_close(csv_path, cache, errors)
+            stats["rows"] = row_count = len(dates)
+
+        with profiler.stage("rsi") as stats:
+            rsi_values = calculate_rsi_with_backend(close_prices, backend, exact)
+            stats["rows"] = row_count
+
+        with profiler.stage("signals") as stats:
+            codes, code_counts = encode_signals(rsi_values)
+            counts = signal_counts(code_counts)
+            stats["rows"] = row_count
+
+        if key is not None:
+            with profiler.stage("cache") as stats:
+                results_cache.put(key, csv_path, dates, close_prices, rsi_values, codes)
+                stats["rows"] = row_count
+
+    if fmt == COLUMNAR_FORMAT:
+        from lib.columnar_output import write_signal_columns
+        with profiler.stage("write") as stats:
+            write_signal_columns(output_path, dates, close_prices, rsi_values, codes)
+            stats["rows"] = row_count
+        return row_count, counts
+
+    with profiler.stage("records") as stats:
+        rows = []
+        names = SIGNAL_NAMES
+        for i, date in enumerate(dates):
+            rows.append(make_row(date, close_prices[i], rsi_values[i], names[codes[i]]))
+        stats["rows"] = row_count
+
+    with profiler.stage("write") as stats:
+        write_signal_rows(rows, output_path, fmt, compact)
+        stats["rows"] = row_count
+
+    return row_count, counts
+
+
+def run_streaming(csv_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, fmt="json",
+                  compact=False, profiler=NULL_PROFILER, errors=None):
+    """Run the pipeline over bounded chunks, writing records as they are made.
+
+    RSI state is carried across chunk boundaries by an RSIStream, so memory
+    stays flat regardless of input size and the output file is byte-identical
+    to run_in_memory with the python backend.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path.
+        chunk_size: Maximum number of CSV rows held in memory at once.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics,
+            accumulated over all chunks.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising.
+
+    Returns:
+        Tuple (row_count, counts), as for run_in_memory.
+    """
+    chunks = iter_csv_columns(csv_path, ("date", "close"), chunk_size, errors)
+    # Pull the first chunk before touching the output so that header and
+    # empty-file errors leave no partial file behind.
+    with profiler.stage("read") as stats:
+        chunk = next(chunks)
+        stats["rows"] = len(chunk["date"])
+    stream = RSIStream()
+    update = stream.update
+    counts = dict.fromkeys(SIGNALS, 0)
+
+    with SignalRowWriter(output_path, fmt, compact) as writer:
+        while chunk is not None:
+            with profiler.stage("rsi+signals") as stats:
+                rows = []
+                for date, close in zip(chunk["date"], chunk["close"]):
+                    rsi, signal = update(close)
+                    counts[signal] += 1
+                    rows.append(make_row(date, close, rsi, signal))
+                stats["rows"] = len(rows)
+
+            with profiler.stage("write") as stats:
+                writer.write_rows(rows)
+                stats["rows"] = len(rows)
+
+            with profiler.stage("read") as stats:
+                chunk = next(chunks, None)
+                stats["rows"] = len(chunk["date"]) if chunk is not None else 0
+
+    row_count = writer.count
+    return row_count, counts
+
+
+def run_events(csv_path, output_path, backend="python", fmt="json", compact=False,
+               cache=None, stream=False, chunk_size=DEFAULT_CHUNK_SIZE,
+               profiler=NULL_PROFILER, errors=None, exact=False):
+    """Run the pipeline writing one event per signal change instead of per bar.
+
+    Each event is {"start_date", "end_date", "length", "signal"} for a run
+    of consecutive bars with the same signal (see lib.events). In streaming
+    mode runs are joined across chunk boundaries, so both modes write the
+    same events.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path.
+        backend: RSI backend, "python" or "numpy" (ignored when streaming).
+        exact: Make the numpy backend bit-identical to the python one.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        cache: Optional lib.cache.ColumnCache (ignored when streaming).
+        stream: Read the CSV in bounded chunks with an incremental RSI.
+        chunk_size: Rows per chunk when streaming.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising, and the column
+            cache is bypassed so it never holds a leniently parsed file.
+
+    Returns:
+        Tuple (row_count, counts, event_count) with counts as for
+        run_in_memory.
+    """
+    if stream:
+        builder = EventBuilder()
+        totals = [0] * len(SIGNAL_NAMES)
+        chunks = iter_csv_columns(csv_path, ("date", "close"), chunk_size, errors)
+        with profiler.stage("read") as stats:
+            first = next(chunks)
+            stats["rows"] = len(first["date"])
+        update = RSIStream().update
+
+        def events():
+            chunk = first
+            while chunk is not None:
+                with profiler.stage("rsi+signals") as stats:
+                    codes, counts = encode_signals([update(c)[0] for c in chunk["close"]])
+                    for code, count in enumerate(counts):
+                        totals[code] += count
+                    finished = list(builder.feed(chunk["date"], codes))
+                    stats["rows"] = len(codes)
+                # Completed events are written between stages, so the few
+                # bytes they take are not attributed to any stage.
+                yield from finished
+                with profiler.stage("read") as stats:
+                    chunk = next(chunks, None)
+                    stats["rows"] = len(chunk["date"]) if chunk is not None else 0
+            yield from builder.finish()
+
+        event_count = write_json(events(), output_path, fmt, compact)
+        return sum(totals), signal_counts(totals), event_count
+
+    with profiler.stage("read") as stats:
+        dates, close_prices = _read_date_close(csv_path, cache, errors)
+        stats["rows"] = len(dates)
+    with profiler.stage("rsi") as stats:
+        rsi_values = calculate_rsi_with_backend(close_prices, backend, exact)
+        stats["rows"] = len(dates)
+    with profiler.stage("signals") as stats:
+        codes, totals = encode_signals(rsi_values)
+        stats["rows"] = len(dates)
+
+    with profiler.stage("events+write") as stats:
+        event_count = write_json(build_events(dates, codes), output_path, fmt, compact)
+        stats["rows"] = event_count
+    return sum(totals), signal_counts(totals), event_count
+
+
+def run_sweep(csv_path, output_path, periods, thresholds, backend="python", fmt="json",
+              compact=False, cache=None, profiler=NULL_PROFILER, errors=None, exact=False):
+    """Run a parameter sweep: every period crossed with every threshold pair.
+
+    The CSV is read once and price changes are shared by all periods (see
+    calculate_rsi_multi), so a sweep costs close to a single run plus one
+    smoothing loop per period. Each output record holds the date, the close,
+    an "rsi_<period>" value per period and a "signal_<period>_<lower>_<upper>"
+    value per combination.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path.
+        periods: List of RSI periods.
+        thresholds: List of (lower, upper) threshold pairs.
+        backend: RSI backend, "python" or "numpy".
+        exact: Make the numpy backend bit-identical to the python one.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        cache: Optional lib.cache.ColumnCache to load parsed columns from.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising, and the column
+            cache is bypassed so it never holds a leniently parsed file.
+
+    Returns:
+        Tuple (row_count, sweep_counts) where sweep_counts maps each
+        (period, lower, upper) combination to a counts dict as returned by
+        run_in_memory.
+    """
+    with profiler.stage("read") as stats:
+        dates, close_prices = _read_date_close(csv_path, cache, errors)
+        stats["rows"] = row_count = len(dates)
+
+    combos = [(period, lower, upper) for period in periods for lower, upper in thresholds]
+    with profiler.stage("rsi+signals") as stats:
+        rsi_columns, code_columns, code_counts = _sweep_columns(close_prices, periods,
+                                                                combos, backend, exact)
+        stats["rows"] = row_count
+
+    rsi_keys = [f"rsi_{period}" for period in periods]
+    signal_keys = [f"signal_{period}_{lower:g}_{upper:g}" for period, lower, upper in combos]
+
+    def records():
+        names = SIGNAL_NAMES
+        for i, date in enumerate(dates):
+            record = {"date": date, "close": close_prices[i]}
+            for key, column in zip(rsi_keys, rsi_columns):
+                rsi = column[i]
+                record[key] = round(rsi, 2) if rsi is not None else None
+            for key, column in zip(signal_keys, code_columns):
+                record[key] = names[column[i]]
+            yield record
+
+    with profiler.stage("records+write") as stats:
+        write_json(records(), output_path, fmt, compact)
+        stats["rows"] = row_count
+    sweep_counts = {combo: signal_counts(counts) for combo, counts in zip(combos, code_counts)}
+    return row_count, sweep_counts
+
+
+def run_indicators(csv_path, output_path, specs, buy, sell, fmt="json", compact=False,
+                   cache=None, profiler=NULL_PROFILER, errors=None):
+    """Compute several indicators in one pass and derive signals from rules.
+
+    The CSV is read once, only for the columns the indicators and rules use,
+    and all indicators share one lib.indicators.IndicatorContext, so price
+    changes, rolling sums and EMAs needed by several of them are computed
+    once. Each output record holds the date, the close, one value per
+    indicator output column and the signal.
+
+    Args:
+        csv_path: Input CSV file path.
+        output_path: Output file path.
+        specs: Parsed indicator specs (lib.indicators.parse_indicator_specs).
+        buy: Parsed buy rule (lib.rules.parse_rule).
+        sell: Parsed sell rule.
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        cache: Optional lib.cache.ColumnCache to load parsed columns from.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising, and the column
+            cache is bypassed so it never holds a leniently parsed file.
+
+    Returns:
+        Tuple (row_count, counts), as for run_in_memory.
+
+    Raises:
+        FileNotFoundError: If the CSV file does not exist.
+        ValueError: If the CSV is invalid or a rule references an unknown or
+            non-numeric column.
+    """
+    decimals = output_decimals(specs)
+    needed = set(required_columns(specs)) | {"close"}
+    needed.update(name for name in rule_columns(buy, sell) if name not in decimals)
+    if "date" in needed:
+        raise ValueError("Rules can only compare numeric columns, not 'date'")
+    names = ["date"] + [c for c in COLUMN_ORDER if c in needed]
+    unknown = needed.difference(names)
+    if unknown:
+        raise ValueError(f"Rule references unknown columns: {sorted(unknown)}. "
+                         f"Available: {sorted(set(decimals) | set(COLUMN_ORDER[1:]))}")
+
+    with profiler.stage("read") as stats:
+        if cache is not None and errors is None:
+            columns = cache.load(csv_path, names)
+        else:
+            columns = read_csv_columns(csv_path, names, errors=errors)
+        stats["rows"] = row_count = len(columns["date"])
+
+    with profiler.stage("indicators") as stats:
+        results = compute_indicators(columns, specs)
+        stats["rows"] = row_count
+
+    with profiler.stage("signals") as stats:
+        codes, code_counts = evaluate_rules({**columns, **results}, buy, sell, row_count)
+        stats["rows"] = row_count
+
+    dates, close_prices = columns["date"], columns["close"]
+    outputs = [(key, results[key], decimals[key]) for key in results]
+
+    def records():
+        signal_names = SIGNAL_NAMES
+        for i, date in enumerate(dates):
+            record = {"date": date, "close": close_prices[i]}
+            for key, column, digits in outputs:
+                value = column[i]
+                record[key] = round(value, digits) if value is not None else None
+            record["signal"] = signal_names[codes[i]]
+            yield record
+
+    with profiler.stage("records+write") as stats:
+        write_json(records(), output_path, fmt, compact)
+        stats["rows"] = row_count
+    return row_count, signal_counts(code_counts)
+
+
+def _sweep_columns(close_prices, periods, combos, backend, exact=False):
+    """Return (rsi_columns per period, code_columns and code counts per combo).
+
+    RSI columns are lists with None gaps; code columns are array('b') of
+    lib.signals codes with counts as returned by encode_signals.
+    """
+    if backend == "numpy":
+        try:
+            from lib import numpy_backend
+        except ImportError:
+            print("Warning: NumPy is not installed, using the python backend",
+                  file=sys.stderr)
+        else:
+            matrix = numpy_backend.calculate_rsi_matrix(close_prices, periods, exact)
+            combo_rsi = matrix[:, [periods.index(period) for period, _, _ in combos]]
+            codes = numpy_backend.signal_codes(combo_rsi, [c[1] for c in combos],
+                                               [c[2] for c in combos])
+            rsi_columns = [[None if v != v else v for v in column]
+                           for column in matrix.T.tolist()]
+            code_columns = [array("b", column.tobytes()) for column in codes.T.copy()]
+            code_counts = [[column.count(code) for code in range(len(SIGNAL_NAMES))]
+                           for column in code_columns]
+            return rsi_columns, code_columns, code_counts
+
+    rsi_columns = calculate_rsi_multi(close_prices, periods)
+    encoded = [encode_signals(rsi_columns[periods.index(period)], lower, upper)
+               for period, lower, upper in combos]
+    return rsi_columns, [e[0] for e in encoded], [e[1] for e in encoded]
+
+
+def _read_date_close(csv_path, cache, errors):
+    """Load the date and close columns, through the column cache if given.
+
+    Lenient reads (`errors` given) bypass the cache.
+    """
+    if cache is not None and errors is None:
+        columns = cache.load(csv_path, ("date", "close"))
+    else:
+        columns = read_csv_columns(csv_path, ("date", "close"), errors=errors)
+    return columns["date"], columns["close"]
+
+
+def calculate_rsi_with_backend(close_prices, backend, exact=False):
+    """Calculate RSI with the requested backend, returning a list with None gaps.
+
+    The python backend is the reference. The numpy backend is within
+    numpy_backend.FAST_MAX_ABS_ERROR of it, or bit-identical with `exact`.
+    """
+    if backend == "numpy":
+        try:
+            from lib import numpy_backend
+        except ImportError:
+            print("Warning: NumPy is not installed, using the python backend",
+                  file=sys.stderr)
+        else:
+            rsi = numpy_backend.calculate_rsi(close_prices, exact=exact).tolist()
+            return [None if v != v else v for v in rsi]
+    return calculate_rsi(close_prices)
+
+
+def signal_counts(code_counts):
+    """Convert counts indexed by signal code into a dict keyed as SIGNALS."""
+    return {signal: code_counts[SIGNAL_NAMES.index(signal)] for signal in SIGNALS}
+
+
+def make_row(date, close, rsi, signal):
+    """Build one (date, close, rsi, signal) output row, rounding RSI to 2 decimals."""
+    return (date, close, round(rsi, 2) if rsi is not None else None, signal)
@@ -0,0 +1,133 @@
+"""Per-stage timing and memory instrumentation for the pipeline."""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Metric name prefix for Prometheus text output
+PROMETHEUS_PREFIX = "rsi_pipeline_stage"
+
+_PROMETHEUS_METRICS = (
+    ("wall_seconds", "Wall-clock time spent in the pipeline stage."),
+    ("cpu_seconds", "Process CPU time spent in the pipeline stage."),
+    ("rows", "Rows processed by the pipeline stage."),
+    ("rows_per_second", "Rows processed per wall-clock second."),
+    ("peak_bytes", "Peak traced Python memory while the stage ran."),
+)
+
+
+class StageProfiler:
+    """Records wall time, CPU time, rows/s and peak memory per pipeline stage.
+
+    Wrap each stage in `with profiler.stage(name) as stats:` and set
+    stats["rows"] inside the block. Entering a stage name again (e.g. once
+    per chunk in streaming mode) adds to its totals; peak memory is the
+    highest seen. Stages must not be nested.
+
+    Peak memory comes from tracemalloc, which is started on the first stage
+    and covers Python allocations only (not memory-mapped files). Tracing
+    slows allocation-heavy stages several times over, so pass
+    trace_memory=False when only the timings matter; peak_bytes is then None.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager timing one run of the named stage."""
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        stats = {"rows": 0}
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield stats
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            totals = self.stages.setdefault(
+                name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "rows": 0, "peak_bytes": None}
+            )
+            totals["wall_seconds"] += wall
+            totals["cpu_seconds"] += cpu
+            totals["rows"] += stats["rows"]
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                totals["peak_bytes"] = max(totals["peak_bytes"] or 0, peak)
+
+    def stop(self):
+        """Stop tracemalloc if this profiler traces memory."""
+        if self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def metrics(self):
+        """Return a list of per-stage metric dicts in the order stages ran."""
+        result = []
+        for name, totals in self.stages.items():
+            wall = totals["wall_seconds"]
+            rate = totals["rows"] / wall if wall and totals["rows"] else None
+            result.append(dict(stage=name, rows_per_second=rate, **totals))
+        return result
+
+    def format_table(self):
+        """Return a fixed-width summary table of all stages."""
+        lines = [f"{'stage':<14} {'wall s':>9} {'cpu s':>9} {'rows':>10} "
+                 f"{'rows/s':>12} {'peak MB':>9}"]
+        for m in self.metrics():
+            rate = f"{m['rows_per_second']:,.0f}" if m["rows_per_second"] else "-"
+            peak = f"{m['peak_bytes'] / 2**20:.2f}" if m["peak_bytes"] is not None else "-"
+            lines.append(f"{m['stage']:<14} {m['wall_seconds']:>9.4f} {m['cpu_seconds']:>9.4f} "
+                         f"{m['rows']:>10} {rate:>12} {peak:>9}")
+        return "\n".join(lines)
+
+    def write_metrics(self, filepath, fmt="json"):
+        """Write metrics to a file as JSON or Prometheus text exposition format.
+
+        Raises:
+            ValueError: If fmt is not "json" or "prometheus".
+        """
+        if fmt == "json":
+            text = json.dumps({"stages": self.metrics()}, indent=2) + "\n"
+        elif fmt == "prometheus":
+            text = self._prometheus_text()
+        else:
+            raise ValueError(f"Unknown metrics format: {fmt!r}")
+        with open(filepath, "w") as f:
+            f.write(text)
+
+    def _prometheus_text(self):
+        lines = []
+        metrics = self.metrics()
+        for key, help_text in _PROMETHEUS_METRICS:
+            name = f"{PROMETHEUS_PREFIX}_{key}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for m in metrics:
+                if m[key] is not None:
+                    lines.append(f'{name}{{stage="{m["stage"]}"}} {m[key]!r}')
+        return "\n".join(lines) + "\n"
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off: every stage is a no-op."""
+
+    enabled = False
+    _context = nullcontext({"rows": 0})
+
+    def stage(self, name):
+        return self._context
+
+    def stop(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,304 @@
+"""Timeframe resampling: aggregate OHLCV bars into higher timeframes.
+
+Bars are bucketed by their "date" column (an ISO date or date-time, e.g.
+"2024-01-02" or "2024-01-02 09:31:00") into fixed-length buckets aligned to
+the Unix epoch, so "1d" bars start at midnight and "1h" bars on the hour.
+Each output bar has open=first, high=max, low=min, close=last and
+volume=sum of its input bars, and is dated by its bucket's start.
+
+A Resampler produces any number of timeframes in one pass. Timeframes are
+cascaded: one that is a multiple of a finer requested timeframe is built
+from that timeframe's finished bars instead of the raw rows, so e.g.
+"5m,1h,1d" aggregates the raw rows only once.
+
+run_resampled streams a CSV through a Resampler and computes RSI and
+signals on every timeframe's bars as they complete, so multi-timeframe
+signals need one read of the file and memory stays bounded by the chunk
+size.
+"""
+
+import os
+from array import array
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+
+from lib.csv_reader import COLUMN_ORDER, DEFAULT_CHUNK_SIZE, iter_csv_columns
+from lib.json_writer import SignalRowWriter
+from lib.pipeline import SIGNALS, make_row
+from lib.profiling import NULL_PROFILER
+from lib.rsi import RSIStream
+
+TIMEFRAME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_DAY = 86400
+
+
+def parse_timeframe(text):
+    """Parse a timeframe such as "30s", "5m", "1h" or "1d" into seconds.
+
+    Raises:
+        ValueError: If the text is not a positive count followed by a unit.
+    """
+    count, unit = text[:-1], text[-1:]
+    if unit not in TIMEFRAME_UNITS or not count.isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid timeframe: {text!r}. Expected a positive count and a "
+                         f"unit from {list(TIMEFRAME_UNITS)}, e.g. 5m")
+    return int(count) * TIMEFRAME_UNITS[unit]
+
+
+def parse_timeframes(text):
+    """Parse "5m,1h,1d" into a list of unique timeframe labels.
+
+    Raises:
+        ValueError: On an invalid timeframe or two labels of the same length
+            (e.g. "60m,1h").
+    """
+    labels = []
+    seen = {}
+    for label in (part.strip() for part in text.split(",")):
+        seconds = parse_timeframe(label)
+        if seconds in seen:
+            raise ValueError(f"Timeframes {seen[seconds]!r} and {label!r} are the same")
+        seen[seconds] = label
+        labels.append(label)
+    return labels
+
+
+def date_to_seconds(date):
+    """Seconds since the Unix epoch for an ISO date or date-time string.
+
+    Date-times with a UTC offset are converted to UTC; naive ones are taken
+    as they are.
+
+    Raises:
+        ValueError: If the string is not an ISO date or date-time.
+    """
+    moment = datetime.fromisoformat(date)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - _EPOCH) // _SECOND
+
+
+class Resampler:
+    """Aggregates OHLCV column chunks into several timeframes in one pass.
+
+    Call feed() with each chunk in date order, then finish(). Both return
+    {label: bar columns} with the bars completed by that call, where bar
+    columns are a dict like read_csv_columns returns: "date" (the bucket
+    start, as "YYYY-MM-DD" for whole-day timeframes and "YYYY-MM-DD
+    HH:MM:SS" otherwise) plus array('d') open, high, low, close, volume.
+
+    Args:
+        timeframes: Timeframe labels, e.g. ["5m", "1h"] (see
+            parse_timeframes).
+    """
+
+    def __init__(self, timeframes):
+        steps = {label: parse_timeframe(label) for label in timeframes}
+        self.timeframes = list(steps)
+        # Finest first, so each timeframe's source is built before it
+        self._plan = []
+        for label in sorted(steps, key=steps.get):
+            step = steps[label]
+            finer = [(s, source) for source, s in steps.items() if s < step and step % s == 0]
+            self._plan.append((label, step, max(finer)[1] if finer else None))
+        self._pending = dict.fromkeys(steps)
+        self._last_seconds = None
+
+    def feed(self, columns):
+        """Aggregate one chunk of OHLCV columns (with "date") in date order.
+
+        Raises:
+            ValueError: If a date is invalid or earlier than the one before.
+        """
+        dates = columns["date"]
+        try:
+            starts = list(map(date_to_seconds, dates))
+        except (TypeError, ValueError):
+            bad = next(d for d in dates if not _is_date(d))
+            raise ValueError(f"Invalid date {bad!r}: expected an ISO date or date-time")
+        previous = self._last_seconds
+        for i in range(len(starts)):
+            if previous is not None and starts[i] < previous:
+                raise ValueError(f"Dates must be ascending to resample: {dates[i]!r} "
+                                 f"follows a later date")
+            previous = starts[i]
+        self._last_seconds = previous
+        raw = (starts, [columns[name] for name in COLUMN_ORDER[1:]])
+        return self._run(raw, final=False)
+
+    def finish(self):
+        """Return the last, still open bar of every timeframe."""
+        return self._run((array("q"), [array("d") for _ in COLUMN_ORDER[1:]]), final=True)
+
+    def _run(self, raw, final):
+        finished = {}
+        for label, step, source in self._plan:
+            starts, values = raw if source is None else finished[source]
+            bars, self._pending[label] = _aggregate(starts, values, step,
+                                                    self._pending[label])
+            if final and self._pending[label] is not None:
+                bars.append(self._pending[label])
+                self._pending[label] = None
+            starts = array("q", [bar[0] * step for bar in bars])
+            finished[label] = (starts, [array("d", [bar[k] for bar in bars])
+                                        for k in range(1, 6)])
+        result = {}
+        for label, step, _ in self._plan:
+            starts, values = finished[label]
+            columns = {"date": [_format_start(start, step) for start in starts]}
+            columns.update(zip(COLUMN_ORDER[1:], values))
+            result[label] = columns
+        return {label: result[label] for label in self.timeframes}
+
+
+def resample_columns(columns, timeframes):
+    """Resample in-memory OHLCV columns into each timeframe.
+
+    Args:
+        columns: Dict of all six columns, e.g. from read_csv_columns.
+        timeframes: Timeframe labels.
+
+    Returns:
+        {label: bar columns}, as for Resampler.
+    """
+    resampler = Resampler(timeframes)
+    result = resampler.feed(columns)
+    for label, tail in resampler.finish().items():
+        for name, values in tail.items():
+            result[label][name].extend(values)
+    return result
+
+
+def run_resampled(csv_path, output_path, timeframes, fmt="json", compact=False,
+                  chunk_size=DEFAULT_CHUNK_SIZE, profiler=NULL_PROFILER, errors=None):
+    """Resample a CSV into each timeframe and write RSI and signals per timeframe.
+
+    Each timeframe gets its own output file of (date, close, rsi, signal)
+    records, as for lib.pipeline.run_streaming, where date is the bar's
+    bucket start and close its last close. With one timeframe that file is
+    output_path; with several, the timeframe label is appended to its stem
+    (see timeframe_path).
+
+    Args:
+        csv_path: Input CSV file path, with dates in ascending order.
+        output_path: Output file path.
+        timeframes: Timeframe labels, e.g. ["5m", "1h"].
+        fmt: Output format, "json" or "jsonl".
+        compact: Write without indentation.
+        chunk_size: Maximum number of CSV rows held in memory at once.
+        profiler: lib.profiling.StageProfiler to record per-stage metrics,
+            accumulated over all chunks.
+        errors: Optional lib.csv_reader.ParseErrors; malformed rows are then
+            skipped and recorded in it instead of raising.
+
+    Returns:
+        Tuple (row_count, results): the number of input rows, and for each
+        timeframe label a tuple (path, bar_count, counts) with counts as for
+        lib.pipeline.run_in_memory.
+
+    Raises:
+        FileNotFoundError: If the CSV file does not exist.
+        ValueError: If the CSV is invalid or its dates are not ascending.
+    """
+    resampler = Resampler(timeframes)
+    paths = {label: output_path if len(resampler.timeframes) == 1
+             else timeframe_path(output_path, label) for label in resampler.timeframes}
+    chunks = iter_csv_columns(csv_path, COLUMN_ORDER, chunk_size, errors)
+    # Pull the first chunk before touching the outputs so that header and
+    # empty-file errors leave no partial files behind.
+    with profiler.stage("read") as stats:
+        chunk = next(chunks)
+        stats["rows"] = row_count = len(chunk["date"])
+    streams = {label: RSIStream().update for label in resampler.timeframes}
+    counts = {label: dict.fromkeys(SIGNALS, 0) for label in resampler.timeframes}
+    # On an error every writer removes its partial output (see SignalRowWriter)
+    with ExitStack() as stack:
+        writers = {label: stack.enter_context(SignalRowWriter(path, fmt, compact))
+                   for label, path in paths.items()}
+        while True:
+            with profiler.stage("resample") as stats:
+                bars = resampler.feed(chunk) if chunk is not None else resampler.finish()
+                stats["rows"] = sum(len(columns["date"]) for columns in bars.values())
+
+            for label, columns in bars.items():
+                with profiler.stage("rsi+signals") as stats:
+                    update, label_counts = streams[label], counts[label]
+                    rows = []
+                    for date, close in zip(columns["date"], columns["close"]):
+                        rsi, signal = update(close)
+                        label_counts[signal] += 1
+                        rows.append(make_row(date, close, rsi, signal))
+                    stats["rows"] = len(rows)
+
+                with profiler.stage("write") as stats:
+                    writers[label].write_rows(rows)
+                    stats["rows"] = len(rows)
+
+            if chunk is None:
+                break
+            with profiler.stage("read") as stats:
+                chunk = next(chunks, None)
+                stats["rows"] = len(chunk["date"]) if chunk is not None else 0
+                row_count += stats["rows"]
+
+    return row_count, {label: (paths[label], writers[label].count, counts[label])
+                       for label in resampler.timeframes}
+
+
+def timeframe_path(output_path, label):
+    """Output path for one timeframe: "out.json" -> "out_5m.json"."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_{label}{ext}"
+
+
+def _aggregate(starts, values, step, pending):
+    """Aggregate rows starting at `starts` (seconds) into `step`-second buckets.
+
+    Args:
+        starts: Row start times in ascending order.
+        values: [opens, highs, lows, closes, volumes] for the rows.
+        step: Bucket length in seconds.
+        pending: The open bar carried over from the previous call, or None.
+
+    Returns:
+        Tuple (finished, pending): finished bars as [bucket, open, high,
+        low, close, volume] lists and the new open bar.
+    """
+    opens, highs, lows, closes, volumes = values
+    buckets = [start // step for start in starts]
+    n = len(buckets)
+    if not n:
+        return [], pending
+    cuts = [i for i in range(1, n) if buckets[i] != buckets[i - 1]]
+    finished = []
+    for begin, end in zip([0] + cuts, cuts + [n]):
+        bar = [buckets[begin], opens[begin], max(highs[begin:end]), min(lows[begin:end]),
+               closes[end - 1], sum(volumes[begin:end])]
+        if pending is not None:
+            if pending[0] == bar[0]:
+                bar[1] = pending[1]
+                bar[2] = max(bar[2], pending[2])
+                bar[3] = min(bar[3], pending[3])
+                bar[5] += pending[5]
+            else:
+                finished.append(pending)
+        pending = bar
+    return finished, pending
+
+
+def _format_start(seconds, step):
+    moment = _EPOCH + timedelta(seconds=seconds)
+    if step % _DAY == 0:
+        return f"{moment:%Y-%m-%d}"
+    return f"{moment:%Y-%m-%d %H:%M:%S}"
+
+
+def _is_date(text):
+    try:
+        date_to_seconds(text)
+    except (TypeError, ValueError):
+        return False
+    return True
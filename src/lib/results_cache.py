@@ -0,0 +1,224 @@
+"""Content-addressed cache of computed RSI and signal columns.
+
+A run's results depend only on the input's bytes, the RSI period, the
+signal thresholds, the RSI backend and the code that computes them. The
+key is a SHA-256 over exactly those, so identical runs from any job, user
+or input path share one entry, and any edit to lib.csv_reader, lib.rsi,
+lib.signals, lib.pipeline or lib.numpy_backend invalidates every entry made
+by the old code.
+
+There are two tiers:
+
+    memory  A bounded LRU of the last `max_entries` results in this process,
+            for long-running use (main.py --server). A hit returns the
+            columns as they were computed, without touching the disk.
+    disk    One binary columnar file (lib.colfile) per key in the cache
+            directory, with a one-byte-per-row "rsi_valid" mask so that a
+            missing RSI (None) and a NaN RSI both read back as computed.
+            The least recently used entries are evicted once the
+            directory's entries exceed `max_bytes`, as for lib.cache.
+
+Hashing an input costs one read of its bytes but no parsing. The digest is
+remembered per (path, mtime, size), so within one process an unchanged file
+is hashed only once.
+"""
+
+import hashlib
+import json
+import os
+from array import array
+from collections import OrderedDict
+
+from lib.cache import DEFAULT_CACHE_DIRNAME, DEFAULT_MAX_BYTES, evict, file_hash
+from lib.colfile import read_columns, write_columns
+from lib.csv_reader import DateColumn
+
+# Bump when the cached layout or the meaning of an entry changes
+RESULTS_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 16
+
+_ENTRY_SUFFIX = ".res"
+_NAN = float("nan")
+
+# Modules whose source is part of the key; the backend's module is added
+_CODE_MODULES = ("csv_reader.py", "rsi.py", "signals.py", "pipeline.py")
+_BACKEND_MODULES = {"numpy": "numpy_backend.py"}
+_code_versions = {}
+
+
+class CachedResult:
+    """One run's computed columns.
+
+    Attributes:
+        dates: Sequence of date strings.
+        close: array('d') (or "d" memoryview) of closing prices.
+        rsi: List of RSI floats, None where not yet available.
+        codes: array('b') (or "b" memoryview) of lib.signals codes.
+    """
+
+    def __init__(self, dates, close, rsi, codes):
+        self.dates = dates
+        self.close = close
+        self.rsi = rsi
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class ResultsCache:
+    """Memory and disk cache of CachedResult objects keyed by key().
+
+    Attributes:
+        cache_dir: Directory for disk entries, or None to use
+            DEFAULT_CACHE_DIRNAME next to each input file.
+        max_bytes: Size bound for the disk entries.
+        max_entries: Number of results held in memory.
+        rebuild: Ignore existing entries (get() always misses).
+        memory_hits: Number of get() calls served from memory.
+        disk_hits: Number of get() calls served from disk.
+        misses: Number of get() calls that found nothing.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES,
+                 max_entries=DEFAULT_MAX_ENTRIES, rebuild=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.rebuild = rebuild
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._hashes = {}
+
+    def key(self, csv_path, period, lower, upper, backend="python"):
+        """Return the cache key of one run over `csv_path`.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        parts = [RESULTS_VERSION, code_version(backend), self.input_hash(csv_path),
+                 period, lower, upper, backend]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:32]
+
+    def input_hash(self, csv_path):
+        """SHA-256 of a file's bytes, remembered while its mtime and size hold.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        abspath = os.path.abspath(csv_path)
+        try:
+            stat = os.stat(abspath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        known = self._hashes.get(abspath)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        digest = file_hash(abspath)
+        self._hashes[abspath] = (stamp, digest)
+        return digest
+
+    def get(self, key, csv_path):
+        """Return the CachedResult stored under `key`, or None on a miss.
+
+        Args:
+            key: Result of key().
+            csv_path: The input the key was made for (locates the default
+                cache directory).
+        """
+        if self.rebuild:
+            self.misses += 1
+            return None
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return result
+
+        entry_path = self.entry_path(key, csv_path)
+        try:
+            metadata, columns = read_columns(entry_path)
+        except (OSError, ValueError):
+            metadata = {}
+        if metadata.get("version") != RESULTS_VERSION or metadata.get("key") != key:
+            self.misses += 1
+            return None
+        _touch(entry_path)
+        self.disk_hits += 1
+        rsi = [v if valid else None for v, valid in zip(columns["rsi"], columns["rsi_valid"])]
+        result = CachedResult(columns["date"], columns["close"], rsi, columns["signal"])
+        self._remember(key, result)
+        return result
+
+    def put(self, key, csv_path, dates, close, rsi, codes):
+        """Store one run's columns (see CachedResult) in memory and on disk.
+
+        A cache directory that cannot be written is not an error; the result
+        is then only kept in memory.
+
+        Returns:
+            The stored CachedResult.
+        """
+        result = CachedResult(dates, close, rsi, codes)
+        self._remember(key, result)
+        entry_path = self.entry_path(key, csv_path)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            write_columns(entry_path, {
+                "date": dates if isinstance(dates, (list, DateColumn)) else list(dates),
+                "close": close if isinstance(close, (array, memoryview)) else array("d", close),
+                "rsi": array("d", [_NAN if v is None else v for v in rsi]),
+                "rsi_valid": bytes([v is not None for v in rsi]),
+                "signal": codes if isinstance(codes, (array, memoryview)) else array("b", codes),
+            }, metadata={"version": RESULTS_VERSION, "key": key})
+            evict(os.path.dirname(entry_path), self.max_bytes, keep=entry_path,
+                  suffix=_ENTRY_SUFFIX)
+        except OSError:
+            pass
+        return result
+
+    def entry_path(self, key, csv_path):
+        """Return the disk entry path for a key."""
+        cache_dir = self.cache_dir or os.path.join(
+            os.path.dirname(os.path.abspath(csv_path)), DEFAULT_CACHE_DIRNAME)
+        return os.path.join(cache_dir, key + _ENTRY_SUFFIX)
+
+    def stats(self):
+        """Return hit and miss counters and the memory tier's size as a dict."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+def code_version(backend="python"):
+    """SHA-256 over the source of the modules that compute a backend's results."""
+    version = _code_versions.get(backend)
+    if version is None:
+        lib_dir = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha256()
+        for name in _CODE_MODULES + tuple(filter(None, [_BACKEND_MODULES.get(backend)])):
+            with open(os.path.join(lib_dir, name), "rb") as f:
+                digest.update(f.read())
+        version = _code_versions[backend] = digest.hexdigest()[:16]
+    return version
+
+
+def _touch(entry_path):
+    """Mark an entry as recently used for LRU eviction."""
+    try:
+        os.utime(entry_path)
+    except OSError:
+        pass
@@ -1,7 +1,11 @@
 """RSI (Relative Strength Index) calculator using Wilder's smoothing method."""
 
+from lib.signals import generate_signal
 
-def calculate_rsi(close_prices, period=14):
+DEFAULT_PERIOD = 14
+
+
+def calculate_rsi(close_prices, period=DEFAULT_PERIOD):
     """Calculate 14-period RSI using Wilder's smoothing.
 
     Args:
@@ -19,12 +23,44 @@ def calculate_rsi(close_prices, period=14):
     if n < period + 1:
         return [None] * n
 
-    # Calculate price changes
+    gains, losses = _gains_and_losses(close_prices)
+    return _wilder_rsi(gains, losses, period)
+
+
+def calculate_rsi_multi(close_prices, periods):
+    """Calculate RSI for several periods from one shared pass over the prices.
+
+    Price changes, gains and losses are computed once and reused by every
+    period, so each extra period only costs its smoothing loop. Each column
+    is exactly what calculate_rsi(close_prices, period) returns.
+
+    Args:
+        close_prices: List of closing prices (floats).
+        periods: Iterable of RSI periods.
+
+    Returns:
+        List of RSI columns, one per period, in the order given.
+    """
+    n = len(close_prices)
+    gains, losses = _gains_and_losses(close_prices)
+    return [
+        _wilder_rsi(gains, losses, period) if n >= period + 1 else [None] * n
+        for period in periods
+    ]
+
+
+def _gains_and_losses(close_prices):
+    """Return (gains, losses) lists of the price changes (length n - 1)."""
+    n = len(close_prices)
     changes = [close_prices[i] - close_prices[i - 1] for i in range(1, n)]
 
     gains = [max(c, 0.0) for c in changes]
     losses = [abs(min(c, 0.0)) for c in changes]
+    return gains, losses
+
 
+def _wilder_rsi(gains, losses, period):
+    """Wilder-smoothed RSI series for at least `period` gains and losses."""
     rsi_values = [None] * period  # First `period` entries have no RSI
 
     # First averages: simple mean of first `period` values
@@ -35,7 +71,7 @@ def calculate_rsi(close_prices, period=14):
     rsi_values.append(_compute_rsi(avg_gain, avg_loss))
 
     # Subsequent values use Wilder's smoothing
-    for i in range(period, len(changes)):
+    for i in range(period, len(gains)):
         avg_gain = ((avg_gain * (period - 1)) + gains[i]) / period
         avg_loss = ((avg_loss * (period - 1)) + losses[i]) / period
         rsi_values.append(_compute_rsi(avg_gain, avg_loss))
@@ -57,3 +93,87 @@ def _compute_rsi(avg_gain, avg_loss):
         return 0.0
     rs = avg_gain / avg_loss
     return 100.0 - (100.0 / (1.0 + rs))
+
+
+class RSIStream:
+    """Incremental RSI calculator: O(1) work per new closing price.
+
+    Feeding a series through update() one price at a time gives exactly the
+    same RSI values as calculate_rsi on the whole series. The state is a plain
+    dict (see to_dict/from_dict), so a restarted process can resume without
+    replaying history.
+
+    Attributes:
+        period: RSI period.
+        count: Number of prices seen so far (the warm-up counter).
+        prev_close: Last price seen, or None before the first update.
+        avg_gain: Wilder-smoothed average gain, or None during warm-up.
+        avg_loss: Wilder-smoothed average loss, or None during warm-up.
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.count = 0
+        self.prev_close = None
+        self.avg_gain = None
+        self.avg_loss = None
+        # Gains/losses of the warm-up window; the first averages are their
+        # sum() so they match calculate_rsi bit for bit.
+        self._warmup_gains = []
+        self._warmup_losses = []
+
+    def update(self, close):
+        """Add one closing price.
+
+        Args:
+            close: Closing price (float).
+
+        Returns:
+            Tuple (rsi, signal). Both are None until period+1 prices are seen.
+        """
+        rsi = None
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            gain = max(change, 0.0)
+            loss = abs(min(change, 0.0))
+            period = self.period
+            if self.avg_gain is None:
+                self._warmup_gains.append(gain)
+                self._warmup_losses.append(loss)
+                if len(self._warmup_gains) == period:
+                    self.avg_gain = sum(self._warmup_gains) / period
+                    self.avg_loss = sum(self._warmup_losses) / period
+                    self._warmup_gains = []
+                    self._warmup_losses = []
+                    rsi = _compute_rsi(self.avg_gain, self.avg_loss)
+            else:
+                self.avg_gain = ((self.avg_gain * (period - 1)) + gain) / period
+                self.avg_loss = ((self.avg_loss * (period - 1)) + loss) / period
+                rsi = _compute_rsi(self.avg_gain, self.avg_loss)
+        self.prev_close = close
+        self.count += 1
+        return rsi, generate_signal(rsi)
+
+    def to_dict(self):
+        """Return the stream state as a JSON-serializable dict."""
+        return {
+            "period": self.period,
+            "count": self.count,
+            "prev_close": self.prev_close,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "warmup_gains": list(self._warmup_gains),
+            "warmup_losses": list(self._warmup_losses),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a stream from a dict produced by to_dict()."""
+        stream = cls(state["period"])
+        stream.count = state["count"]
+        stream.prev_close = state["prev_close"]
+        stream.avg_gain = state["avg_gain"]
+        stream.avg_loss = state["avg_loss"]
+        stream._warmup_gains = list(state["warmup_gains"])
+        stream._warmup_losses = list(state["warmup_losses"])
+        return stream
@@ -0,0 +1,105 @@
+"""Signal rules combining indicator columns.
+
+A rule is a comma-separated list of comparisons that must all hold, e.g.
+"rsi<30,close<bollinger_lower" or "macd>macd_signal". Each side of a
+comparison is a column name (an indicator output or an OHLCV column) or a
+number; the operators are <, <=, > and >=.
+
+Bars are coded like lib.signals.encode_signals: PENDING while any column
+referenced by either rule is still warming up, else BUY if the buy rule
+holds, else SELL if the sell rule holds, else HOLD.
+"""
+
+import operator
+import re
+from array import array
+
+from lib.signals import BUY, HOLD, PENDING, SELL, SIGNAL_NAMES
+
+# The rules equivalent to lib.signals' default RSI thresholds
+DEFAULT_BUY_RULE = "rsi<30"
+DEFAULT_SELL_RULE = "rsi>70"
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+_COMPARISON = re.compile(r"\s*([^<>=\s]+)\s*(<=|>=|<|>)\s*([^<>=\s]+)\s*")
+_NAME = re.compile(r"[A-Za-z_]\w*")
+
+
+def parse_rule(text):
+    """Parse "rsi<30,close<bollinger_lower" into [(left, op, right)].
+
+    Operands are floats for numbers and strings for column names.
+
+    Raises:
+        ValueError: If a comparison is malformed.
+    """
+    conditions = []
+    for part in text.split(","):
+        match = _COMPARISON.fullmatch(part)
+        if match is None:
+            raise ValueError(f"Invalid rule condition: {part!r}")
+        left, op, right = match.groups()
+        conditions.append((_parse_operand(left, part), op, _parse_operand(right, part)))
+    return conditions
+
+
+def rule_columns(*rules):
+    """Return the column names referenced by parsed rules, in first-use order."""
+    names = [operand for rule in rules for left, _, right in rule
+             for operand in (left, right) if isinstance(operand, str)]
+    return list(dict.fromkeys(names))
+
+
+def evaluate_rules(columns, buy, sell, length):
+    """Encode per-bar signals from parsed buy and sell rules.
+
+    Args:
+        columns: Dict mapping column name to its values (None = no value).
+        buy: Parsed buy rule (see parse_rule).
+        sell: Parsed sell rule.
+        length: Number of bars.
+
+    Returns:
+        Tuple (codes, counts) as returned by lib.signals.encode_signals.
+
+    Raises:
+        ValueError: If a rule references a column not in `columns`.
+    """
+    referenced = rule_columns(buy, sell)
+    missing = [name for name in referenced if name not in columns]
+    if missing:
+        raise ValueError(f"Rule references unknown columns: {missing}. "
+                         f"Available: {sorted(columns)}")
+
+    if referenced:
+        pending = [None in values for values in zip(*(columns[n] for n in referenced))]
+    else:
+        pending = [False] * length
+    buys = _holds(columns, buy, length)
+    sells = _holds(columns, sell, length)
+    raw = bytes([PENDING if p else BUY if b else SELL if s else HOLD
+                 for p, b, s in zip(pending, buys, sells)])
+    return array("b", raw), [raw.count(code) for code in range(len(SIGNAL_NAMES))]
+
+
+def _holds(columns, rule, length):
+    """Per-bar truth of all the rule's conditions (values assumed present)."""
+    result = [True] * length
+    for left, op, right in rule:
+        compare = OPERATORS[op]
+        lefts = columns[left] if isinstance(left, str) else [left] * length
+        rights = columns[right] if isinstance(right, str) else [right] * length
+        result = [r and a is not None and b is not None and compare(a, b)
+                  for r, a, b in zip(result, lefts, rights)]
+    return result
+
+
+def _parse_operand(text, part):
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if not _NAME.fullmatch(text):
+        raise ValueError(f"Invalid operand {text!r} in rule condition: {part!r}")
+    return text
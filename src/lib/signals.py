@@ -1,34 +1,106 @@
 """Signal generator based on RSI values."""
 
+from array import array
 
-def generate_signal(rsi_value):
+# Default RSI thresholds: BUY below LOWER, SELL above UPPER
+LOWER_THRESHOLD = 30
+UPPER_THRESHOLD = 70
+
+# Compact int8 signal codes, and the signal each code stands for
+PENDING = 0
+BUY = 1
+SELL = 2
+HOLD = 3
+SIGNAL_NAMES = (None, "BUY", "SELL", "HOLD")
+
+
+def generate_signal(rsi_value, lower=LOWER_THRESHOLD, upper=UPPER_THRESHOLD):
     """Generate a trading signal from an RSI value.
 
     Args:
         rsi_value: RSI value (float) or None if not yet available.
+        lower: BUY threshold (default 30).
+        upper: SELL threshold (default 70).
 
     Returns:
-        "BUY" if RSI < 30 (strict),
-        "SELL" if RSI > 70 (strict),
-        "HOLD" if 30 <= RSI <= 70,
+        "BUY" if RSI < lower (strict),
+        "SELL" if RSI > upper (strict),
+        "HOLD" if lower <= RSI <= upper,
         None if RSI is None.
     """
     if rsi_value is None:
         return None
-    if rsi_value < 30:
+    if rsi_value < lower:
         return "BUY"
-    if rsi_value > 70:
+    if rsi_value > upper:
         return "SELL"
     return "HOLD"
 
 
-def generate_signals(rsi_values):
+def encode_signals(rsi_values, lower=LOWER_THRESHOLD, upper=UPPER_THRESHOLD):
+    """Encode signals for a sequence of RSI values as compact int8 codes.
+
+    Strings are never built: use SIGNAL_NAMES[code] at the output boundary.
+    Codes are classified in one comprehension pass and the counts are taken
+    from the resulting bytes in C, which is faster than counting per element.
+
+    Args:
+        rsi_values: Sequence of RSI values (floats or None).
+        lower: BUY threshold (default 30).
+        upper: SELL threshold (default 70).
+
+    Returns:
+        Tuple (codes, counts): codes is an array('b') with one of PENDING,
+        BUY, SELL or HOLD per value, and counts is a list indexed by code.
+    """
+    raw = bytes([
+        PENDING if v is None else BUY if v < lower else SELL if v > upper else HOLD
+        for v in rsi_values
+    ])
+    return array("b", raw), [raw.count(code) for code in range(len(SIGNAL_NAMES))]
+
+
+def decode_signals(codes):
+    """Return the list of signal strings (or None) for an array of codes."""
+    names = SIGNAL_NAMES
+    return [names[code] for code in codes]
+
+
+def generate_signals(rsi_values, lower=LOWER_THRESHOLD, upper=UPPER_THRESHOLD):
     """Generate trading signals for a list of RSI values.
 
     Args:
         rsi_values: List of RSI values (floats or None).
+        lower: BUY threshold (default 30).
+        upper: SELL threshold (default 70).
 
     Returns:
         List of signal strings ("BUY", "SELL", "HOLD", or None).
     """
-    return [generate_signal(v) for v in rsi_values]
+    codes, _ = encode_signals(rsi_values, lower, upper)
+    return decode_signals(codes)
+
+
+def generate_signals_matrix(rsi_columns, lowers, uppers):
+    """Generate signals for several RSI columns, each with its own thresholds.
+
+    Args:
+        rsi_columns: List of RSI columns (lists of floats or None).
+        lowers: BUY threshold for each column.
+        uppers: SELL threshold for each column.
+
+    Returns:
+        List of signal columns, one per RSI column.
+
+    Raises:
+        ValueError: If the threshold lists do not match the column count.
+    """
+    if not len(rsi_columns) == len(lowers) == len(uppers):
+        raise ValueError(
+            f"Got {len(rsi_columns)} RSI columns but {len(lowers)} lower and "
+            f"{len(uppers)} upper thresholds"
+        )
+    return [
+        generate_signals(column, lower, upper)
+        for column, lower, upper in zip(rsi_columns, lowers, uppers)
+    ]
@@ -7,57 +7,658 @@ import os
 # Add src directory to path so lib modules can be imported
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from lib.csv_reader import read_csv
-from lib.rsi import calculate_rsi
-from lib.signals import generate_signals
-from lib.json_writer import write_json
+# Only what the default path needs is imported here. Modes with heavier
+# dependencies (asyncio, process pools, hashing, NumPy) import them when
+# their flags are used, keeping short runs from cron and shell loops fast.
+from lib.csv_reader import DEFAULT_CHUNK_SIZE, ParseErrors
+from lib.json_writer import COLUMNAR_FORMAT, FORMATS
+from lib.indicators import INDICATORS, parse_indicator_specs
+from lib.pipeline import run_events, run_in_memory, run_indicators, run_streaming, run_sweep
+from lib.profiling import NULL_PROFILER, StageProfiler
+from lib.rules import DEFAULT_BUY_RULE, DEFAULT_SELL_RULE, parse_rule
 
+# Defaults of lazily imported modules (lib.cache, lib.live), repeated here so
+# building the parser does not import them
+DEFAULT_CACHE_MAX_MB = 512
+DEFAULT_QUEUE_SIZE = 1024
 
-def main():
+# Results caches by (cache dir, size bound), kept for the life of the
+# process so --server jobs share the in-memory tier
+_results_caches = {}
+
+
+def main(argv=None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.server:
+        _main_server(parser)
+        return
+    _run(parser, args)
+
+
+def _build_parser():
     parser = argparse.ArgumentParser(description="Generate trading signals from CSV data")
     parser.add_argument("csv_path", nargs="?", default="src/data/sample.csv",
                         help="Path to input CSV file (default: src/data/sample.csv)")
     parser.add_argument("-o", "--output", default="output.json",
                         help="Output JSON file path (default: output.json)")
-    args = parser.parse_args()
+    parser.add_argument("--backend", choices=("python", "numpy"), default="python",
+                        help="RSI backend; numpy falls back to python if NumPy is missing "
+                             "(default: python)")
+    parser.add_argument("--exact", action="store_true",
+                        help="Make the numpy backend's RSI bit-identical to the python "
+                             "reference instead of within 1e-9 (its fast mode); the python "
+                             "backend is always exact")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process the CSV in bounded chunks with flat memory use; "
+                             "always uses the incremental python RSI engine")
+    parser.add_argument("--chunk-size", type=_positive_int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per chunk in --stream mode (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--format", dest="fmt", choices=FORMATS + (COLUMNAR_FORMAT,),
+                        default="json",
+                        help="Output format: one JSON array, JSON Lines, or a typed "
+                             "binary columnar file readers can memory-map; columnar is "
+                             "in-memory mode only (default: json)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write output without indentation or extra spaces")
+    parser.add_argument("--lenient", action="store_true",
+                        help="Skip malformed CSV rows (too few fields or non-numeric "
+                             "values) instead of stopping at the first one")
+    parser.add_argument("--error-report", default=None, metavar="PATH",
+                        help="Write the line, column and value of every skipped row to "
+                             "this JSON file (implies --lenient)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Treat csv_path as a directory or glob and process every "
+                             "matching file in a process pool")
+    parser.add_argument("--output-dir", default="output",
+                        help="Directory for per-file outputs and summary.json in --batch "
+                             "mode (default: output)")
+    parser.add_argument("--workers", type=_positive_int, default=None,
+                        help="Worker processes for --batch and --group-by-symbol "
+                             "(default: CPU count)")
+    parser.add_argument("--group-by-symbol", action="store_true",
+                        help="Input has a symbol column with interleaved tickers: compute "
+                             "RSI and signals per symbol")
+    parser.add_argument("--group-order", choices=("grouped", "original"), default="grouped",
+                        help="Record order for --group-by-symbol: each symbol's rows "
+                             "together, or the input's row order (default: grouped)")
+    parser.add_argument("--resample", type=_parse_timeframes, default=None,
+                        metavar="TIMEFRAMES",
+                        help="Aggregate OHLCV bars by date into each timeframe (units "
+                             "s/m/h/d, e.g. 5m,1h,1d) in one streamed read and write RSI "
+                             "and signals per timeframe; with several, each output file "
+                             "name gets the timeframe as a suffix")
+    parser.add_argument("--cache", action="store_true",
+                        help="Cache parsed CSV columns in a binary file next to the input "
+                             "(in-memory mode only)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the parsed-CSV and results caches (overrides "
+                             "--cache and --results-cache)")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Re-parse the CSV and overwrite its cache entries, recomputing "
+                             "any --results-cache entry (implies --cache)")
+    parser.add_argument("--results-cache", action="store_true",
+                        help="Reuse the RSI and signals of an earlier identical run (same "
+                             "input bytes, settings and code) instead of recomputing "
+                             "(in-memory mode only; under --server the in-memory tier "
+                             "and hit counters are shared by all jobs)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Cache directory (default: .rsi_cache next to each input)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_CACHE_MAX_MB,
+                        help="Evict least recently used cache entries beyond this size "
+                             f"(default: {DEFAULT_CACHE_MAX_MB})")
+    parser.add_argument("--periods", type=_parse_periods, default=None,
+                        help="Sweep mode: comma-separated RSI periods, e.g. 7,14,21")
+    parser.add_argument("--thresholds", type=_parse_thresholds, default=None,
+                        help="Sweep mode: comma-separated LOWER:UPPER pairs, e.g. 30:70,20:80")
+    parser.add_argument("--backtest", action="store_true",
+                        help="Backtest a long/flat strategy for every --periods x "
+                             "--thresholds combination and write one result per "
+                             "combination (default: RSI 14, 30/70)")
+    parser.add_argument("--fee", type=_parse_fee, default=0.0,
+                        help="With --backtest: fraction of equity paid on each entry and "
+                             "exit, at least 0 and below 1 (default: 0)")
+    parser.add_argument("--indicators", type=_parse_indicators, default=None,
+                        help="Compute several indicators in one pass, e.g. rsi,macd,atr or "
+                             f"sma:50 (available: {', '.join(INDICATORS)})")
+    parser.add_argument("--buy", type=_parse_rule, default=None,
+                        help="With --indicators: comma-separated conditions that must all "
+                             f"hold for BUY, e.g. rsi<30,close<bollinger_lower "
+                             f"(default: {DEFAULT_BUY_RULE} on the one rsi indicator; "
+                             "required without one)")
+    parser.add_argument("--sell", type=_parse_rule, default=None,
+                        help="With --indicators: conditions for SELL, checked after BUY "
+                             f"(default: {DEFAULT_SELL_RULE} on the one rsi indicator)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print wall time, CPU time, rows/s and peak memory per stage")
+    parser.add_argument("--metrics-out", default=None,
+                        help="Write per-stage metrics to this file (implies --profile)")
+    parser.add_argument("--metrics-format", choices=("json", "prometheus"), default="json",
+                        help="Format for --metrics-out (default: json)")
+    parser.add_argument("--no-trace-memory", action="store_true",
+                        help="Profile without tracemalloc, which slows the stages it measures")
+    parser.add_argument("--events-only", action="store_true",
+                        help="Write one record per signal change (start_date, end_date, "
+                             "length, signal) instead of one per bar")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Save a checkpoint next to the output and, on later runs, "
+                             "process only rows appended since then")
+    parser.add_argument("--serve", type=_parse_address, default=None, metavar="HOST:PORT",
+                        help="Live mode: accept 'symbol,date,open,high,low,close,volume' "
+                             "tick lines over TCP and write signals as JSON Lines")
+    parser.add_argument("--follow", action="append", default=[], metavar="CSV",
+                        help="Live mode: follow an OHLCV CSV as it is appended to; the "
+                             "symbol is the file name (repeatable)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop live mode after this many seconds (default: run until "
+                             "interrupted)")
+    parser.add_argument("--queue-size", type=_positive_int, default=DEFAULT_QUEUE_SIZE,
+                        help="Ticks buffered per symbol before sources are paused in live "
+                             f"mode (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--server", action="store_true",
+                        help="Read one job per stdin line (the arguments of an ordinary "
+                             "run) and print one JSON result line per job")
+    return parser
 
-    try:
-        # Read CSV data
-        data = read_csv(args.csv_path)
-        print(f"Read {len(data)} rows from {args.csv_path}")
 
-        # Extract close prices and calculate RSI
-        close_prices = [row["close"] for row in data]
-        rsi_values = calculate_rsi(close_prices)
+def _run(parser, args):
+    """Run one invocation described by parsed arguments."""
+    if args.serve or args.follow:
+        _main_live(args)
+        return
+
+    sweep = args.periods is not None or args.thresholds is not None
+    if args.backtest and (args.stream or args.batch or args.events_only or args.incremental
+                          or args.indicators is not None or args.group_by_symbol
+                          or args.fmt == COLUMNAR_FORMAT):
+        parser.error("--backtest cannot be combined with --stream, --batch, --events-only, "
+                     "--incremental, --indicators, --group-by-symbol or --format columnar")
+    if sweep and (args.stream or args.batch):
+        parser.error("--periods/--thresholds cannot be combined with --stream or --batch")
+    if args.events_only and (sweep or args.batch):
+        parser.error("--events-only cannot be combined with --periods/--thresholds or --batch")
+    if args.incremental and (sweep or args.batch or args.events_only):
+        parser.error("--incremental cannot be combined with --periods/--thresholds, "
+                     "--batch or --events-only")
+    if args.indicators is not None and (sweep or args.stream or args.batch
+                                        or args.events_only or args.incremental):
+        parser.error("--indicators cannot be combined with --periods/--thresholds, "
+                     "--stream, --batch, --events-only or --incremental")
+    lenient = args.lenient or args.error_report is not None
+    if lenient and (args.batch or args.incremental):
+        parser.error("--lenient/--error-report cannot be combined with --batch or "
+                     "--incremental")
+    if args.group_by_symbol and (sweep or args.stream or args.batch or args.events_only
+                                 or args.incremental or args.indicators is not None):
+        parser.error("--group-by-symbol cannot be combined with --periods/--thresholds, "
+                     "--stream, --batch, --events-only, --incremental or --indicators")
+    if args.resample is not None and (sweep or args.batch or args.events_only
+                                      or args.incremental or args.indicators is not None
+                                      or args.group_by_symbol or args.backtest
+                                      or args.fmt == COLUMNAR_FORMAT):
+        parser.error("--resample cannot be combined with --periods/--thresholds, --batch, "
+                     "--events-only, --incremental, --indicators, --group-by-symbol, "
+                     "--backtest or --format columnar")
+    if args.fmt == COLUMNAR_FORMAT and (sweep or args.stream or args.batch
+                                        or args.events_only or args.incremental
+                                        or args.indicators is not None
+                                        or args.group_by_symbol):
+        parser.error("--format columnar is only supported in the default in-memory mode")
+    if args.indicators is None and (args.buy is not None or args.sell is not None):
+        parser.error("--buy/--sell require --indicators")
+    if args.indicators is not None and (args.buy is None or args.sell is None):
+        defaults = _default_rules(args.indicators)
+        if defaults is None:
+            parser.error("--buy/--sell required: the default rules (rsi<30, rsi>70) need "
+                         "exactly one rsi indicator in --indicators")
+        args.buy = args.buy if args.buy is not None else defaults[0]
+        args.sell = args.sell if args.sell is not None else defaults[1]
+    if args.results_cache and (sweep or args.stream or args.batch or args.events_only
+                               or args.incremental or args.indicators is not None
+                               or args.group_by_symbol or args.backtest
+                               or args.resample is not None):
+        parser.error("--results-cache is only supported in the default in-memory mode")
+
+    column_cache = None
+    if (args.cache or args.rebuild_cache) and not args.no_cache:
+        from lib.cache import ColumnCache
+        column_cache = ColumnCache(args.cache_dir, args.cache_max_mb << 20,
+                                   args.rebuild_cache)
+
+    if args.batch:
+        _main_batch(args, column_cache)
+        return
 
-        # Generate signals
-        signals = generate_signals(rsi_values)
+    profiler = NULL_PROFILER
+    if args.profile or args.metrics_out:
+        profiler = StageProfiler(trace_memory=not args.no_trace_memory)
+    errors = ParseErrors() if lenient else None
+    results_cache = None
+    if args.results_cache and not args.no_cache:
+        results_cache = _results_cache(args)
 
-        # Build output records
-        records = []
-        for i, row in enumerate(data):
-            records.append({
-                "date": row["date"],
-                "close": row["close"],
-                "rsi": round(rsi_values[i], 2) if rsi_values[i] is not None else None,
-                "signal": signals[i],
-            })
+    if args.backtest:
+        _main_backtest(args, column_cache, profiler, errors)
+        _report_errors(args, errors)
+        _report_profile(args, profiler)
+        return
 
-        # Write output
-        write_json(records, args.output)
-        print(f"Wrote {len(records)} records to {args.output}")
+    if sweep:
+        _main_sweep(args, column_cache, profiler, errors)
+        _report_errors(args, errors)
+        _report_profile(args, profiler)
+        return
+
+    if args.events_only:
+        _main_events(args, column_cache, profiler, errors)
+        _report_errors(args, errors)
+        _report_profile(args, profiler)
+        return
+
+    if args.incremental:
+        _main_incremental(args, profiler)
+        _report_profile(args, profiler)
+        return
+
+    if args.group_by_symbol:
+        _main_grouped(args, profiler, errors)
+        _report_errors(args, errors)
+        _report_profile(args, profiler)
+        return
+
+    if args.resample is not None:
+        _main_resample(args, profiler, errors)
+        _report_errors(args, errors)
+        _report_profile(args, profiler)
+        return
+
+    if args.indicators is not None:
+        _main_indicators(args, column_cache, profiler, errors)
+        _report_errors(args, errors)
+        _report_profile(args, profiler)
+        return
+
+    try:
+        if args.stream:
+            row_count, counts = run_streaming(args.csv_path, args.output, args.chunk_size,
+                                              args.fmt, args.compact, profiler, errors)
+        else:
+            row_count, counts = run_in_memory(args.csv_path, args.output, args.backend,
+                                              args.fmt, args.compact, column_cache,
+                                              profiler, errors, results_cache,
+                                              args.exact)
+        print(f"Read {row_count} rows from {args.csv_path}")
+        print(f"Wrote {row_count} records to {args.output}")
 
         # Print summary
-        buy_count = signals.count("BUY")
-        sell_count = signals.count("SELL")
-        hold_count = signals.count("HOLD")
-        none_count = signals.count(None)
-        print(f"Signals: {buy_count} BUY, {sell_count} SELL, {hold_count} HOLD, {none_count} pending")
+        print(f"Signals: {counts['BUY']} BUY, {counts['SELL']} SELL, "
+              f"{counts['HOLD']} HOLD, {counts[None]} pending")
+
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if results_cache is not None:
+        stats = results_cache.stats()
+        print(f"Results cache: {stats['memory_hits']} memory hits, {stats['disk_hits']} "
+              f"disk hits, {stats['misses']} misses")
+    _report_errors(args, errors)
+    _report_profile(args, profiler)
+
+
+def _results_cache(args):
+    """Return this process's ResultsCache for the run's cache settings."""
+    from lib.results_cache import ResultsCache
+
+    settings = (args.cache_dir, args.cache_max_mb << 20)
+    results_cache = _results_caches.get(settings)
+    if results_cache is None:
+        results_cache = _results_caches[settings] = ResultsCache(*settings)
+    results_cache.rebuild = args.rebuild_cache
+    return results_cache
+
+
+def _main_server(parser):
+    """Run jobs from stdin in this process, paying interpreter startup once.
+
+    Each non-blank stdin line (lines starting with # are skipped) holds the
+    arguments of one ordinary invocation, with shell-style quoting. After
+    each job one JSON line is written to stdout: {"ok", "exit_code",
+    "stdout", "stderr"}, where stdout and stderr are what the job printed.
+    A failing job does not stop the server.
+    """
+    import io
+    import json
+    import shlex
+    from contextlib import redirect_stderr, redirect_stdout
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        out, err = io.StringIO(), io.StringIO()
+        exit_code = 0
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                args = parser.parse_args(shlex.split(line))
+                if args.server:
+                    parser.error("--server cannot be used inside a server job")
+                _run(parser, args)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                exit_code = 1
+        result = {"ok": exit_code == 0, "exit_code": exit_code,
+                  "stdout": out.getvalue(), "stderr": err.getvalue()}
+        print(json.dumps(result), flush=True)
+
+
+def _report_errors(args, errors):
+    """Summarize rows skipped by --lenient and write --error-report."""
+    if errors is None:
+        return
+    if errors.count:
+        first = errors.errors[0]["message"] if errors.errors else ""
+        print(f"Warning: skipped {errors.count} malformed rows (first: {first})",
+              file=sys.stderr)
+    if args.error_report:
+        errors.write(args.error_report)
+        print(f"Wrote error report to {args.error_report}")
+
+
+def _report_profile(args, profiler):
+    """Print the per-stage table and write --metrics-out when profiling."""
+    if not profiler.enabled:
+        return
+    profiler.stop()
+    print(profiler.format_table())
+    if args.metrics_out:
+        profiler.write_metrics(args.metrics_out, args.metrics_format)
+        print(f"Wrote {args.metrics_format} metrics to {args.metrics_out}")
+
+
+def _main_sweep(args, column_cache, profiler, errors):
+    """Run --periods/--thresholds sweep mode and print counts per combination."""
+    periods = args.periods or [14]
+    thresholds = args.thresholds or [(30.0, 70.0)]
+    try:
+        row_count, sweep_counts = run_sweep(args.csv_path, args.output, periods, thresholds,
+                                            args.backend, args.fmt, args.compact,
+                                            column_cache, profiler, errors, args.exact)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Read {row_count} rows from {args.csv_path}")
+    print(f"Wrote {row_count} records with {len(sweep_counts)} signal columns to {args.output}")
+    for (period, lower, upper), counts in sweep_counts.items():
+        print(f"RSI({period}) {lower:g}/{upper:g}: {counts['BUY']} BUY, {counts['SELL']} SELL, "
+              f"{counts['HOLD']} HOLD, {counts[None]} pending")
+
+
+def _main_backtest(args, column_cache, profiler, errors):
+    """Run --backtest mode and print the best combination by total return."""
+    from lib.backtest import run_backtest
+
+    periods = args.periods or [14]
+    thresholds = args.thresholds or [(30.0, 70.0)]
+    try:
+        row_count, results = run_backtest(args.csv_path, args.output, periods, thresholds,
+                                          args.fee, args.workers, args.fmt, args.compact,
+                                          column_cache, profiler, errors)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    best = max(results, key=lambda result: result["total_return"])
+    print(f"Read {row_count} rows from {args.csv_path}")
+    print(f"Wrote {len(results)} backtest results to {args.output}")
+    print(f"Best: RSI({best['period']}) {best['lower']:g}/{best['upper']:g}: "
+          f"return {best['total_return']:.2%}, max drawdown {best['max_drawdown']:.2%}, "
+          f"{best['trades']} trades")
+
+
+def _main_incremental(args, profiler):
+    """Run --incremental mode, resuming from the output's checkpoint if valid."""
+    from lib.incremental import run_incremental
+
+    try:
+        row_count, counts, new_rows, resumed = run_incremental(
+            args.csv_path, args.output, args.fmt, args.compact, args.chunk_size, profiler)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if resumed:
+        print(f"Resumed from checkpoint: read {new_rows} new rows from {args.csv_path}")
+    else:
+        print(f"Read {row_count} rows from {args.csv_path}")
+    print(f"Wrote {row_count} records to {args.output}")
+    print(f"Signals: {counts['BUY']} BUY, {counts['SELL']} SELL, "
+          f"{counts['HOLD']} HOLD, {counts[None]} pending")
+
+
+def _main_grouped(args, profiler, errors):
+    """Run --group-by-symbol mode and print the symbol count and signal summary."""
+    from lib.grouped import run_grouped
+
+    try:
+        row_count, counts, symbol_count = run_grouped(args.csv_path, args.output,
+                                                      args.group_order, args.workers,
+                                                      args.fmt, args.compact, profiler,
+                                                      errors)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Read {row_count} rows for {symbol_count} symbols from {args.csv_path}")
+    print(f"Wrote {row_count} records to {args.output}")
+    print(f"Signals: {counts['BUY']} BUY, {counts['SELL']} SELL, "
+          f"{counts['HOLD']} HOLD, {counts[None]} pending")
+
 
+def _main_resample(args, profiler, errors):
+    """Run --resample mode and print the bar count and signal summary per timeframe."""
+    from lib.resample import run_resampled
+
+    try:
+        row_count, results = run_resampled(args.csv_path, args.output, args.resample,
+                                           args.fmt, args.compact, args.chunk_size,
+                                           profiler, errors)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Read {row_count} rows from {args.csv_path}")
+    for label, (path, bar_count, counts) in results.items():
+        print(f"{label}: wrote {bar_count} bars to {path} ({counts['BUY']} BUY, "
+              f"{counts['SELL']} SELL, {counts['HOLD']} HOLD, {counts[None]} pending)")
+
+
+def _main_indicators(args, column_cache, profiler, errors):
+    """Run --indicators mode and print the signal summary."""
+    try:
+        row_count, counts = run_indicators(args.csv_path, args.output, args.indicators,
+                                           args.buy, args.sell, args.fmt, args.compact,
+                                           column_cache, profiler, errors)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    keys = ", ".join(key for key, _, _ in args.indicators)
+    print(f"Read {row_count} rows from {args.csv_path}")
+    print(f"Wrote {row_count} records with indicators {keys} to {args.output}")
+    print(f"Signals: {counts['BUY']} BUY, {counts['SELL']} SELL, "
+          f"{counts['HOLD']} HOLD, {counts[None]} pending")
+
+
+def _main_events(args, column_cache, profiler, errors):
+    """Run --events-only mode and print the event count and signal summary."""
+    try:
+        row_count, counts, event_count = run_events(args.csv_path, args.output, args.backend,
+                                                    args.fmt, args.compact, column_cache,
+                                                    args.stream, args.chunk_size, profiler,
+                                                    errors, args.exact)
     except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    print(f"Read {row_count} rows from {args.csv_path}")
+    print(f"Wrote {event_count} signal change events to {args.output}")
+    print(f"Signals: {counts['BUY']} BUY, {counts['SELL']} SELL, "
+          f"{counts['HOLD']} HOLD, {counts[None]} pending")
+
+
+def _main_live(args):
+    """Run --serve/--follow live mode and print throughput and latency on exit."""
+    import asyncio
+    from lib.live import run_live
+
+    def on_listen(host, port):
+        print(f"Listening for ticks on {host}:{port}", flush=True)
+
+    def on_error(line, error):
+        print(f"Skipping malformed line: {error}", file=sys.stderr, flush=True)
+
+    try:
+        stats = asyncio.run(run_live(args.output, listen=args.serve, follow=args.follow,
+                                     duration=args.duration, queue_size=args.queue_size,
+                                     on_listen=on_listen, on_error=on_error))
+    except KeyboardInterrupt:
+        return
+    except (FileNotFoundError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Processed {stats['ticks']} ticks for {stats['symbols']} symbols into {args.output}")
+    if stats["count"]:
+        print(f"Throughput: {stats['ticks_per_second']:,.0f} ticks/s, latency p50 "
+              f"{stats['p50'] * 1e6:.0f} us, p99 {stats['p99'] * 1e6:.0f} us")
+
+
+def _default_rules(specs):
+    """Return the default (buy, sell) rules for --indicators specs, or None.
+
+    DEFAULT_BUY_RULE and DEFAULT_SELL_RULE name the "rsi" column; they are
+    applied to the specs' one RSI column, whatever its period ("rsi_7" for
+    "rsi:7"). None if the specs have no RSI indicator or several.
+    """
+    keys = [key for key, indicator, _ in specs if indicator.name == "rsi"]
+    if len(keys) != 1:
+        return None
+
+    def resolve(rule):
+        return [tuple(keys[0] if operand == "rsi" else operand for operand in condition)
+                for condition in rule]
+    return resolve(parse_rule(DEFAULT_BUY_RULE)), resolve(parse_rule(DEFAULT_SELL_RULE))
+
+
+def _parse_address(text):
+    """argparse type for --serve: "127.0.0.1:9000" -> ("127.0.0.1", 9000)."""
+    host, _, port = text.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid address: {text!r}")
+
+
+def _parse_indicators(text):
+    """argparse type for --indicators: "rsi,sma:50" -> parsed indicator specs."""
+    try:
+        return parse_indicator_specs(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _parse_timeframes(text):
+    """argparse type for --resample: "5m,1h" -> ["5m", "1h"]."""
+    from lib.resample import parse_timeframes
+
+    try:
+        return parse_timeframes(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _parse_rule(text):
+    """argparse type for --buy/--sell: "rsi<30,close<sma" -> parsed conditions."""
+    try:
+        return parse_rule(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _positive_int(text):
+    """argparse type for counts and sizes that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {text!r}")
+    return value
+
+
+def _parse_fee(text):
+    """argparse type for --fee: a fraction of equity in [0, 1)."""
+    try:
+        fee = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid fee: {text!r}")
+    if not 0.0 <= fee < 1.0:
+        raise argparse.ArgumentTypeError(f"fee must be at least 0 and below 1: {text!r}")
+    return fee
+
+
+def _parse_periods(text):
+    """argparse type for --periods: "7,14,21" -> [7, 14, 21]."""
+    try:
+        periods = [int(part) for part in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid periods: {text!r}")
+    if any(period < 1 for period in periods):
+        raise argparse.ArgumentTypeError(f"periods must be positive: {text!r}")
+    return list(dict.fromkeys(periods))
+
+
+def _parse_thresholds(text):
+    """argparse type for --thresholds: "30:70,20:80" -> [(30.0, 70.0), (20.0, 80.0)]."""
+    pairs = []
+    for part in text.split(","):
+        try:
+            lower, upper = (float(v) for v in part.split(":"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid threshold pair: {part!r}")
+        if lower > upper:
+            raise argparse.ArgumentTypeError(f"lower threshold above upper: {part!r}")
+        pairs.append((lower, upper))
+    return list(dict.fromkeys(pairs))
+
+
+def _main_batch(args, column_cache):
+    """Run --batch mode and print the combined summary."""
+    from lib.batch import find_inputs, run_batch
+
+    try:
+        inputs = find_inputs(args.csv_path)
+        summary = run_batch(inputs, args.output_dir, args.workers, args.fmt,
+                            args.compact, args.stream, column_cache)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for result in summary["files"]:
+        if "error" in result:
+            print(f"Error: {result['input']}: {result['error']}", file=sys.stderr)
+    totals = summary["totals"]
+    print(f"Processed {totals['files']} of {len(inputs)} files "
+          f"({totals['rows']} rows) into {args.output_dir}")
+    print(f"Signals: {totals['BUY']} BUY, {totals['SELL']} SELL, "
+          f"{totals['HOLD']} HOLD, {totals['pending']} pending")
+    if summary["failed"]:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
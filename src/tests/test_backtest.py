@@ -0,0 +1,155 @@
+"""Tests for the signal backtester and parameter grid."""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.backtest import METRIC_KEYS, backtest, run_backtest, run_grid
+from lib.cache import ColumnCache
+from lib.csv_reader import ParseErrors, read_csv_columns
+from lib.json_writer import write_json
+from lib.rsi import calculate_rsi
+from lib.signals import BUY, HOLD, PENDING, SELL, encode_signals
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+def naive_backtest(close, codes, fee=0.0):
+    """Bar-by-bar reference simulation."""
+    equity = peak = 1.0
+    drawdown = 0.0
+    long = False
+    trades = wins = held = 0
+    start = None
+    for i, code in enumerate(codes):
+        if long and i:
+            equity *= close[i] / close[i - 1]
+            held += 1
+            peak = max(peak, equity)
+            drawdown = max(drawdown, 1 - equity / peak)
+        if code == BUY and not long:
+            start, long = equity, True
+            equity *= 1 - fee
+            trades += 1
+        elif code == SELL and long:
+            equity *= 1 - fee
+            long = False
+            wins += equity > start
+        drawdown = max(drawdown, 1 - equity / peak)
+    if long:
+        wins += equity > start
+    return {"bars": len(close), "trades": trades, "wins": wins,
+            "total_return": equity - 1, "max_drawdown": drawdown,
+            "exposure": held / (len(close) - 1)}
+
+
+class TestBacktest(unittest.TestCase):
+
+    def assertMetricsAlmostEqual(self, actual, expected):
+        self.assertEqual(list(actual), list(METRIC_KEYS))
+        for key in METRIC_KEYS:
+            self.assertAlmostEqual(actual[key], expected[key], places=9, msg=key)
+
+    def test_hand_computed(self):
+        close = [10.0, 11.0, 12.0, 9.0, 12.0, 6.0, 8.0]
+        codes = array("b", [PENDING, BUY, HOLD, BUY, SELL, BUY, HOLD])
+        result = backtest(close, codes)
+        # Long 11 -> 12 (open at the end: 6 -> 8)
+        self.assertEqual((result["trades"], result["wins"]), (2, 2))
+        self.assertAlmostEqual(result["total_return"], 12 / 11 * 8 / 6 - 1)
+        self.assertAlmostEqual(result["max_drawdown"], 1 - 9 / 12)
+        self.assertAlmostEqual(result["exposure"], 4 / 6)
+
+    def test_no_trades(self):
+        result = backtest([1.0, 2.0, 3.0], bytes([PENDING, HOLD, SELL]))
+        self.assertEqual(result, {"bars": 3, "trades": 0, "wins": 0, "total_return": 0.0,
+                                  "max_drawdown": 0.0, "exposure": 0.0})
+
+    def test_matches_naive_simulation(self):
+        rng = random.Random(11)
+        close = [100.0]
+        for _ in range(3000):
+            close.append(close[-1] * (1 + rng.gauss(0, 0.02)))
+        rsi = calculate_rsi(close, 5)
+        for fee in (0.0, 0.002):
+            for lower, upper in ((30, 70), (45, 55)):
+                with self.subTest(fee=fee, lower=lower):
+                    codes, _ = encode_signals(rsi, lower, upper)
+                    self.assertMetricsAlmostEqual(backtest(close, codes, fee),
+                                                  naive_backtest(close, codes, fee))
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            backtest([1.0, 2.0], bytes([HOLD]))
+
+    def test_fee_bounds(self):
+        close, codes = [10.0, 11.0, 12.0], bytes([BUY, HOLD, SELL])
+        for fee in (-0.5, 1.0, 2.0, float("nan")):
+            with self.subTest(fee=fee), self.assertRaisesRegex(ValueError, "Fee"):
+                backtest(close, codes, fee)
+        self.assertAlmostEqual(backtest(close, codes, 0.5)["total_return"],
+                               12 / 10 * 0.25 - 1)
+
+    def test_skips_entries_at_non_positive_prices(self):
+        close = [0.0, 5.0, -1.0, 10.0, 12.0]
+        codes = bytes([BUY, SELL, BUY, BUY, SELL])
+        result = backtest(close, codes)
+        # Only the BUY at 10 can be entered
+        self.assertEqual((result["trades"], result["wins"]), (1, 1))
+        self.assertAlmostEqual(result["total_return"], 12 / 10 - 1)
+        self.assertAlmostEqual(result["exposure"], 1 / 4)
+
+    def test_grid_serial_and_parallel_match(self):
+        close = read_csv_columns(SAMPLE, ("close",))["close"]
+        thresholds = [(30.0, 70.0), (40.0, 60.0)]
+        serial = run_grid(close, [5, 14], thresholds, fee=0.001, workers=1)
+        self.assertEqual([(r["period"], r["lower"]) for r in serial],
+                         [(5, 30.0), (5, 40.0), (14, 30.0), (14, 40.0)])
+        self.assertEqual(run_grid(close, [5, 14], thresholds, fee=0.001, workers=2), serial)
+        codes, _ = encode_signals(calculate_rsi(close, 5), 40.0, 60.0)
+        self.assertEqual({k: serial[1][k] for k in METRIC_KEYS},
+                         backtest(close, codes, 0.001))
+
+    def test_run_backtest_writes_results(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "results.jsonl")
+            rows, results = run_backtest(SAMPLE, output, [14], [(30.0, 70.0)], fmt="jsonl")
+            with open(output) as f:
+                written = [json.loads(line) for line in f]
+        self.assertEqual(rows, 40)
+        self.assertEqual(written, results)
+
+    def test_run_backtest_output_matches_csv_reader(self):
+        """The mmap close scan writes the same bytes as the csv-module readers."""
+        with open(SAMPLE) as f:
+            header, *lines = [line for line in f if line.strip()]
+        # Extra trailing fields and quoting take the scanner's slow path
+        ragged = header + "".join(
+            line.rstrip("\n") + (",x\n" if i % 3 == 0 else "\n") for i, line in enumerate(lines))
+        quoted = header + "".join(line.replace(",", '","') for line in lines)
+        grid = ([7, 14], [(30.0, 70.0), (40.0, 60.0)])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, content in (("sample", header + "".join(lines)),
+                                  ("ragged", ragged), ("quoted", quoted)):
+                with self.subTest(input=name):
+                    path = os.path.join(tmpdir, name + ".csv")
+                    with open(path, "w") as f:
+                        f.write(content)
+                    close = read_csv_columns(path, ("close",))["close"]
+                    write_json(run_grid(close, *grid, fee=0.001), path + ".expected")
+                    with open(path + ".expected") as f:
+                        expected = f.read()
+                    for kwargs in ({}, {"cache": ColumnCache(os.path.join(tmpdir, "cache"))},
+                                   {"errors": ParseErrors()}):
+                        run_backtest(path, path + ".out", *grid, fee=0.001, **kwargs)
+                        with open(path + ".out") as f:
+                            self.assertEqual(f.read(), expected, kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for the multi-file batch mode."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.batch import SUMMARY_FILENAME, find_inputs, run_batch
+from lib.pipeline import run_in_memory
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.input_dir = os.path.join(self.tmpdir, "in")
+        self.output_dir = os.path.join(self.tmpdir, "out")
+        os.makedirs(self.input_dir)
+        for name in ("aaa.csv", "bbb.csv", "ccc.csv"):
+            shutil.copy(SAMPLE, os.path.join(self.input_dir, name))
+        with open(os.path.join(self.input_dir, "bad.csv"), "w") as f:
+            f.write("name,value\nfoo,123\n")
+
+    def test_find_inputs_directory_and_glob(self):
+        names = [os.path.basename(p) for p in find_inputs(self.input_dir)]
+        self.assertEqual(names, ["aaa.csv", "bad.csv", "bbb.csv", "ccc.csv"])
+        pattern = os.path.join(self.input_dir, "b*.csv")
+        names = [os.path.basename(p) for p in find_inputs(pattern)]
+        self.assertEqual(names, ["bad.csv", "bbb.csv"])
+
+    def test_find_inputs_no_match(self):
+        with self.assertRaises(FileNotFoundError):
+            find_inputs(os.path.join(self.input_dir, "*.parquet"))
+
+    def test_outputs_match_single_file_runs(self):
+        summary = run_batch(find_inputs(self.input_dir), self.output_dir, workers=2)
+        expected_path = os.path.join(self.tmpdir, "expected.json")
+        run_in_memory(SAMPLE, expected_path)
+        with open(expected_path, "rb") as f:
+            expected = f.read()
+        for name in ("aaa", "bbb", "ccc"):
+            with open(os.path.join(self.output_dir, name + ".json"), "rb") as f:
+                self.assertEqual(f.read(), expected)
+        self.assertEqual(summary["totals"]["files"], 3)
+
+    def test_failure_is_reported_without_aborting(self):
+        summary = run_batch(find_inputs(self.input_dir), self.output_dir, workers=2)
+        self.assertEqual(summary["failed"], 1)
+        errors = [r for r in summary["files"] if "error" in r]
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0]["input"].endswith("bad.csv"))
+        self.assertIn("missing required columns", errors[0]["error"])
+
+    def test_combined_summary_file(self):
+        run_batch(find_inputs(self.input_dir), self.output_dir, workers=1, fmt="jsonl")
+        with open(os.path.join(self.output_dir, SUMMARY_FILENAME)) as f:
+            summary = json.load(f)
+        self.assertEqual(summary["totals"],
+                         {"files": 3, "rows": 120, "BUY": 18, "SELL": 12, "HOLD": 48,
+                          "pending": 42})
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "aaa.jsonl")))
+
+    def test_duplicate_output_names_rejected(self):
+        other_dir = os.path.join(self.tmpdir, "other")
+        os.makedirs(other_dir)
+        shutil.copy(SAMPLE, os.path.join(other_dir, "aaa.csv"))
+        inputs = [os.path.join(self.input_dir, "aaa.csv"), os.path.join(other_dir, "aaa.csv")]
+        with self.assertRaises(ValueError):
+            run_batch(inputs, self.output_dir)
+
+    def test_summary_output_name_rejected(self):
+        summary_input = os.path.join(self.input_dir, "summary.csv")
+        shutil.copy(SAMPLE, summary_input)
+        with self.assertRaisesRegex(ValueError, "batch summary"):
+            run_batch([summary_input], self.output_dir)
+        # A jsonl output cannot clash with summary.json
+        summary = run_batch([summary_input], self.output_dir, fmt="jsonl")
+        self.assertTrue(summary["files"][0]["output"].endswith("summary.jsonl"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the benchmark suite helpers."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench.run_benchmarks import compare, run_benchmarks
+from bench.synthetic import cached_csv, generate_rows, write_csv
+from lib.csv_reader import read_csv
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_seeded_and_deterministic(self):
+        self.assertEqual(list(generate_rows(50, seed=1)), list(generate_rows(50, seed=1)))
+        self.assertNotEqual(list(generate_rows(50, seed=1)), list(generate_rows(50, seed=2)))
+
+    def test_valid_ohlcv_csv(self):
+        rows = read_csv(write_csv(os.path.join(self.tmpdir, "s.csv"), 200, seed=3))
+        self.assertEqual(len(rows), 200)
+        for row in rows:
+            self.assertLessEqual(row["low"], min(row["open"], row["close"]))
+            self.assertGreaterEqual(row["high"], max(row["open"], row["close"]))
+        self.assertEqual(rows[1]["date"], "2020-01-01 00:01:00")
+
+    def test_cached_csv_reused(self):
+        path = cached_csv(self.tmpdir, 10)
+        mtime = os.stat(path).st_mtime_ns
+        self.assertEqual(cached_csv(self.tmpdir, 10), path)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_covers_every_stage(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        results = run_benchmarks([300], repeat=1, data_dir=tmpdir)
+        stages = {r["stage"] for r in results["results"]}
+        for stage in ("read_csv", "calculate_rsi", "generate_signals", "write_json", "main"):
+            self.assertIn(stage, stages)
+        for r in results["results"]:
+            self.assertEqual(r["rows"], 300)
+            self.assertGreater(r["seconds"], 0)
+            self.assertGreaterEqual(r["peak_bytes"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [
+            {"stage": "calculate_rsi", "rows": 1000, "seconds": 1.0, "peak_bytes": 1000},
+            {"stage": "write_json", "rows": 1000, "seconds": 1.0, "peak_bytes": 1000},
+        ]}
+        current = {"results": [
+            {"stage": "calculate_rsi", "rows": 1000, "seconds": 1.2, "peak_bytes": 1000},
+            {"stage": "write_json", "rows": 1000, "seconds": 1.5, "peak_bytes": 2000},
+            {"stage": "new_stage", "rows": 1000, "seconds": 9.0, "peak_bytes": 9000},
+        ]}
+        regressions = compare(current, baseline, threshold=0.25)
+        self.assertEqual(sorted((r["stage"], r["metric"]) for r in regressions),
+                         [("write_json", "peak_bytes"), ("write_json", "seconds")])
+
+    def test_compare_ignores_timer_noise(self):
+        baseline = {"results": [{"stage": "s", "rows": 1, "seconds": 1e-6, "peak_bytes": 10}]}
+        current = {"results": [{"stage": "s", "rows": 1, "seconds": 5e-6, "peak_bytes": 10}]}
+        self.assertEqual(compare(current, baseline), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for the parsed-CSV column cache."""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.cache import ColumnCache, evict
+from lib.csv_reader import read_csv_columns
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestColumnCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.csv_path = os.path.join(self.tmpdir, "prices.csv")
+        shutil.copy(SAMPLE, self.csv_path)
+        self.cache_dir = os.path.join(self.tmpdir, "cache")
+
+    def _assert_same_columns(self, actual, expected):
+        for name, values in expected.items():
+            self.assertEqual(list(actual[name]), list(values), name)
+
+    def test_miss_then_hit(self):
+        cache = ColumnCache(self.cache_dir)
+        expected = read_csv_columns(self.csv_path)
+        self._assert_same_columns(cache.load(self.csv_path), expected)
+        self._assert_same_columns(cache.load(self.csv_path), expected)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertTrue(os.path.exists(cache.entry_path(self.csv_path)))
+
+    def test_default_dir_next_to_input(self):
+        cache = ColumnCache()
+        cache.load(self.csv_path, ("close",))
+        self.assertTrue(os.path.isdir(os.path.join(self.tmpdir, ".rsi_cache")))
+
+    def test_selected_columns(self):
+        cache = ColumnCache(self.cache_dir)
+        cache.load(self.csv_path)
+        columns = cache.load(self.csv_path, ("date", "close"))
+        self.assertEqual(list(columns), ["date", "close"])
+
+    def test_modified_file_invalidates(self):
+        cache = ColumnCache(self.cache_dir)
+        cache.load(self.csv_path)
+        with open(self.csv_path, "a") as f:
+            f.write("2024-03-01,1,2,0.5,1.5,100\n")
+        columns = cache.load(self.csv_path, ("close",))
+        self.assertEqual(columns["close"][-1], 1.5)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_touched_identical_file_is_a_hit(self):
+        cache = ColumnCache(self.cache_dir)
+        cache.load(self.csv_path)
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        cache.load(self.csv_path)
+        cache.load(self.csv_path)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_rebuild_ignores_entry(self):
+        ColumnCache(self.cache_dir).load(self.csv_path)
+        cache = ColumnCache(self.cache_dir, rebuild=True)
+        cache.load(self.csv_path)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_errors_match_csv_reader(self):
+        cache = ColumnCache(self.cache_dir)
+        with self.assertRaises(FileNotFoundError):
+            cache.load(os.path.join(self.tmpdir, "missing.csv"))
+        bad = os.path.join(self.tmpdir, "bad.csv")
+        with open(bad, "w") as f:
+            f.write("name,value\nfoo,1\n")
+        with self.assertRaises(ValueError):
+            cache.load(bad)
+
+    def test_unrequested_bad_column_is_not_an_error(self):
+        with open(self.csv_path) as f:
+            lines = f.readlines()
+        lines[5] = lines[5].rsplit(",", 1)[0] + ",N/A\n"
+        with open(self.csv_path, "w") as f:
+            f.writelines(lines)
+        cache = ColumnCache(self.cache_dir)
+        expected = read_csv_columns(self.csv_path, ("date", "close"))
+        for _ in range(2):
+            self._assert_same_columns(cache.load(self.csv_path, ("date", "close")), expected)
+        self.assertEqual(list(cache.load(self.csv_path, ("close",))["close"]),
+                         list(expected["close"]))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        with self.assertRaisesRegex(ValueError, "Invalid volume value 'N/A'"):
+            cache.load(self.csv_path)
+
+    def test_evicts_least_recently_used(self):
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.tmpdir, f"p{i}.csv")
+            shutil.copy(SAMPLE, path)
+            paths.append(path)
+        cache = ColumnCache(self.cache_dir)
+        for path in paths:
+            cache.load(path)
+            time.sleep(0.01)
+        entry_size = os.path.getsize(cache.entry_path(paths[0]))
+        # Use p0 again so p1 becomes the least recently used entry
+        cache.load(paths[0])
+        deleted = evict(self.cache_dir, entry_size * 2)
+        self.assertEqual(deleted, 1)
+        self.assertFalse(os.path.exists(cache.entry_path(paths[1])))
+        self.assertTrue(os.path.exists(cache.entry_path(paths[0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for the binary columnar file format."""
+
+import os
+import sys
+import tempfile
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.colfile import StringColumn, read_columns, read_header, write_columns
+
+
+class TestColfile(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".col")
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def test_round_trip(self):
+        write_columns(self.path, {
+            "date": ["2024-01-01", "2024-01-02", "été"],
+            "close": array("d", [1.5, float("nan"), -3.0]),
+            "code": array("b", [1, -1, 0]),
+            "bits": b"\x05",
+        }, {"source": "test"})
+        metadata, columns = read_columns(self.path)
+        self.assertEqual(metadata, {"source": "test"})
+        self.assertEqual(list(columns["date"]), ["2024-01-01", "2024-01-02", "été"])
+        close = columns["close"].tolist()
+        self.assertEqual(close[0], 1.5)
+        self.assertNotEqual(close[1], close[1])
+        self.assertEqual(columns["code"].tolist(), [1, -1, 0])
+        self.assertEqual(bytes(columns["bits"]), b"\x05")
+
+    def test_numeric_columns_are_mapped_views(self):
+        write_columns(self.path, {"close": array("d", range(10))})
+        _, columns = read_columns(self.path)
+        self.assertIsInstance(columns["close"], memoryview)
+        self.assertEqual(columns["close"].format, "d")
+        self.assertTrue(columns["close"].readonly)
+
+    def test_string_column_sequence(self):
+        write_columns(self.path, {"date": ["a", "bb", "", "ccc"]})
+        _, columns = read_columns(self.path)
+        dates = columns["date"]
+        self.assertIsInstance(dates, StringColumn)
+        self.assertEqual(len(dates), 4)
+        self.assertEqual(dates[1], "bb")
+        self.assertEqual(dates[-1], "ccc")
+        self.assertEqual(dates[1:3], ["bb", ""])
+        with self.assertRaises(IndexError):
+            dates[4]
+
+    def test_rewrite_from_mapped_columns(self):
+        write_columns(self.path, {"date": ["x", "y"], "close": array("d", [1.0, 2.0])})
+        _, columns = read_columns(self.path)
+        write_columns(self.path, columns, {"copy": True})
+        metadata, copied = read_columns(self.path)
+        self.assertEqual(metadata, {"copy": True})
+        self.assertEqual(list(copied["date"]), ["x", "y"])
+        self.assertEqual(copied["close"].tolist(), [1.0, 2.0])
+
+    def test_blocks_are_aligned(self):
+        write_columns(self.path, {"date": ["abc"], "close": array("d", [1.0])})
+        for entry in read_header(self.path)["columns"]:
+            self.assertEqual(entry["offset"] % 8, 0)
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            write_columns(self.path, {"a": array("d", [1.0]), "b": array("d", [1.0, 2.0])})
+
+    def test_not_a_columnar_file(self):
+        with open(self.path, "w") as f:
+            f.write("date,close\n")
+        with self.assertRaises(ValueError):
+            read_columns(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the typed columnar signal output."""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.colfile import write_columns
+from lib.columnar_output import (
+    iter_signal_records, pack_bitmap, read_signal_columns, write_signal_columns,
+)
+from lib.pipeline import run_in_memory
+from lib.signals import SIGNAL_NAMES, encode_signals
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestColumnarOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_matches_json_output(self):
+        json_path, columnar_path = self._path("out.json"), self._path("out.col")
+        self.assertEqual(run_in_memory(SAMPLE, json_path),
+                         run_in_memory(SAMPLE, columnar_path, fmt="columnar"))
+        with open(json_path) as f:
+            expected = json.load(f)
+        self.assertEqual(list(iter_signal_records(columnar_path)), expected)
+
+    def test_typed_columns(self):
+        path = self._path("out.col")
+        rsi = [None, None, 25.123, 75.0, 50.0]
+        codes, _ = encode_signals(rsi)
+        write_signal_columns(path, ["d1", "d2", "d3", "d4", "d5"],
+                             [1.0, 2.0, 3.0, 4.0, 5.0], rsi, codes)
+        dictionary, columns = read_signal_columns(path)
+        self.assertEqual(dictionary, list(SIGNAL_NAMES))
+        self.assertEqual(columns["close"].format, "d")
+        self.assertEqual(columns["signal"].tolist(), [0, 0, 1, 2, 3])
+        self.assertEqual(columns["rsi_valid"].tobytes(), bytes([0b11100]))
+        self.assertTrue(math.isnan(columns["rsi"][0]))
+        self.assertEqual(columns["rsi"][2], 25.12)
+        self.assertEqual(list(columns["date"]), ["d1", "d2", "d3", "d4", "d5"])
+
+    def test_pack_bitmap(self):
+        self.assertEqual(pack_bitmap(b""), b"")
+        self.assertEqual(pack_bitmap(bytes([1, 0, 0, 0, 0, 0, 0, 0, 1])), b"\x01\x01")
+        flags = bytes(i % 3 == 0 for i in range(1000))
+        bitmap = pack_bitmap(flags)
+        self.assertEqual(len(bitmap), 125)
+        self.assertEqual(bytes(bitmap[i >> 3] >> (i & 7) & 1 for i in range(1000)), flags)
+
+    def test_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            read_signal_columns(self._path("missing.col"))
+        other = self._path("other.col")
+        write_columns(other, {"date": ["d1"]}, metadata={"kind": "cache"})
+        with self.assertRaisesRegex(ValueError, "Not a columnar signal output"):
+            read_signal_columns(other)
+
+
+if __name__ == "__main__":
+    unittest.main()
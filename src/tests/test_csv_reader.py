@@ -4,9 +4,17 @@ import os
 import sys
 import tempfile
 import unittest
+from array import array
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from lib.csv_reader import read_csv
+from lib.colfile import read_columns, write_columns
+from lib.csv_reader import (DateColumn, ParseErrors, iter_csv_columns, read_csv,
+                            read_csv_columns)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestCsvReader(unittest.TestCase):
@@ -83,5 +91,183 @@ class TestCsvReader(unittest.TestCase):
         self.assertIn("close", rows[0])
 
 
+class TestReadCsvColumns(unittest.TestCase):
+
+    CONTENT = (
+        "date,open,high,low,close,volume\n"
+        "2024-01-01,100.0,105.0,99.0,103.0,1000\n"
+        "\n"
+        "2024-01-02,103.0,107.0,101.0,106.0,1200\n"
+    )
+
+    def _write_csv(self, content):
+        f = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False)
+        f.write(content)
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def test_matches_read_csv(self):
+        path = self._write_csv(self.CONTENT)
+        rows = read_csv(path)
+        columns = read_csv_columns(path)
+        for name, values in columns.items():
+            self.assertEqual(list(values), [row[name] for row in rows])
+
+    def test_typed_buffers(self):
+        columns = read_csv_columns(self._write_csv(self.CONTENT))
+        self.assertIsInstance(columns["date"], DateColumn)
+        self.assertEqual(columns["date"], ["2024-01-01", "2024-01-02"])
+        for name in ("open", "high", "low", "close", "volume"):
+            self.assertIsInstance(columns[name], array)
+            self.assertEqual(columns[name].typecode, "d")
+
+    def test_selected_columns_only(self):
+        columns = read_csv_columns(self._write_csv(self.CONTENT), ("close",))
+        self.assertEqual(list(columns), ["close"])
+        self.assertEqual(list(columns["close"]), [103.0, 106.0])
+
+    def test_unrequested_columns_are_not_parsed(self):
+        path = self._write_csv(
+            "date,open,high,low,close,volume\n"
+            "2024-01-01,n/a,n/a,n/a,103.0,n/a\n"
+        )
+        columns = read_csv_columns(path, ("date", "close"))
+        self.assertEqual(list(columns["close"]), [103.0])
+
+    def test_unknown_column_requested(self):
+        with self.assertRaises(ValueError):
+            read_csv_columns(self._write_csv(self.CONTENT), ("close", "vwap"))
+
+    def test_same_errors_as_read_csv(self):
+        for content in ("", "name,value\nfoo,123\n", "date,open,high,low,close,volume\n"):
+            path = self._write_csv(content)
+            with self.assertRaises(ValueError) as expected:
+                read_csv(path)
+            with self.assertRaises(ValueError) as actual:
+                read_csv_columns(path, ("close",))
+            self.assertEqual(str(actual.exception), str(expected.exception))
+        with self.assertRaises(FileNotFoundError):
+            read_csv_columns("/nonexistent/path/to/file.csv")
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_as_numpy(self):
+        columns = read_csv_columns(self._write_csv(self.CONTENT), ("date", "close"),
+                                   as_numpy=True)
+        self.assertIsInstance(columns["close"], np.ndarray)
+        self.assertEqual(columns["close"].dtype, np.float64)
+        self.assertEqual(columns["date"], ["2024-01-01", "2024-01-02"])
+
+
+class TestDateColumn(unittest.TestCase):
+
+    VALUES = ["2024-01-01", "été", "", "2024-01-04 09:30:00"]
+
+    def _column(self):
+        column = DateColumn(self.VALUES[:2])
+        column.pack()
+        for value in self.VALUES[2:]:
+            column.append(value)
+        return column
+
+    def test_behaves_like_a_list(self):
+        for values in (self.VALUES, ["2024-01-01", "2024-01-02"]):
+            column = DateColumn(values)
+            self.assertEqual(len(column), len(values))
+            self.assertEqual(list(column), values)
+            self.assertEqual(column, values)
+            self.assertEqual(column[-1], values[-1])
+            self.assertEqual(column[1:3], values[1:3])
+            with self.assertRaises(IndexError):
+                column[len(values)]
+        self.assertEqual(self._column(), self.VALUES)
+        self.assertNotEqual(self._column(), self.VALUES[:3])
+
+    def test_delete_tail(self):
+        column = self._column()
+        del column[3:]
+        column.append("x")
+        self.assertEqual(column, self.VALUES[:3] + ["x"])
+        with self.assertRaises(ValueError):
+            del column[:1]
+
+    def test_writes_as_colfile_string_column(self):
+        path = tempfile.mktemp(suffix=".col")
+        self.addCleanup(lambda: os.path.exists(path) and os.unlink(path))
+        write_columns(path, {"date": self._column()})
+        self.assertEqual(list(read_columns(path)[1]["date"]), self.VALUES)
+
+
+class TestMalformedRows(unittest.TestCase):
+
+    DIRTY = (
+        "date,open,high,low,close,volume\n"
+        "2024-01-01,100.0,105.0,99.0,103.0,1000\n"
+        "2024-01-02,103.0,107.0,101.0,n/a,1200\n"
+        "\n"
+        "2024-01-03,103.0,107.0\n"
+        "2024-01-04,106.0,108.0,104.0,107.0,1300\n"
+    )
+
+    def _write_csv(self, content):
+        f = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False)
+        f.write(content)
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def test_strict_errors_name_line_and_column(self):
+        path = self._write_csv(self.DIRTY)
+        readers = (read_csv, read_csv_columns,
+                   lambda p: read_csv_columns(p, ("date", "close")),
+                   lambda p: list(iter_csv_columns(p, ("close",), chunk_size=1)))
+        for read in readers:
+            with self.assertRaisesRegex(ValueError, "Invalid close value 'n/a' on line 3"):
+                read(path)
+        short = self._write_csv("date,open,high,low,close,volume\n2024-01-01,1.0,2.0\n")
+        with self.assertRaisesRegex(ValueError, "line 2 has 3 fields, expected 6"):
+            read_csv_columns(short, ("date", "close"))
+        # Fields that are not requested are not checked
+        self.assertEqual(list(read_csv_columns(short, ("open",))["open"]), [1.0])
+
+    def test_lenient_skips_and_reports(self):
+        path = self._write_csv(self.DIRTY)
+        errors = ParseErrors()
+        columns = read_csv_columns(path, errors=errors)
+        self.assertEqual(columns["date"], ["2024-01-01", "2024-01-04"])
+        for name in ("open", "high", "low", "close", "volume"):
+            self.assertEqual(len(columns[name]), 2)
+        self.assertEqual(errors.count, 2)
+        self.assertEqual([(e["line"], e["column"], e["value"]) for e in errors.errors],
+                         [(3, "close", "n/a"), (5, "low", None)])
+
+        rows = read_csv(path, errors=ParseErrors())
+        self.assertEqual([row["date"] for row in rows], ["2024-01-01", "2024-01-04"])
+
+    def test_lenient_chunks_keep_limits(self):
+        path = self._write_csv(self.DIRTY)
+        errors = ParseErrors()
+        chunks = list(iter_csv_columns(path, ("date", "close"), chunk_size=1, errors=errors))
+        self.assertEqual([chunk["date"] for chunk in chunks], [["2024-01-01"], ["2024-01-04"]])
+        self.assertEqual([list(chunk["close"]) for chunk in chunks], [[103.0], [107.0]])
+        self.assertEqual(errors.count, 2)
+
+    def test_report_limit_and_file(self):
+        content = "date,open,high,low,close,volume\n" + "".join(
+            f"2024-01-{i:02d},1,2,0.5,{'x' if i % 2 else i},10\n" for i in range(1, 11))
+        errors = ParseErrors(limit=2)
+        read_csv_columns(self._write_csv(content), ("close",), errors=errors)
+        report = errors.to_dict()
+        self.assertEqual((report["rows_skipped"], report["truncated"]), (5, True))
+        self.assertEqual([e["line"] for e in report["errors"]], [2, 4])
+
+    def test_all_rows_bad(self):
+        errors = ParseErrors()
+        with self.assertRaisesRegex(ValueError, "no data rows"):
+            read_csv_columns(self._write_csv(
+                "date,open,high,low,close,volume\n2024-01-01,1,2,0.5,x,10\n"), errors=errors)
+        self.assertEqual(errors.count, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+"""Differential tests: every RSI implementation against the reference loop.
+
+Set RSI_DIFF_TEST_BARS (e.g. to 10000000) to run the long-series check at
+full length; the default keeps the suite fast.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench.differential import EXACT, FAST, FAST_MAX_ABS_ERROR, IMPLEMENTATIONS, SERIES
+from bench.differential import check, compare, run
+from lib.rsi import calculate_rsi
+
+try:
+    from lib import numpy_backend
+except ImportError:
+    numpy_backend = None
+
+LONG_BARS = int(os.environ.get("RSI_DIFF_TEST_BARS", "30000"))
+
+
+class TestDifferential(unittest.TestCase):
+
+    def assertAllOk(self, results, **context):
+        for name, result in results.items():
+            self.assertTrue(result["ok"], f"{name} {context}: {result}")
+
+    def test_random_series_lengths_and_periods(self):
+        rng = random.Random(2024)
+        for kind, generate in SERIES.items():
+            for period in (1, 2, 3, 14, 50):
+                for n in (0, 1, period, period + 1, rng.randint(period + 2, 40 * period)):
+                    seed = rng.randrange(1 << 30)
+                    with self.subTest(series=kind, period=period, n=n):
+                        close = generate(n, random.Random(seed))
+                        self.assertAllOk(check(close, period, seed=seed), seed=seed)
+
+    def test_reference_edge_cases(self):
+        # The _compute_rsi conventions every implementation must reproduce
+        cases = {"flat": 100.0, "all_gains": 100.0, "all_losses": 0.0}
+        for kind, value in cases.items():
+            with self.subTest(series=kind):
+                close = SERIES[kind](500, random.Random(1))
+                self.assertEqual(set(calculate_rsi(close)[14:]), {value})
+                self.assertAllOk(check(close, 14))
+
+    def test_long_series(self):
+        failures = run(LONG_BARS, periods=(14, 200), seeds=1,
+                       series=("random_walk", "geometric", "flat_with_spikes", "all_gains",
+                               "all_losses"))
+        self.assertEqual(failures, [])
+
+    def test_compare(self):
+        expected = [None, 50.0, 70.0]
+        self.assertTrue(compare(expected, [None, 50.0, 70.0], EXACT)["ok"])
+        off_by_ulp = [None, 50.0, 70.00000000000001]
+        result = compare(expected, off_by_ulp, EXACT)
+        self.assertEqual((result["ok"], result["mismatches"], result["first_mismatch"]),
+                         (False, 1, 2))
+        self.assertTrue(compare(expected, off_by_ulp, FAST)["ok"])
+        self.assertFalse(compare(expected, [None, 50.0, 70.0 + 2 * FAST_MAX_ABS_ERROR],
+                                 FAST)["ok"])
+        self.assertEqual(compare(expected, [50.0, 50.0, 70.0], FAST)["first_mismatch"], 0)
+        self.assertFalse(compare(expected, [None, 50.0], EXACT)["ok"])
+
+    @unittest.skipIf(numpy_backend is None, "NumPy is not installed")
+    def test_numpy_implementations_registered(self):
+        self.assertEqual(FAST_MAX_ABS_ERROR, numpy_backend.FAST_MAX_ABS_ERROR)
+        self.assertEqual(IMPLEMENTATIONS["numpy_exact"][0], EXACT)
+        self.assertEqual(IMPLEMENTATIONS["numpy_fast"][0], FAST)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Tests for signal-change events and the --events-only pipeline."""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.events import (EventBuilder, EventIndex, build_events, expand_events,
+                        iter_events, signal_runs)
+from lib.pipeline import run_events, run_in_memory
+from lib.signals import SIGNAL_NAMES
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+def _naive_runs(codes):
+    runs = []
+    for i, code in enumerate(codes):
+        if runs and runs[-1][2] == code:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1, code])
+    return [tuple(run) for run in runs]
+
+
+class TestSignalRuns(unittest.TestCase):
+
+    def test_matches_naive_scan(self):
+        rng = random.Random(4)
+        for n in (0, 1, 2, 3, 17, 500):
+            for change_rate in (0.0, 0.05, 0.5, 1.0):
+                codes = array("b")
+                code = rng.randrange(4)
+                for _ in range(n):
+                    if rng.random() < change_rate:
+                        code = (code + rng.randrange(1, 4)) % 4
+                    codes.append(code)
+                with self.subTest(n=n, change_rate=change_rate):
+                    self.assertEqual(list(signal_runs(codes)), _naive_runs(codes))
+
+    def test_build_events(self):
+        dates = [f"d{i}" for i in range(7)]
+        codes = array("b", [0, 0, 1, 1, 1, 3, 0])
+        self.assertEqual(build_events(dates, codes), [
+            {"start_date": "d0", "end_date": "d1", "length": 2, "signal": None},
+            {"start_date": "d2", "end_date": "d4", "length": 3, "signal": "BUY"},
+            {"start_date": "d5", "end_date": "d5", "length": 1, "signal": "HOLD"},
+            {"start_date": "d6", "end_date": "d6", "length": 1, "signal": None},
+        ])
+        self.assertEqual(build_events([], array("b")), [])
+
+    def test_builder_joins_runs_across_chunks(self):
+        rng = random.Random(9)
+        codes = array("b", [rng.choice((1, 1, 1, 2, 3)) for _ in range(300)])
+        dates = [f"d{i}" for i in range(300)]
+        builder = EventBuilder()
+        events = []
+        for start in range(0, 300, 7):
+            events.extend(builder.feed(dates[start:start + 7], codes[start:start + 7]))
+        events.extend(builder.finish())
+        self.assertEqual(events, build_events(dates, codes))
+        self.assertEqual(builder.count, len(events))
+
+
+class TestEventReaders(unittest.TestCase):
+
+    EVENTS = [
+        {"start_date": "d0", "end_date": "d2", "length": 3, "signal": None},
+        {"start_date": "d3", "end_date": "d3", "length": 1, "signal": "SELL"},
+        {"start_date": "d4", "end_date": "d5", "length": 2, "signal": "HOLD"},
+    ]
+    BARS = [None, None, None, "SELL", "HOLD", "HOLD"]
+
+    def test_expand_events(self):
+        self.assertEqual(list(expand_events(self.EVENTS)), self.BARS)
+
+    def test_event_index(self):
+        index = EventIndex(self.EVENTS)
+        self.assertEqual(len(index), 6)
+        self.assertEqual([index[i] for i in range(6)], self.BARS)
+        self.assertEqual(index[-1], "HOLD")
+        self.assertIs(index.event_at(3), index.events[1])
+        with self.assertRaises(IndexError):
+            index[6]
+
+    def test_iter_events_reads_json_and_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "events.json")
+            with open(path, "w") as f:
+                json.dump(self.EVENTS, f, indent=2)
+            self.assertEqual(list(iter_events(path)), self.EVENTS)
+            with open(path, "w") as f:
+                f.write("".join(json.dumps(e) + "\n" for e in self.EVENTS))
+            self.assertEqual(list(iter_events(path)), self.EVENTS)
+
+    def test_iter_events_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            list(iter_events("/nonexistent/events.json"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bars.json")
+            with open(path, "w") as f:
+                json.dump([{"date": "d0", "signal": None}], f)
+            with self.assertRaises(ValueError):
+                list(iter_events(path))
+
+
+class TestRunEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_events_expand_to_per_bar_output(self):
+        rows, counts, event_count = run_events(SAMPLE, self._path("events.json"))
+        bar_rows, bar_counts = run_in_memory(SAMPLE, self._path("bars.json"))
+        self.assertEqual((rows, counts), (bar_rows, bar_counts))
+        with open(self._path("bars.json")) as f:
+            bars = json.load(f)
+        events = list(iter_events(self._path("events.json")))
+        self.assertEqual(len(events), event_count)
+        self.assertEqual(list(expand_events(events)), [b["signal"] for b in bars])
+        self.assertEqual(events[0]["start_date"], bars[0]["date"])
+        self.assertEqual(events[-1]["end_date"], bars[-1]["date"])
+
+    def test_stream_mode_writes_same_events(self):
+        expected = run_events(SAMPLE, self._path("a.jsonl"), fmt="jsonl")
+        for chunk_size in (1, 3, 14, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                result = run_events(SAMPLE, self._path("b.jsonl"), fmt="jsonl",
+                                    stream=True, chunk_size=chunk_size)
+                self.assertEqual(result, expected)
+                with open(self._path("a.jsonl")) as a, open(self._path("b.jsonl")) as b:
+                    self.assertEqual(a.read(), b.read())
+
+    def test_stream_mode_error_leaves_no_output(self):
+        with open(SAMPLE) as f:
+            lines = f.readlines()
+        lines[30] = lines[30].replace(lines[30].split(",")[4], "bad", 1)
+        with open(self._path("bad.csv"), "w") as f:
+            f.writelines(lines)
+        for fmt in ("json", "jsonl"):
+            with self.subTest(fmt=fmt):
+                output = self._path("events." + fmt)
+                with self.assertRaisesRegex(ValueError, "Invalid close value 'bad'"):
+                    run_events(self._path("bad.csv"), output, fmt=fmt, stream=True,
+                               chunk_size=5)
+                self.assertFalse(os.path.exists(output))
+
+    def test_signal_values_are_known(self):
+        run_events(SAMPLE, self._path("events.json"))
+        for event in iter_events(self._path("events.json")):
+            self.assertIn(event["signal"], SIGNAL_NAMES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for grouped (multi-symbol) mode."""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib import grouped
+from lib.csv_reader import ParseErrors
+from lib.grouped import compute_grouped, read_grouped, run_grouped
+from lib.rsi import calculate_rsi
+from lib.signals import generate_signals
+
+HEADER = "symbol,date,open,high,low,close,volume\n"
+
+
+class TestGrouped(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        rng = random.Random(4)
+        self.series = {symbol: [] for symbol in ("BBB", "AAA", "CCC")}
+        lines = [HEADER]
+        for day in range(40):
+            for symbol, prices in self.series.items():
+                if symbol == "CCC" and day % 3:
+                    continue  # sparser symbol, so groups differ in length
+                close = round(100 + rng.uniform(-10, 10), 2)
+                prices.append((f"2024-{day:03d}", close))
+                lines.append(f"{symbol},2024-{day:03d},1,2,0.5,{close},10\n")
+        self.csv_path = self._write("wide.csv", "".join(lines))
+        self.lines = lines
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def _expected(self, symbol):
+        dates, closes = zip(*self.series[symbol])
+        rsi = calculate_rsi(list(closes))
+        return [{"symbol": symbol, "date": d, "close": c,
+                 "rsi": round(r, 2) if r is not None else None, "signal": s}
+                for d, c, r, s in zip(dates, closes, rsi, generate_signals(rsi))]
+
+    def _run(self, order, workers=1):
+        output = os.path.join(self.tmpdir.name, f"out_{order}_{workers}.json")
+        result = run_grouped(self.csv_path, output, order, workers)
+        with open(output) as f:
+            return result, json.load(f)
+
+    def test_partition(self):
+        columns = read_grouped(self.csv_path)
+        self.assertEqual(columns.symbols, ["BBB", "AAA", "CCC"])
+        self.assertEqual(list(columns.offsets), [0, 40, 80, 94])
+        self.assertEqual(list(columns.close[:40]), [c for _, c in self.series["BBB"]])
+        self.assertEqual([columns.dates[row] for row in columns.rows[80:83]],
+                         ["2024-000", "2024-003", "2024-006"])
+        positions = columns.positions()
+        self.assertEqual([columns.rows[p] for p in positions], list(range(94)))
+
+    def test_grouped_order(self):
+        (rows, counts, symbols), records = self._run("grouped")
+        self.assertEqual((rows, symbols), (94, 3))
+        self.assertEqual(records, self._expected("BBB") + self._expected("AAA")
+                         + self._expected("CCC"))
+        self.assertEqual(sum(counts.values()), 94)
+
+    def test_original_order(self):
+        _, records = self._run("original")
+        self.assertEqual([(r["symbol"], r["date"]) for r in records],
+                         [tuple(line.split(",")[:2]) for line in self.lines[1:]])
+        by_symbol = {}
+        for record in records:
+            by_symbol.setdefault(record["symbol"], []).append(record)
+        for symbol in self.series:
+            self.assertEqual(by_symbol[symbol], self._expected(symbol))
+
+    def test_shared_memory_workers_match(self):
+        columns = read_grouped(self.csv_path)
+        expected = compute_grouped(columns, workers=1)
+        with mock.patch.object(grouped, "MIN_PARALLEL_ROWS", 0):
+            actual = compute_grouped(columns, workers=2)
+        self.assertEqual(actual[0].tobytes(), expected[0].tobytes())
+        self.assertEqual(actual[1:], expected[1:])
+
+    def test_plan_tasks(self):
+        ranges = [(0, 10), (10, 11), (11, 30), (30, 31), (31, 40)]
+        tasks = grouped._plan_tasks(ranges, 4)
+        self.assertEqual([r for task in tasks for r in task], ranges)
+        self.assertLessEqual(len(tasks), 4)
+
+    def test_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            read_grouped(os.path.join(self.tmpdir.name, "missing.csv"))
+        plain = self._write("plain.csv", "date,open,high,low,close,volume\n2024,1,2,0.5,1,1\n")
+        with self.assertRaisesRegex(ValueError, "'symbol'"):
+            read_grouped(plain)
+        with self.assertRaisesRegex(ValueError, "Unknown record order"):
+            run_grouped(self.csv_path, os.path.join(self.tmpdir.name, "x.json"), "random")
+
+    def test_malformed_rows(self):
+        dirty = self._write("dirty.csv", HEADER + "AAA,2024-001,1,2,0.5,1.5,10\n"
+                            "AAA,2024-002,1,2,0.5,bad,10\nBBB\nBBB,2024-001,1,2,0.5,2.5,10\n")
+        with self.assertRaisesRegex(ValueError, "Invalid close value 'bad' on line 3"):
+            read_grouped(dirty)
+        errors = ParseErrors()
+        columns = read_grouped(dirty, errors)
+        self.assertEqual((columns.symbols, list(columns.close)), (["AAA", "BBB"], [1.5, 2.5]))
+        self.assertEqual([(e["line"], e["column"]) for e in errors.errors],
+                         [(3, "close"), (4, "date")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Tests for append-aware incremental runs with checkpoints."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.incremental import checkpoint_path, run_incremental
+from lib.pipeline import run_in_memory
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestRunIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        with open(SAMPLE) as f:
+            lines = [line for line in f if line.strip()]
+        self.header, self.rows = lines[0], lines[1:]
+        self.csv_path = self._path("prices.csv")
+        self.output = self._path("signals.json")
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def _write_rows(self, rows, mode="w"):
+        with open(self.csv_path, mode) as f:
+            if mode == "w":
+                f.write(self.header)
+            f.write("".join(rows))
+
+    def _expected(self, fmt="json", compact=False):
+        path = self._path("expected")
+        with open(path, "w") as f:
+            f.write(self.header + "".join(self.rows))
+        run_in_memory(path, path + ".out", fmt=fmt, compact=compact)
+        with open(path + ".out") as f:
+            return f.read()
+
+    def _output(self):
+        with open(self.output) as f:
+            return f.read()
+
+    def test_appends_match_full_run(self):
+        for fmt, compact in (("json", False), ("json", True), ("jsonl", False)):
+            with self.subTest(fmt=fmt, compact=compact):
+                self._write_rows(self.rows[:10])
+                result = run_incremental(self.csv_path, self.output, fmt, compact)
+                self.assertEqual(result[2:], (10, False))
+                for start, stop in ((10, 11), (11, 25), (25, 40)):
+                    self._write_rows(self.rows[start:stop], mode="a")
+                    rows, counts, new_rows, resumed = run_incremental(
+                        self.csv_path, self.output, fmt, compact, chunk_size=4)
+                    self.assertTrue(resumed)
+                    self.assertEqual((rows, new_rows), (stop, stop - start))
+                self.assertEqual(self._output(), self._expected(fmt, compact))
+                self.assertEqual(counts, run_in_memory(SAMPLE, self._path("x.json"))[1])
+
+    def test_rerun_without_new_rows(self):
+        self._write_rows(self.rows)
+        run_incremental(self.csv_path, self.output)
+        self.assertEqual(run_incremental(self.csv_path, self.output)[2:], (0, True))
+        self.assertEqual(self._output(), self._expected())
+
+    def test_changed_prefix_recomputes(self):
+        self._write_rows(self.rows[:20])
+        run_incremental(self.csv_path, self.output)
+        edited = self.rows[0].replace(",", ",1", 1)  # earlier history rewritten
+        self.rows[0] = edited
+        self._write_rows(self.rows)
+        self.assertEqual(run_incremental(self.csv_path, self.output)[2:], (40, False))
+        self.assertEqual(self._output(), self._expected())
+
+    def test_truncated_input_recomputes(self):
+        self._write_rows(self.rows)
+        run_incremental(self.csv_path, self.output)
+        self.rows = self.rows[:30]
+        self._write_rows(self.rows)
+        self.assertFalse(run_incremental(self.csv_path, self.output)[3])
+        self.assertEqual(self._output(), self._expected())
+
+    def test_modified_output_or_options_recompute(self):
+        self._write_rows(self.rows[:20])
+        run_incremental(self.csv_path, self.output)
+        with open(self.output, "a") as f:
+            f.write(" ")
+        self._write_rows(self.rows[20:], mode="a")
+        self.assertFalse(run_incremental(self.csv_path, self.output)[3])
+        self.assertEqual(self._output(), self._expected())
+
+        self.assertFalse(run_incremental(self.csv_path, self.output, compact=True)[3])
+        self.assertEqual(self._output(), self._expected(compact=True))
+
+    def test_partial_last_line_is_not_checkpointed(self):
+        self._write_rows(self.rows[:20] + [self.rows[20].rstrip("\n")])
+        self.assertEqual(run_incremental(self.csv_path, self.output)[0], 21)
+        self.assertFalse(os.path.exists(checkpoint_path(self.output)))
+
+        self._write_rows(["\n"] + self.rows[21:], mode="a")
+        self.assertEqual(run_incremental(self.csv_path, self.output)[2:], (40, False))
+        self.assertEqual(self._output(), self._expected())
+        with open(checkpoint_path(self.output)) as f:
+            state = json.load(f)
+        self.assertEqual(state["rows"], 40)
+        self.assertEqual(state["offset"], os.path.getsize(self.csv_path))
+
+    def test_corrupt_checkpoint_recomputes(self):
+        self._write_rows(self.rows)
+        run_incremental(self.csv_path, self.output)
+        with open(checkpoint_path(self.output), "w") as f:
+            f.write("{not json")
+        self.assertFalse(run_incremental(self.csv_path, self.output)[3])
+        self.assertEqual(self._output(), self._expected())
+
+    def test_failed_run_leaves_no_output(self):
+        self._write_rows(self.rows[:20])
+        run_incremental(self.csv_path, self.output)
+        self._write_rows(self.rows[20:30] + ["2024-03-01,1,2,0.5,bad,10\n"], mode="a")
+        with self.assertRaisesRegex(ValueError, "Invalid close value 'bad'"):
+            run_incremental(self.csv_path, self.output, chunk_size=4)
+        self.assertFalse(os.path.exists(self.output))
+
+        self._write_rows(self.rows)
+        self.assertEqual(run_incremental(self.csv_path, self.output)[2:], (40, False))
+        self.assertEqual(self._output(), self._expected())
+
+    def test_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            run_incremental(self._path("missing.csv"), self.output)
+        self._write_rows([])
+        with self.assertRaisesRegex(ValueError, "no data rows"):
+            run_incremental(self.csv_path, self.output)
+        with open(self.csv_path, "w") as f:
+            f.write("date,close\n2024-01-01,1.0\n")
+        with self.assertRaisesRegex(ValueError, "missing required columns"):
+            run_incremental(self.csv_path, self.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
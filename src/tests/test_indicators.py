@@ -0,0 +1,153 @@
+"""Tests for the indicator registry and shared intermediates."""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.csv_reader import read_csv_columns
+from lib.indicators import (
+    INDICATORS, IndicatorContext, compute_indicators, output_decimals,
+    parse_indicator_specs, required_columns,
+)
+from lib.rsi import calculate_rsi
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+def naive_sma(values, period):
+    return [None if i + 1 < period else sum(values[i + 1 - period:i + 1]) / period
+            for i in range(len(values))]
+
+
+def naive_ema(values, period):
+    result = [None] * len(values)
+    if len(values) >= period:
+        result[period - 1] = sum(values[:period]) / period
+        for i in range(period, len(values)):
+            result[i] = (values[i] * 2 + result[i - 1] * (period - 1)) / (period + 1)
+    return result
+
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        self.columns = read_csv_columns(SAMPLE, ("high", "low", "close"))
+        self.close = list(self.columns["close"])
+
+    def _compute(self, text):
+        return compute_indicators(self.columns, parse_indicator_specs(text))
+
+    def assertSeriesAlmostEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            if e is None:
+                self.assertIsNone(a)
+            else:
+                self.assertAlmostEqual(a, e, places=9)
+
+    def test_registry(self):
+        self.assertEqual(set(INDICATORS), {"rsi", "sma", "ema", "macd", "bollinger", "atr"})
+
+    def test_rsi_matches_calculate_rsi(self):
+        self.assertEqual(self._compute("rsi")["rsi"], calculate_rsi(self.close))
+        self.assertEqual(self._compute("rsi:5")["rsi_5"], calculate_rsi(self.close, 5))
+        self.assertEqual(self._compute("rsi:50")["rsi_50"], [None] * len(self.close))
+
+    def test_sma_and_ema(self):
+        results = self._compute("sma:10,ema:10")
+        self.assertSeriesAlmostEqual(results["sma_10"], naive_sma(self.close, 10))
+        self.assertSeriesAlmostEqual(results["ema_10"], naive_ema(self.close, 10))
+
+    def test_macd(self):
+        results = self._compute("macd:3:6:4")
+        fast, slow = naive_ema(self.close, 3), naive_ema(self.close, 6)
+        line = [None if s is None else f - s for f, s in zip(fast, slow)]
+        signal = [None] * 5 + naive_ema(line[5:], 4)
+        self.assertSeriesAlmostEqual(results["macd_3_6_4"], line)
+        self.assertSeriesAlmostEqual(results["macd_3_6_4_signal"], signal)
+        self.assertSeriesAlmostEqual(
+            results["macd_3_6_4_hist"],
+            [None if s is None else m - s for m, s in zip(line, signal)])
+
+    def test_bollinger(self):
+        results = self._compute("bollinger:5:1.5")
+        middle = naive_sma(self.close, 5)
+        self.assertSeriesAlmostEqual(results["bollinger_5_1.5_middle"], middle)
+        for i, mean in enumerate(middle):
+            if mean is None:
+                continue
+            window = self.close[i - 4:i + 1]
+            std = math.sqrt(sum((v - mean) ** 2 for v in window) / 5)
+            self.assertAlmostEqual(results["bollinger_5_1.5_upper"][i], mean + 1.5 * std)
+            self.assertAlmostEqual(results["bollinger_5_1.5_lower"][i], mean - 1.5 * std)
+
+    def test_bollinger_high_price_level(self):
+        # Spreads of 0.01 around 60000: sum-of-squares variance cancels to
+        # noise here, and running sums drift further over long series
+        rng = random.Random(7)
+        close = [60000 + rng.uniform(-0.01, 0.01) for _ in range(300000)]
+        results = compute_indicators({"close": close}, parse_indicator_specs("bollinger"))
+        upper = results["bollinger_upper"]
+        for i in list(range(19, 200)) + list(range(len(close) - 200, len(close))):
+            window = close[i - 19:i + 1]
+            mean = math.fsum(window) / 20
+            std = math.sqrt(math.fsum((v - mean) ** 2 for v in window) / 20)
+            self.assertAlmostEqual((upper[i] - results["bollinger_middle"][i]) / 2, std,
+                                   delta=std * 1e-6, msg=f"index {i}")
+
+    def test_atr(self):
+        high, low = self.columns["high"], self.columns["low"]
+        ranges = [high[0] - low[0]] + [
+            max(high[i] - low[i], abs(high[i] - self.close[i - 1]),
+                abs(low[i] - self.close[i - 1]))
+            for i in range(1, len(self.close))]
+        expected = [None] * 4 + [sum(ranges[:5]) / 5]
+        for tr in ranges[5:]:
+            expected.append((expected[-1] * 4 + tr) / 5)
+        self.assertSeriesAlmostEqual(self._compute("atr:5")["atr_5"], expected)
+
+    def test_short_input(self):
+        columns = {"high": [2.0, 3.0], "low": [1.0, 1.5], "close": [1.5, 2.5]}
+        results = compute_indicators(columns, parse_indicator_specs(
+            "rsi,sma,ema,macd,bollinger,atr"))
+        for key, values in results.items():
+            with self.subTest(column=key):
+                self.assertEqual(values, [None, None])
+
+    def test_shared_intermediates(self):
+        context = IndicatorContext(self.columns)
+        for key, indicator, params in parse_indicator_specs("ema:12,macd,sma,bollinger"):
+            indicator.compute(context, *params)
+        # ema:12 and macd share one EMA; sma and bollinger one rolling sum
+        self.assertEqual(sorted(k for k in context._memo if isinstance(k, tuple)),
+                         [("ema", "close", 12), ("ema", "close", 26),
+                          ("sma", "close", 20), ("std", "close", 20),
+                          ("sum", "close", 20)])
+
+    def test_parse_specs(self):
+        specs = parse_indicator_specs("rsi, sma:50 ,macd:5,bollinger:10:2.5")
+        self.assertEqual([(key, params) for key, _, params in specs],
+                         [("rsi", (14,)), ("sma_50", (50,)), ("macd_5", (5, 26, 9)),
+                          ("bollinger_10_2.5", (10, 2.5))])
+        self.assertIsInstance(specs[1][2][0], int)
+        self.assertEqual(required_columns(specs), ["close"])
+        self.assertEqual(required_columns(parse_indicator_specs("atr")),
+                         ["high", "low", "close"])
+        self.assertEqual(output_decimals(parse_indicator_specs("rsi,bollinger")),
+                         {"rsi": 2, "bollinger_middle": 4, "bollinger_upper": 4,
+                          "bollinger_lower": 4})
+
+    def test_parse_errors(self):
+        for text in ("vwap", "sma:x", "sma:0", "sma:5:6", "rsi,rsi", "", "rsi:0.5",
+                     "sma:2.5", "atr:0.5", "bollinger:0.5", "macd:12:26.5",
+                     "bollinger:20:0", "bollinger:20:nan", "bollinger:20:inf"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_indicator_specs(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,18 @@
 
 import json
 import os
+import random
 import subprocess
 import sys
+import tempfile
+import threading
 import unittest
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 
 class TestIntegration(unittest.TestCase):
 
@@ -47,6 +55,377 @@ class TestIntegration(unittest.TestCase):
         self.assertIn("SELL", signals, "Expected at least one SELL signal")
         self.assertIn("HOLD", signals, "Expected at least one HOLD signal")
 
+    def test_numpy_backend_matches_python(self):
+        """--backend numpy (fast or --exact) should produce the same output file as the default."""
+        outputs = []
+        for extra in (["python"], ["numpy"], ["numpy", "--exact"]):
+            result = subprocess.run(
+                [sys.executable, "src/main.py", "src/data/sample.csv",
+                 "-o", self.OUTPUT_FILE, "--backend"] + extra,
+                capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+            with open(self.OUTPUT_FILE) as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+
+    def test_stream_mode_matches_default(self):
+        """--stream should write a byte-identical output file."""
+        outputs = []
+        for extra in ([], ["--stream", "--chunk-size", "16"]):
+            result = subprocess.run(
+                [sys.executable, "src/main.py", "src/data/sample.csv",
+                 "-o", self.OUTPUT_FILE] + extra,
+                capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+            with open(self.OUTPUT_FILE, "rb") as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_chunk_size_must_be_positive(self):
+        for value in ("0", "-5", "x"):
+            with self.subTest(value=value):
+                result = subprocess.run(
+                    [sys.executable, "src/main.py", "src/data/sample.csv",
+                     "-o", self.OUTPUT_FILE, "--stream", "--chunk-size", value],
+                    capture_output=True, text=True
+                )
+                self.assertEqual(result.returncode, 2)
+                self.assertIn("--chunk-size", result.stderr)
+
+    def test_jsonl_output(self):
+        """--format jsonl --compact writes one parseable record per line."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--format", "jsonl", "--compact"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        with open(self.OUTPUT_FILE) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 40)
+        self.assertEqual(set(records[0]), {"date", "close", "rsi", "signal"})
+
+    def test_cached_runs_match_default(self):
+        """--cache must not change the output, on a miss or a hit."""
+        cache_dir = tempfile.mkdtemp()
+        outputs = []
+        for extra in ([], ["--cache", "--cache-dir", cache_dir],
+                      ["--cache", "--cache-dir", cache_dir]):
+            result = subprocess.run(
+                [sys.executable, "src/main.py", "src/data/sample.csv",
+                 "-o", self.OUTPUT_FILE] + extra,
+                capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+            with open(self.OUTPUT_FILE, "rb") as f:
+                outputs.append(f.read())
+        for name in os.listdir(cache_dir):
+            os.unlink(os.path.join(cache_dir, name))
+        os.rmdir(cache_dir)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+
+    def test_sweep_mode(self):
+        """--periods/--thresholds writes one signal column per combination."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--periods", "7,14", "--thresholds", "30:70,25.5:75"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("RSI(14) 30/70: 6 BUY, 4 SELL, 16 HOLD, 14 pending", result.stdout)
+        with open(self.OUTPUT_FILE) as f:
+            data = json.load(f)
+        self.assertIn("signal_7_25.5_75", data[0])
+
+    def test_profile_output(self):
+        """--profile prints a per-stage table; --metrics-out writes metrics."""
+        metrics_path = tempfile.mktemp(suffix=".json")
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--profile", "--metrics-out", metrics_path],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("peak MB", result.stdout)
+        with open(metrics_path) as f:
+            stages = [m["stage"] for m in json.load(f)["stages"]]
+        os.unlink(metrics_path)
+        self.assertEqual(stages, ["read", "rsi", "signals", "records", "write"])
+
+    def test_events_only_mode(self):
+        """--events-only writes one record per signal change."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--events-only"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("Signals: 6 BUY, 4 SELL, 16 HOLD, 14 pending", result.stdout)
+        with open(self.OUTPUT_FILE) as f:
+            events = json.load(f)
+        self.assertEqual(sum(e["length"] for e in events), 40)
+        self.assertEqual(list(events[0]), ["start_date", "end_date", "length", "signal"])
+
+    def test_lenient_mode_writes_error_report(self):
+        """--error-report skips malformed rows and lists them with line and column."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, "dirty.csv")
+            report_path = os.path.join(tmpdir, "errors.json")
+            with open("src/data/sample.csv") as f:
+                lines = f.readlines()
+            lines[5] = lines[5].replace(",", ",oops", 4)
+            with open(csv_path, "w") as f:
+                f.writelines(lines)
+
+            strict = subprocess.run(
+                [sys.executable, "src/main.py", csv_path, "-o", self.OUTPUT_FILE],
+                capture_output=True, text=True
+            )
+            self.assertEqual(strict.returncode, 1)
+            self.assertIn("on line 6", strict.stderr)
+
+            lenient = subprocess.run(
+                [sys.executable, "src/main.py", csv_path, "-o", self.OUTPUT_FILE,
+                 "--error-report", report_path],
+                capture_output=True, text=True
+            )
+            self.assertEqual(lenient.returncode, 0, f"Script failed: {lenient.stderr}")
+            self.assertIn("Read 39 rows", lenient.stdout)
+            self.assertIn("skipped 1 malformed rows", lenient.stderr)
+            with open(report_path) as f:
+                report = json.load(f)
+        self.assertEqual(report["rows_skipped"], 1)
+        self.assertEqual(report["errors"][0]["line"], 6)
+
+    def test_columnar_format(self):
+        """--format columnar writes a memory-mappable file with the same records."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--format", "columnar"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        sys.path.insert(0, "src")
+        try:
+            from lib.columnar_output import iter_signal_records
+        finally:
+            sys.path.remove("src")
+        records = list(iter_signal_records(self.OUTPUT_FILE))
+        self.assertEqual(len(records), 40)
+        self.assertEqual(sum(r["signal"] == "BUY" for r in records), 6)
+
+        rejected = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--format", "columnar", "--stream"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(rejected.returncode, 2)
+
+    def test_group_by_symbol_mode(self):
+        """--group-by-symbol computes RSI per symbol of an interleaved file."""
+        with open("src/data/sample.csv") as f:
+            header, *rows = [line for line in f if line.strip()]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, "wide.csv")
+            with open(csv_path, "w") as f:
+                f.write("symbol," + header)
+                for row in rows:
+                    f.write("AAA," + row + "BBB," + row)
+            result = subprocess.run(
+                [sys.executable, "src/main.py", csv_path, "-o", self.OUTPUT_FILE,
+                 "--group-by-symbol", "--group-order", "original"],
+                capture_output=True, text=True
+            )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("80 rows for 2 symbols", result.stdout)
+        self.assertIn("Signals: 12 BUY, 8 SELL, 32 HOLD, 28 pending", result.stdout)
+        with open(self.OUTPUT_FILE) as f:
+            records = json.load(f)
+        self.assertEqual([r["symbol"] for r in records[:4]], ["AAA", "BBB", "AAA", "BBB"])
+
+    def test_backtest_mode(self):
+        """--backtest writes one result per period and threshold combination."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--backtest", "--periods", "7,14", "--thresholds", "30:70,40:60",
+             "--fee", "0.001"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("Wrote 4 backtest results", result.stdout)
+        self.assertIn("Best: RSI(", result.stdout)
+        with open(self.OUTPUT_FILE) as f:
+            results = json.load(f)
+        self.assertEqual([(r["period"], r["lower"], r["upper"]) for r in results],
+                         [(7, 30, 70), (7, 40, 60), (14, 30, 70), (14, 40, 60)])
+
+        for fee in ("1", "-0.5", "2", "x"):
+            with self.subTest(fee=fee):
+                bad = subprocess.run(
+                    [sys.executable, "src/main.py", "src/data/sample.csv",
+                     "-o", self.OUTPUT_FILE, "--backtest", "--fee", fee],
+                    capture_output=True, text=True
+                )
+                self.assertEqual(bad.returncode, 2)
+                self.assertIn("--fee", bad.stderr)
+
+    def test_resample_mode(self):
+        """--resample writes RSI and signals on each timeframe's bars from one read."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "out.jsonl")
+            result = subprocess.run(
+                [sys.executable, "src/main.py", "src/data/sample.csv", "-o", output,
+                 "--resample", "1d,7d", "--format", "jsonl"],
+                capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+            self.assertIn("1d: wrote 40 bars", result.stdout)
+            with open(os.path.join(tmpdir, "out_1d.jsonl")) as f:
+                daily = [json.loads(line) for line in f]
+            with open(os.path.join(tmpdir, "out_7d.jsonl")) as f:
+                weekly = [json.loads(line) for line in f]
+        with open("src/data/sample.csv") as f:
+            closes = [float(line.split(",")[4]) for line in f.readlines()[1:] if line.strip()]
+        self.assertEqual([r["close"] for r in daily], closes)
+        self.assertEqual(weekly[-1]["close"], closes[-1])
+        self.assertLess(len(weekly), len(daily))
+
+    def test_results_cache(self):
+        """--results-cache reuses the first run's results and reports hits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            command = [sys.executable, "src/main.py", "src/data/sample.csv", "-o",
+                       self.OUTPUT_FILE, "--results-cache", "--cache-dir", tmpdir]
+            outputs = []
+            for expected in ("0 disk hits, 1 misses", "1 disk hits, 0 misses"):
+                result = subprocess.run(command, capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+                self.assertIn(expected, result.stdout)
+                self.assertIn("Signals: 6 BUY, 4 SELL, 16 HOLD, 14 pending", result.stdout)
+                with open(self.OUTPUT_FILE) as f:
+                    outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_resample_rejects_bad_timeframe(self):
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--resample", "5x"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("Invalid timeframe", result.stderr)
+
+    def test_indicators_mode(self):
+        """--indicators adds one column per indicator output and applies the rules."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--indicators", "rsi,macd:3:6:4,atr:5", "--buy", "rsi<30,macd_3_6_4<0",
+             "--sell", "rsi>70"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        with open(self.OUTPUT_FILE) as f:
+            records = json.load(f)
+        self.assertEqual(list(records[0]), ["date", "close", "rsi", "macd_3_6_4",
+                                            "macd_3_6_4_signal", "macd_3_6_4_hist",
+                                            "atr_5", "signal"])
+        for record in records:
+            if record["signal"] == "BUY":
+                self.assertLess(record["rsi"], 30)
+                self.assertLess(record["macd_3_6_4"], 0)
+
+        bad = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--indicators", "sma", "--buy", "rsi<30", "--sell", "close>sma"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(bad.returncode, 1)
+        self.assertIn("unknown columns", bad.stderr)
+
+        dates = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--indicators", "rsi", "--buy", "date>5"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(dates.returncode, 1)
+        self.assertIn("Error: Rules can only compare numeric columns", dates.stderr)
+
+    def test_indicators_default_rules(self):
+        """The default rules apply to the one RSI column and are required without one."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "src/data/sample.csv", "-o", self.OUTPUT_FILE,
+             "--indicators", "rsi:7,sma", "--sell", "close>sma"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        with open(self.OUTPUT_FILE) as f:
+            records = json.load(f)
+        self.assertIn("BUY", {record["signal"] for record in records})
+        for record in records:
+            if record["signal"] == "BUY":
+                self.assertLess(record["rsi_7"], 30)
+
+        for indicators in ("macd", "sma,atr", "rsi,rsi:7"):
+            with self.subTest(indicators=indicators):
+                bad = subprocess.run(
+                    [sys.executable, "src/main.py", "src/data/sample.csv", "-o",
+                     self.OUTPUT_FILE, "--indicators", indicators],
+                    capture_output=True, text=True
+                )
+                self.assertEqual(bad.returncode, 2)
+                self.assertIn("--buy/--sell required", bad.stderr)
+
+    def test_incremental_mode_resumes(self):
+        """--incremental processes only appended rows on the second run."""
+        with open("src/data/sample.csv") as f:
+            lines = f.readlines()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, "prices.csv")
+            output = os.path.join(tmpdir, "out.json")
+            with open(csv_path, "w") as f:
+                f.writelines(lines[:25])
+            command = [sys.executable, "src/main.py", csv_path, "-o", output, "--incremental"]
+            first = subprocess.run(command, capture_output=True, text=True)
+            self.assertEqual(first.returncode, 0, f"Script failed: {first.stderr}")
+            with open(csv_path, "a") as f:
+                f.writelines(lines[25:])
+            second = subprocess.run(command, capture_output=True, text=True)
+            self.assertEqual(second.returncode, 0, f"Script failed: {second.stderr}")
+            self.assertIn(f"read {len(lines) - 25} new rows", second.stdout)
+            self.assertIn("Signals: 6 BUY, 4 SELL, 16 HOLD, 14 pending", second.stdout)
+
+    def test_live_follow_mode(self):
+        """--follow replays a CSV through the live service as JSON Lines."""
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "--follow", "src/data/sample.csv",
+             "-o", self.OUTPUT_FILE, "--duration", "0.5"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("ticks for 1 symbols", result.stdout)
+        with open(self.OUTPUT_FILE) as f:
+            events = [json.loads(line) for line in f]
+        with open("src/data/sample.csv") as f:
+            row_count = sum(1 for line in f if line.strip()) - 1
+        self.assertEqual(len(events), row_count)
+        self.assertEqual(events[0]["symbol"], "sample")
+        self.assertIsNone(events[0]["signal"])
+        self.assertIsNotNone(events[-1]["signal"])
+
+        # A missing file fails at once, with or without --duration
+        for extra in ([], ["--duration", "60"]):
+            with self.subTest(extra=extra):
+                result = subprocess.run(
+                    [sys.executable, "src/main.py", "--follow", "missing.csv",
+                     "-o", self.OUTPUT_FILE, *extra],
+                    capture_output=True, text=True, timeout=20
+                )
+                self.assertEqual(result.returncode, 1)
+                self.assertIn("Error: CSV file not found: missing.csv", result.stderr)
+
     def test_missing_file_error(self):
         """Running with a nonexistent CSV should fail with non-zero exit code."""
         result = subprocess.run(
@@ -56,5 +435,149 @@ class TestIntegration(unittest.TestCase):
         self.assertNotEqual(result.returncode, 0)
 
 
+class TestStartup(unittest.TestCase):
+    """Import-time budget and the --server job loop."""
+
+    # Modules only specific flags may pull in
+    LAZY_MODULES = ("asyncio", "numpy", "concurrent.futures", "multiprocessing",
+                    "tracemalloc", "hashlib", "lib.backtest", "lib.batch", "lib.cache",
+                    "lib.colfile", "lib.grouped", "lib.incremental", "lib.live",
+                    "lib.mmap_reader", "lib.numpy_backend", "lib.resample",
+                    "lib.results_cache")
+
+    # Total import time of the lib modules main.py imports, in microseconds
+    IMPORT_BUDGET_US = 60000
+
+    OUTPUT_FILE = "test_output_startup.json"
+
+    def tearDown(self):
+        if os.path.exists(self.OUTPUT_FILE):
+            os.unlink(self.OUTPUT_FILE)
+
+    def _import_times(self, *args):
+        """Run main.py under -X importtime; return {module: (cumulative us, depth)}."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "src/main.py", "src/data/sample.csv",
+             "-o", self.OUTPUT_FILE, *args],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip())) // 2
+            times[name.strip()] = (int(cumulative), depth)
+        return times
+
+    def test_lazy_modules_not_imported(self):
+        for args in ((), ("--stream",), ("--events-only",), ("--format", "jsonl"),
+                     ("--indicators", "rsi,macd")):
+            with self.subTest(args=args):
+                imported = self._import_times(*args)
+                loaded = [m for m in self.LAZY_MODULES
+                          if any(name == m or name.startswith(m + ".") for name in imported)]
+                self.assertEqual(loaded, [])
+
+    def test_import_budget(self):
+        # Best of three runs, to keep a busy machine from failing the test
+        totals = []
+        for _ in range(3):
+            imported = self._import_times()
+            totals.append(sum(us for name, (us, depth) in imported.items()
+                              if depth == 0 and name.startswith("lib.")))
+        self.assertLess(min(totals), self.IMPORT_BUDGET_US)
+
+    def test_parser_defaults_match_lazy_modules(self):
+        sys.path.insert(0, "src")
+        try:
+            import main
+            from lib.cache import DEFAULT_MAX_BYTES
+            from lib.live import DEFAULT_QUEUE_SIZE
+        finally:
+            sys.path.remove("src")
+        self.assertEqual(main.DEFAULT_CACHE_MAX_MB << 20, DEFAULT_MAX_BYTES)
+        self.assertEqual(main.DEFAULT_QUEUE_SIZE, DEFAULT_QUEUE_SIZE)
+
+    def test_server_mode_runs_jobs(self):
+        jobs = "\n".join([
+            f"src/data/sample.csv -o {self.OUTPUT_FILE}",
+            "# comment lines and blank lines are skipped",
+            "",
+            f"src/data/sample.csv -o {self.OUTPUT_FILE} --events-only",
+            "/nonexistent/file.csv",
+            "--no-such-flag",
+            "--server",
+        ]) + "\n"
+        result = subprocess.run(
+            [sys.executable, "src/main.py", "--server"],
+            input=jobs, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        results = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["exit_code"] for r in results], [0, 0, 1, 2, 2])
+        self.assertIn("Signals: 6 BUY, 4 SELL, 16 HOLD, 14 pending", results[0]["stdout"])
+        self.assertIn("signal change events", results[1]["stdout"])
+        self.assertIn("CSV file not found", results[2]["stderr"])
+        self.assertFalse(results[3]["ok"])
+
+
+@unittest.skipIf(resource is None or not hasattr(os, "mkfifo"),
+                 "needs POSIX resource limits and named pipes")
+class TestStreamingMemoryCap(unittest.TestCase):
+    """Run --stream over a synthetic input fed through a named pipe.
+
+    The input never touches the disk and the child process runs under an
+    address-space cap, so a pass proves memory stays flat. The default input
+    is small to keep the suite fast; set RSI_STREAM_TEST_MB=4096 to push a
+    multi-GB series through the same test.
+    """
+
+    MEMORY_CAP = 64 * 1024 * 1024
+
+    def _feed(self, fifo_path, target_bytes):
+        rng = random.Random(0)
+        try:
+            with open(fifo_path, "w") as f:
+                f.write("date,open,high,low,close,volume\n")
+                written = 0
+                price = 100.0
+                while written < target_bytes:
+                    lines = []
+                    for _ in range(1000):
+                        price = max(1.0, price + rng.uniform(-1.0, 1.0))
+                        lines.append(f"2024-01-02,{price:.2f},{price:.2f},"
+                                     f"{price:.2f},{price:.2f},1000000\n")
+                    chunk = "".join(lines)
+                    f.write(chunk)
+                    written += len(chunk)
+        except BrokenPipeError:
+            pass
+
+    def test_stream_under_memory_cap(self):
+        target_mb = int(os.environ.get("RSI_STREAM_TEST_MB", "4"))
+        tmpdir = tempfile.mkdtemp()
+        fifo_path = os.path.join(tmpdir, "feed.csv")
+        os.mkfifo(fifo_path)
+        self.addCleanup(os.rmdir, tmpdir)
+        self.addCleanup(os.unlink, fifo_path)
+
+        feeder = threading.Thread(target=self._feed, args=(fifo_path, target_mb << 20),
+                                  daemon=True)
+        feeder.start()
+
+        def limit_memory():
+            resource.setrlimit(resource.RLIMIT_AS, (self.MEMORY_CAP, self.MEMORY_CAP))
+
+        result = subprocess.run(
+            [sys.executable, "src/main.py", fifo_path, "-o", os.devnull, "--stream"],
+            capture_output=True, text=True, preexec_fn=limit_memory
+        )
+        feeder.join(timeout=10)
+        self.assertEqual(result.returncode, 0, f"Script failed: {result.stderr}")
+        self.assertIn("Signals:", result.stdout)
+
+
 if __name__ == "__main__":
     unittest.main()
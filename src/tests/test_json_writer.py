@@ -7,7 +7,7 @@ import tempfile
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from lib.json_writer import write_json
+from lib.json_writer import SignalRowWriter, write_json, write_signal_rows
 
 
 class TestJsonWriter(unittest.TestCase):
@@ -79,6 +79,113 @@ class TestJsonWriter(unittest.TestCase):
             if os.path.exists(path):
                 os.unlink(path)
 
+    def test_byte_identical_to_json_dump(self):
+        """Streaming output must match json.dump(records, f, indent=2) exactly."""
+        records = [
+            {"date": "2024-01-01", "close": 100.0, "rsi": None, "signal": None},
+            {"date": "2024-01-02", "close": 101.25, "rsi": 72.31, "signal": "SELL"},
+        ]
+        path = tempfile.mktemp(suffix=".json")
+        try:
+            for subset in (records, records[:1], []):
+                write_json(iter(subset), path)
+                with open(path) as f:
+                    self.assertEqual(f.read(), json.dumps(subset, indent=2))
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+class TestOutputFormats(unittest.TestCase):
+
+    ROWS = [
+        ("2024-01-01", 100.0, None, None),
+        ("2024-01-02", 101.25, 72.31, "SELL"),
+        ("2024-01-03", 99.5, 29.0, "BUY"),
+        ("2024-01-04", float("nan"), 50.0, "HOLD"),
+        ("2024-01-05", 1e-07, 100.0, "SELL"),
+    ]
+
+    def _dicts(self, rows):
+        return [dict(zip(("date", "close", "rsi", "signal"), row)) for row in rows]
+
+    def _write(self, writer, records, **kwargs):
+        path = tempfile.mktemp()
+        try:
+            writer(records, path, **kwargs)
+            with open(path) as f:
+                return f.read()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def test_signal_rows_match_json_module(self):
+        for rows in (self.ROWS, self.ROWS[:1], []):
+            expected = {
+                ("json", False): json.dumps(self._dicts(rows), indent=2),
+                ("json", True): json.dumps(self._dicts(rows), separators=(",", ":")),
+                ("jsonl", False): "".join(json.dumps(d) + "\n" for d in self._dicts(rows)),
+                ("jsonl", True): "".join(json.dumps(d, separators=(",", ":")) + "\n"
+                                         for d in self._dicts(rows)),
+            }
+            for (fmt, compact), text in expected.items():
+                with self.subTest(fmt=fmt, compact=compact, n=len(rows)):
+                    self.assertEqual(self._write(write_signal_rows, rows, fmt=fmt,
+                                                 compact=compact), text)
+                    self.assertEqual(self._write(write_json, self._dicts(rows), fmt=fmt,
+                                                 compact=compact), text)
+
+    def test_default_is_indented_array(self):
+        self.assertEqual(self._write(write_signal_rows, self.ROWS),
+                         json.dumps(self._dicts(self.ROWS), indent=2))
+
+    def test_jsonl_one_record_per_line(self):
+        raw = self._write(write_signal_rows, self.ROWS, fmt="jsonl", compact=True)
+        lines = raw.splitlines()
+        self.assertEqual(len(lines), len(self.ROWS))
+        self.assertEqual(json.loads(lines[1])["signal"], "SELL")
+        self.assertNotIn(" ", raw)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_signal_rows(self.ROWS, os.devnull, fmt="xml")
+
+    def test_resumed_writer_appends_rows(self):
+        for fmt in ("json", "jsonl"):
+            for compact in (False, True):
+                for split in (0, 2, len(self.ROWS)):
+                    with self.subTest(fmt=fmt, compact=compact, split=split):
+                        expected = self._write(write_signal_rows, self.ROWS, fmt=fmt,
+                                               compact=compact)
+                        with tempfile.TemporaryDirectory() as tmpdir:
+                            path = os.path.join(tmpdir, "out")
+                            write_signal_rows(self.ROWS[:split], path, fmt, compact)
+                            with SignalRowWriter(path, fmt, compact, split) as writer:
+                                writer.write_rows(self.ROWS[split:])
+                            self.assertEqual(writer.count, len(self.ROWS))
+                            with open(path) as f:
+                                self.assertEqual(f.read(), expected)
+
+    def test_error_removes_partial_output(self):
+        for fmt in ("json", "jsonl"):
+            with self.subTest(fmt=fmt), tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "out")
+                with self.assertRaisesRegex(ValueError, "bad row"):
+                    with SignalRowWriter(path, fmt) as writer:
+                        writer.write_rows(self.ROWS)
+                        raise ValueError("bad row")
+                self.assertFalse(os.path.exists(path))
+
+    def test_resume_rejects_unfinished_output(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "out.json")
+            with open(path, "w") as f:
+                f.write('[\n  {"date": "2024-01-01"}')
+            with self.assertRaises(ValueError):
+                SignalRowWriter(path, resume_count=1)
+            with self.assertRaises(FileNotFoundError):
+                SignalRowWriter(os.path.join(tmpdir, "missing.json"), resume_count=0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,273 @@
+"""Tests for the asyncio live-feed service."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.live import (LatencyStats, LiveSignalService, follow_file, parse_tick,
+                      run_live, serve_tcp, synthetic_feed)
+from lib.rsi import calculate_rsi
+from lib.signals import generate_signals
+
+HEADER = "date,open,high,low,close,volume\n"
+
+
+def _row(i, close):
+    return f"2024-01-{i:02d},{close},{close},{close},{close},1000\n"
+
+
+class _Collector:
+    """on_signal callback grouping emitted events by symbol."""
+
+    def __init__(self):
+        self.events = {}
+
+    def __call__(self, event):
+        self.events.setdefault(event[0], []).append(event[1:])
+
+
+class TestLiveSignalService(unittest.TestCase):
+
+    def test_matches_batch_pipeline_per_symbol(self):
+        collector = _Collector()
+
+        async def run():
+            service = LiveSignalService(on_signal=collector)
+            sent = await synthetic_feed(service, symbols=5, ticks_per_symbol=60, seed=3)
+            await service.close()
+            return service, sent
+
+        service, sent = asyncio.run(run())
+        self.assertEqual(sent, 300)
+        self.assertEqual(service.ticks, 300)
+        self.assertEqual(sorted(service.symbols), [f"SYM{i:05d}" for i in range(5)])
+        for symbol, events in collector.events.items():
+            closes = [close for _, close, _, _ in events]
+            rsi = calculate_rsi(closes)
+            self.assertEqual([r for _, _, r, _ in events], rsi)
+            self.assertEqual([s for _, _, _, s in events], generate_signals(rsi))
+            self.assertEqual([d for d, _, _, _ in events],
+                             [f"T{i:08d}" for i in range(60)])
+
+    def test_bounded_queue_applies_backpressure(self):
+        seen = []
+
+        async def run():
+            service = LiveSignalService(queue_size=3)
+            service.on_signal = lambda event: seen.append(service._queues["A"].qsize())
+            for i in range(50):
+                await service.submit("A", str(i), 100.0 + i % 7)
+                self.assertLessEqual(service._queues["A"].qsize(), 3)
+            await service.close()
+            return service
+
+        service = asyncio.run(run())
+        self.assertEqual(service.ticks, 50)
+        self.assertLessEqual(max(seen), 3)
+
+    def test_failing_on_signal_does_not_stall(self):
+        def on_signal(event):
+            if event[1] == "3":
+                raise OSError("disk full")
+
+        async def run(on_error):
+            service = LiveSignalService(queue_size=2, on_signal=on_signal,
+                                        on_error=on_error)
+            for i in range(20):
+                await service.submit("A", str(i), 100.0 + i % 7)
+            await service.drain()
+            try:
+                await service.close()
+            finally:
+                self.assertEqual(service.ticks, 19)
+
+        with self.assertRaisesRegex(OSError, "disk full"):
+            asyncio.run(asyncio.wait_for(run(None), 10))
+        errors = []
+        asyncio.run(asyncio.wait_for(run(lambda *args: errors.append(args[:2])), 10))
+        self.assertEqual(errors, [("A", "3")])
+
+    def test_state_round_trip_resumes(self):
+        closes = [100.0 + (i * 7) % 11 for i in range(40)]
+        first, resumed = _Collector(), _Collector()
+
+        async def run():
+            service = LiveSignalService(on_signal=first)
+            for i, close in enumerate(closes[:25]):
+                await service.submit("A", str(i), close)
+            await service.close()
+
+            restarted = LiveSignalService(on_signal=resumed)
+            restarted.restore(service.state())
+            for i, close in enumerate(closes[25:], 25):
+                await restarted.submit("A", str(i), close)
+            await restarted.close()
+
+        asyncio.run(run())
+        rsi = [r for _, _, r, _ in first.events["A"] + resumed.events["A"]]
+        self.assertEqual(rsi, calculate_rsi(closes))
+
+    def test_stats_report_latency(self):
+        async def run():
+            service = LiveSignalService()
+            await synthetic_feed(service, symbols=20, ticks_per_symbol=10)
+            await service.close()
+            return service.stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats["ticks"], 200)
+        self.assertEqual(stats["symbols"], 20)
+        self.assertLessEqual(stats["p50"], stats["p99"])
+
+
+class TestLatencyStats(unittest.TestCase):
+
+    def test_percentiles(self):
+        stats = LatencyStats()
+        self.assertIsNone(stats.percentile(0.5))
+        for i in range(1, 101):
+            stats.add(i / 1000)
+        self.assertEqual(stats.percentile(0.5), 0.051)
+        self.assertEqual(stats.percentile(0.99), 0.1)
+
+    def test_sample_cap_overwrites_oldest(self):
+        stats = LatencyStats(max_samples=10)
+        for i in range(25):
+            stats.add(float(i))
+        self.assertEqual(stats.count, 25)
+        self.assertEqual(len(stats._samples), 10)
+        self.assertGreaterEqual(stats.percentile(0.0), 15.0)
+
+
+class TestSources(unittest.TestCase):
+
+    def test_parse_tick(self):
+        self.assertEqual(parse_tick("AAPL,2024-01-02,1,2,0.5,1.5,100\n"),
+                         ("AAPL", "2024-01-02", 1.5))
+        with self.assertRaises(ValueError):
+            parse_tick("AAPL,2024-01-02,1.5\n")
+        with self.assertRaises(ValueError):
+            parse_tick("AAPL,2024-01-02,1,2,0.5,abc,100\n")
+
+    def test_tcp_clients_feed_service(self):
+        collector = _Collector()
+        errors = []
+
+        async def run():
+            service = LiveSignalService(on_signal=collector)
+            server = await serve_tcp(service, on_error=lambda line, e: errors.append(line))
+            port = server.sockets[0].getsockname()[1]
+            for symbol in ("A", "B"):
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                lines = [f"{symbol},d{i},1,1,1,{100 + i},10\n" for i in range(20)]
+                lines.insert(5, "garbage\n")
+                writer.write("".join(lines).encode())
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            while service.ticks < 40:
+                await asyncio.sleep(0.01)
+            server.close()
+            await server.wait_closed()
+            await service.close()
+
+        asyncio.run(asyncio.wait_for(run(), 10))
+        self.assertEqual(sorted(collector.events), ["A", "B"])
+        self.assertEqual([c for _, c, _, _ in collector.events["A"]],
+                         [100.0 + i for i in range(20)])
+        self.assertEqual(errors, ["garbage\n", "garbage\n"])
+
+    def test_follow_file_picks_up_appended_rows(self):
+        collector = _Collector()
+        closes = [100.0 + (i * 3) % 5 for i in range(30)]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "EURUSD.csv")
+            with open(path, "w") as f:
+                f.write(HEADER + "".join(_row(i, c) for i, c in enumerate(closes[:10])))
+
+            async def run():
+                service = LiveSignalService(on_signal=collector)
+                stop = asyncio.Event()
+                task = asyncio.create_task(
+                    follow_file(service, path, poll_interval=0.01, stop=stop))
+                await asyncio.sleep(0.05)
+                with open(path, "a") as f:
+                    for i, close in enumerate(closes[10:], 10):
+                        line = _row(i, close)
+                        # Write a partial line first: it must wait for its newline
+                        f.write(line[:8])
+                        f.flush()
+                        await asyncio.sleep(0.02)
+                        f.write(line[8:])
+                        f.flush()
+                while service.ticks < len(closes):
+                    await asyncio.sleep(0.01)
+                stop.set()
+                await task
+                await service.close()
+
+            asyncio.run(asyncio.wait_for(run(), 10))
+
+        events = collector.events["EURUSD"]
+        self.assertEqual([c for _, c, _, _ in events], closes)
+        self.assertEqual([r for _, _, r, _ in events], calculate_rsi(closes))
+
+    def test_follow_file_skips_malformed_lines(self):
+        collector = _Collector()
+        errors = []
+        closes = [100.0 + (i * 3) % 5 for i in range(20)]
+        lines = [_row(i, c) for i, c in enumerate(closes)]
+        lines[4:4] = ["garbage\n", _row(99, "abc")]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "EURUSD.csv")
+            with open(path, "w") as f:
+                f.write(HEADER + "".join(lines))
+
+            async def run():
+                service = LiveSignalService(on_signal=collector)
+                stop = asyncio.Event()
+                stop.set()
+                await follow_file(service, path, poll_interval=0.01, stop=stop,
+                                  on_error=lambda line, e: errors.append(line))
+                await service.close()
+
+            asyncio.run(asyncio.wait_for(run(), 10))
+
+        self.assertEqual(errors, lines[4:6])
+        self.assertEqual([c for _, c, _, _ in collector.events["EURUSD"]], closes)
+
+    def test_follow_file_errors(self):
+        async def run(path):
+            await follow_file(LiveSignalService(), path)
+
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(run("/nonexistent/feed.csv"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bad.csv")
+            with open(path, "w") as f:
+                f.write("date,close\n")
+            with self.assertRaises(ValueError):
+                asyncio.run(run(path))
+
+    def test_run_live_stops_on_follower_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bad = os.path.join(tmpdir, "bad.csv")
+            with open(bad, "w") as f:
+                f.write("date,close\n")
+            output = os.path.join(tmpdir, "signals.jsonl")
+            for path, error in ((os.path.join(tmpdir, "missing.csv"), FileNotFoundError),
+                                (bad, ValueError)):
+                for duration in (None, 60):
+                    with self.subTest(path=path, duration=duration):
+                        with self.assertRaises(error):
+                            asyncio.run(asyncio.wait_for(
+                                run_live(output, follow=[path], duration=duration), 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
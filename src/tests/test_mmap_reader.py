@@ -0,0 +1,131 @@
+"""Tests for the memory-mapped single-column CSV scanner."""
+
+import os
+import sys
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench.synthetic import write_csv
+from lib import mmap_reader
+from lib.csv_reader import read_csv_columns
+from lib.mmap_reader import scan_column
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+HEADER = "date,open,high,low,close,volume\n"
+
+
+class TestScanColumn(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write_csv(self, content, name="data.csv"):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(content)
+        return path
+
+    def test_matches_csv_reader_on_sample(self):
+        for column in ("open", "high", "low", "close", "volume"):
+            with self.subTest(column=column):
+                values = scan_column(SAMPLE, column)
+                self.assertIsInstance(values, array)
+                self.assertEqual(values.typecode, "d")
+                self.assertEqual(values, read_csv_columns(SAMPLE, (column,))[column])
+
+    def test_many_small_blocks(self):
+        path = write_csv(os.path.join(self.tmpdir.name, "synthetic.csv"), 2000, seed=3)
+        expected = read_csv_columns(path, ("close",))["close"]
+        for block_size in (1, 50, 977, 1 << 20):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(scan_column(path, block_size=block_size), expected)
+
+    def test_parallel_ranges_match(self):
+        path = write_csv(os.path.join(self.tmpdir.name, "synthetic.csv"), 3000, seed=8)
+        expected = scan_column(path)
+        with mock.patch.object(mmap_reader, "MIN_PARALLEL_BYTES", 0):
+            self.assertEqual(scan_column(path, workers=3, block_size=4096), expected)
+
+    def test_layout_variants(self):
+        rows = [("2024-01-01", 1.5), ("2024-01-02", 2.25), ("2024-01-03", 3.0)]
+        variants = {
+            "crlf_blank_lines": HEADER.replace("\n", "\r\n") + "\r\n".join(
+                f"{d},1,2,0.5,{c},10" for d, c in rows) + "\r\n\r\n",
+            "no_trailing_newline": HEADER + "\n\n".join(
+                f"{d},1,2,0.5,{c},10" for d, c in rows),
+            "close_last": "date,open,high,low,volume,close\n" + "".join(
+                f"{d},1,2,0.5,10,{c}\n" for d, c in rows),
+            "quoted": HEADER + "".join(
+                f'"{d}",1,2,0.5,"{c}",10\n' for d, c in rows),
+            "extra_column": "symbol,date,open,high,low,close,volume\n" + "".join(
+                f"X,{d},1,2,0.5,{c},10\n" for d, c in rows),
+        }
+        for name, content in variants.items():
+            with self.subTest(variant=name):
+                path = self._write_csv(content, name + ".csv")
+                for block_size in (8, mmap_reader.DEFAULT_BLOCK_SIZE):
+                    self.assertEqual(list(scan_column(path, block_size=block_size)),
+                                     [c for _, c in rows])
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            scan_column("/nonexistent/file.csv")
+
+    def test_empty_and_header_only(self):
+        with self.assertRaisesRegex(ValueError, "empty"):
+            scan_column(self._write_csv(""))
+        with self.assertRaisesRegex(ValueError, "no data rows"):
+            scan_column(self._write_csv(HEADER + "\n"))
+
+    def test_missing_columns(self):
+        with self.assertRaisesRegex(ValueError, "missing required columns"):
+            scan_column(self._write_csv("date,close\n2024-01-01,1.0\n"))
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            scan_column(SAMPLE, "date")
+        with self.assertRaises(ValueError):
+            scan_column(SAMPLE, "price")
+
+    def test_bad_value_reports_line(self):
+        path = self._write_csv(HEADER + "2024-01-01,1,2,0.5,1.5,10\n\n"
+                               "2024-01-02,1,2,0.5,abc,10\n")
+        with self.assertRaisesRegex(ValueError, "'abc' on line 4"):
+            scan_column(path)
+
+    def test_field_counts_match_csv_reader(self):
+        # read_csv ignores extra trailing fields and a missing non-OHLCV column
+        for name, content in (
+                ("trailing", HEADER + "2024-01-01,1,2,0.5,1.5,10,7\n"
+                             "2024-01-02,1,2,0.5,2.5,10\n"
+                             "2024-01-03,1,2,0.5,3.5,10,7,8,9,1,2\n"),
+                ("short_note", HEADER.replace("\n", ",note\n")
+                               + "2024-01-01,1,2,0.5,1.5,10,a\n"
+                               "2024-01-02,1,2,0.5,2.5,10\n")):
+            with self.subTest(variant=name):
+                path = self._write_csv(content, name + ".csv")
+                expected = read_csv_columns(path, ("close",))["close"]
+                for block_size in (8, mmap_reader.DEFAULT_BLOCK_SIZE):
+                    self.assertEqual(scan_column(path, block_size=block_size), expected)
+
+    def test_wrong_field_count_reports_line(self):
+        for rows, message in (
+                (["2024-01-02,1,2,1.5,10"], "line 3 has 5 fields"),
+                (["X"], "line 3 has 1 fields"),
+                # Two rows glued into one field-count-aligned line
+                (["2024-01-02,1,2,0.5,2.5,10,2024-01-03,1,2,0.5,3.5", "X"],
+                 "line 4 has 1 fields")):
+            with self.subTest(rows=rows):
+                path = self._write_csv(HEADER + "2024-01-01,1,2,0.5,1.5,10\n"
+                                       + "".join(row + "\n" for row in rows)
+                                       + "2024-01-09,1,2,0.5,1.5,10\n")
+                with self.assertRaisesRegex(ValueError, message):
+                    scan_column(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
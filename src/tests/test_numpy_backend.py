@@ -0,0 +1,116 @@
+"""Parity tests: NumPy RSI backend against the pure-Python reference."""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.rsi import calculate_rsi
+
+try:
+    import numpy as np
+    from lib import numpy_backend
+except ImportError:
+    np = None
+
+
+def _random_walk(n, seed, start=100.0):
+    rng = random.Random(seed)
+    prices = []
+    price = start
+    for _ in range(n):
+        prices.append(price)
+        price = max(0.01, price + rng.gauss(0, 1))
+    return prices
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpyBackendParity(unittest.TestCase):
+
+    def assertMatchesReference(self, prices, period=14):
+        expected = calculate_rsi(prices, period)
+        actual = numpy_backend.calculate_rsi(prices, period)
+        self.assertEqual(len(actual), len(expected))
+        for i, (e, a) in enumerate(zip(expected, actual.tolist())):
+            if e is None:
+                self.assertTrue(math.isnan(a), f"index {i} should be NaN")
+            else:
+                self.assertAlmostEqual(a, e, delta=numpy_backend.FAST_MAX_ABS_ERROR,
+                                       msg=f"index {i}")
+
+    def test_returns_array_with_nan_warmup(self):
+        rsi = numpy_backend.calculate_rsi(np.arange(20, dtype=float) + 100.0)
+        self.assertIsInstance(rsi, np.ndarray)
+        self.assertTrue(np.isnan(rsi[:14]).all())
+        self.assertFalse(np.isnan(rsi[14:]).any())
+
+    def test_short_series_all_nan(self):
+        for n in range(0, 15):
+            rsi = numpy_backend.calculate_rsi([100.0 + i for i in range(n)])
+            self.assertEqual(len(rsi), n)
+            self.assertTrue(np.isnan(rsi).all())
+
+    def test_edge_cases_match(self):
+        self.assertMatchesReference([100.0 + i * 2.0 for i in range(40)])
+        self.assertMatchesReference([200.0 - i * 2.0 for i in range(40)])
+        self.assertMatchesReference([50.0] * 40)
+
+    def test_sample_data_matches(self):
+        from lib.csv_reader import read_csv
+        sample = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+        self.assertMatchesReference([row["close"] for row in read_csv(sample)])
+
+    def test_random_walks_match_across_periods(self):
+        for period in (1, 2, 3, 7, 14, 21, 50):
+            for n in (period + 1, period + 2, 100, 2500):
+                with self.subTest(period=period, n=n):
+                    self.assertMatchesReference(_random_walk(n, seed=n * period), period)
+
+    def test_long_series_spans_many_blocks(self):
+        n = numpy_backend.MAX_BLOCK * 20 + 7
+        self.assertMatchesReference(_random_walk(n, seed=1))
+
+    def test_matrix_columns_match_reference(self):
+        prices = _random_walk(600, seed=11)
+        periods = [2, 7, 14, 21, 50, 700]
+        matrix = numpy_backend.calculate_rsi_matrix(prices, periods)
+        self.assertEqual(matrix.shape, (600, len(periods)))
+        for j, period in enumerate(periods):
+            expected = np.array([np.nan if v is None else v
+                                 for v in calculate_rsi(prices, period)])
+            np.testing.assert_allclose(matrix[:, j], expected, rtol=0, atol=1e-9)
+
+    def test_exact_mode_is_bit_identical(self):
+        for period in (1, 2, 14, 50):
+            prices = _random_walk(5000, seed=period)
+            expected = np.array([np.nan if v is None else v
+                                 for v in calculate_rsi(prices, period)])
+            with self.subTest(period=period):
+                actual = numpy_backend.calculate_rsi(prices, period, exact=True)
+                self.assertEqual(actual.tobytes(), expected.tobytes())
+                matrix = numpy_backend.calculate_rsi_matrix(prices, [period, 3], exact=True)
+                self.assertEqual(matrix[:, 0].tobytes(), expected.tobytes())
+
+    def test_long_flat_stretch_within_fast_bound(self):
+        # Averages decay toward the subnormal range over ~10,000 flat bars,
+        # where the block scan alone would be off by up to 50 RSI points
+        prices = [100.0, 101.0] + [100.0] * 12000 + _random_walk(2000, seed=3)
+        self.assertMatchesReference(prices)
+        self.assertMatchesReference([p * 1e-300 for p in _random_walk(3000, seed=4)])
+
+    def test_signal_codes_match_generate_signals(self):
+        from lib.signals import SIGNAL_NAMES, generate_signals
+        rsi = calculate_rsi(_random_walk(300, seed=5))
+        array = np.array([np.nan if v is None else v for v in rsi])
+        stacked = np.column_stack([array, array])
+        codes = numpy_backend.signal_codes(stacked, [30, 20], [70, 80])
+        self.assertEqual(codes.dtype, np.int8)
+        for j, (lower, upper) in enumerate([(30, 70), (20, 80)]):
+            names = [SIGNAL_NAMES[c] for c in codes[:, j].tolist()]
+            self.assertEqual(names, generate_signals(rsi, lower, upper))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the pipeline runners."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.pipeline import run_in_memory, run_streaming, run_sweep
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestPipeline(unittest.TestCase):
+
+    def _output_path(self):
+        path = tempfile.mktemp(suffix=".json")
+        self.addCleanup(lambda: os.path.exists(path) and os.unlink(path))
+        return path
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_in_memory_counts(self):
+        rows, counts = run_in_memory(SAMPLE, self._output_path())
+        self.assertEqual(rows, 40)
+        self.assertEqual(counts, {"BUY": 6, "SELL": 4, "HOLD": 16, None: 14})
+
+    def test_streaming_is_byte_identical(self):
+        expected_path = self._output_path()
+        expected = run_in_memory(SAMPLE, expected_path)
+        # Chunk sizes around the 14-bar warm-up exercise every boundary case
+        for chunk_size in (1, 2, 13, 14, 15, 39, 40, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                path = self._output_path()
+                self.assertEqual(run_streaming(SAMPLE, path, chunk_size), expected)
+                self.assertEqual(self._read(path), self._read(expected_path))
+
+    def test_streaming_errors_leave_no_output(self):
+        path = self._output_path()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("date,open,high,low,close,volume\n")
+        self.addCleanup(os.unlink, f.name)
+        with self.assertRaises(ValueError):
+            run_streaming(f.name, path)
+        with self.assertRaises(FileNotFoundError):
+            run_streaming("/nonexistent/file.csv", path)
+        self.assertFalse(os.path.exists(path))
+
+    def test_sweep_matches_single_runs(self):
+        single_path = self._output_path()
+        _, single_counts = run_in_memory(SAMPLE, single_path)
+        path = self._output_path()
+        rows, sweep_counts = run_sweep(SAMPLE, path, [7, 14], [(30, 70), (20, 80)])
+        self.assertEqual(rows, 40)
+        self.assertEqual(list(sweep_counts), [(7, 30, 70), (7, 20, 80), (14, 30, 70),
+                                              (14, 20, 80)])
+        self.assertEqual(sweep_counts[14, 30, 70], single_counts)
+
+        with open(single_path) as f:
+            single = json.load(f)
+        with open(path) as f:
+            sweep = json.load(f)
+        self.assertEqual(set(sweep[0]), {"date", "close", "rsi_7", "rsi_14",
+                                         "signal_7_30_70", "signal_7_20_80",
+                                         "signal_14_30_70", "signal_14_20_80"})
+        for a, b in zip(single, sweep):
+            self.assertEqual(a["rsi"], b["rsi_14"])
+            self.assertEqual(a["signal"], b["signal_14_30_70"])
+
+
+if __name__ == "__main__":
+    unittest.main()
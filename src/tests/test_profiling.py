@@ -0,0 +1,97 @@
+"""Tests for the per-stage profiler."""
+
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.pipeline import run_in_memory, run_streaming
+from lib.profiling import NULL_PROFILER, StageProfiler
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def _profiler(self, **kwargs):
+        profiler = StageProfiler(**kwargs)
+        self.addCleanup(profiler.stop)
+        return profiler
+
+    def _tmp_path(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_records_stage_metrics(self):
+        profiler = self._profiler()
+        with profiler.stage("build") as stats:
+            data = [str(i) for i in range(20000)]
+            stats["rows"] = len(data)
+        (metrics,) = profiler.metrics()
+        self.assertEqual(metrics["stage"], "build")
+        self.assertEqual(metrics["rows"], 20000)
+        self.assertGreater(metrics["wall_seconds"], 0)
+        self.assertGreaterEqual(metrics["cpu_seconds"], 0)
+        self.assertGreater(metrics["rows_per_second"], 0)
+        self.assertGreater(metrics["peak_bytes"], 20000 * 40)
+
+    def test_repeated_stage_accumulates(self):
+        profiler = self._profiler()
+        for _ in range(3):
+            with profiler.stage("chunk") as stats:
+                stats["rows"] = 10
+        self.assertEqual(profiler.metrics()[0]["rows"], 30)
+
+    def test_without_memory_tracing(self):
+        profiler = self._profiler(trace_memory=False)
+        with profiler.stage("fast"):
+            pass
+        self.assertIsNone(profiler.metrics()[0]["peak_bytes"])
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIn("-", profiler.format_table())
+
+    def test_write_json_and_prometheus(self):
+        profiler = self._profiler()
+        with profiler.stage("read") as stats:
+            stats["rows"] = 5
+        json_path = self._tmp_path()
+        profiler.write_metrics(json_path, "json")
+        with open(json_path) as f:
+            self.assertEqual(json.load(f)["stages"][0]["rows"], 5)
+
+        prom_path = self._tmp_path()
+        profiler.write_metrics(prom_path, "prometheus")
+        with open(prom_path) as f:
+            text = f.read()
+        self.assertIn("# TYPE rsi_pipeline_stage_wall_seconds gauge", text)
+        self.assertIn('rsi_pipeline_stage_rows{stage="read"} 5', text)
+        with self.assertRaises(ValueError):
+            profiler.write_metrics(prom_path, "xml")
+
+    def test_null_profiler_is_a_no_op(self):
+        with NULL_PROFILER.stage("anything") as stats:
+            stats["rows"] = 1
+        self.assertFalse(NULL_PROFILER.enabled)
+
+    def test_pipeline_stages(self):
+        output = self._tmp_path()
+        profiler = self._profiler()
+        run_in_memory(SAMPLE, output, profiler=profiler)
+        self.assertEqual([m["stage"] for m in profiler.metrics()],
+                         ["read", "rsi", "signals", "records", "write"])
+        self.assertTrue(all(m["rows"] == 40 for m in profiler.metrics()))
+
+        profiler = self._profiler(trace_memory=False)
+        run_streaming(SAMPLE, output, chunk_size=16, profiler=profiler)
+        stages = {m["stage"]: m for m in profiler.metrics()}
+        self.assertEqual(set(stages), {"read", "rsi+signals", "write"})
+        self.assertEqual(stages["write"]["rows"], 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Tests for timeframe resampling."""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench.synthetic import write_csv
+from lib.csv_reader import COLUMN_ORDER, ParseErrors, read_csv_columns
+from lib.resample import (Resampler, date_to_seconds, parse_timeframe, parse_timeframes,
+                          resample_columns, run_resampled, timeframe_path)
+from lib.rsi import calculate_rsi
+from lib.signals import generate_signals
+
+
+def naive_resample(columns, step):
+    """Reference: group rows by bucket with a dict."""
+    bars = {}
+    for i, date in enumerate(columns["date"]):
+        bucket = date_to_seconds(date) // step
+        o, h, l, c, v = (columns[name][i] for name in COLUMN_ORDER[1:])
+        if bucket not in bars:
+            bars[bucket] = [o, h, l, c, v]
+        else:
+            bar = bars[bucket]
+            bar[1], bar[2], bar[3] = max(bar[1], h), min(bar[2], l), c
+            bar[4] += v
+    return bars
+
+
+class TestTimeframes(unittest.TestCase):
+
+    def test_parse_timeframe(self):
+        self.assertEqual([parse_timeframe(t) for t in ("30s", "5m", "1h", "2d")],
+                         [30, 300, 3600, 172800])
+        for bad in ("", "m", "0m", "5", "5x", "-5m", "1.5h"):
+            with self.subTest(bad=bad), self.assertRaisesRegex(ValueError, "Invalid timeframe"):
+                parse_timeframe(bad)
+
+    def test_parse_timeframes(self):
+        self.assertEqual(parse_timeframes("5m, 1h,1d"), ["5m", "1h", "1d"])
+        with self.assertRaisesRegex(ValueError, "are the same"):
+            parse_timeframes("60m,1h")
+
+    def test_date_to_seconds(self):
+        self.assertEqual(date_to_seconds("1970-01-02"), 86400)
+        self.assertEqual(date_to_seconds("1970-01-01 01:00:30"), 3630)
+        self.assertEqual(date_to_seconds("1970-01-01T02:00:00+01:00"), 3600)
+
+    def test_timeframe_path(self):
+        self.assertEqual(timeframe_path(os.path.join("a", "out.json"), "5m"),
+                         os.path.join("a", "out_5m.json"))
+
+
+class TestResampler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.csv_path = os.path.join(self.tmpdir.name, "minutes.csv")
+        write_csv(self.csv_path, 3000)
+        self.columns = read_csv_columns(self.csv_path)
+
+    def test_hand_computed(self):
+        columns = {"date": ["2024-01-02 09:30:00", "2024-01-02 09:31:00",
+                            "2024-01-02 09:36:00", "2024-01-02 09:39:59"],
+                   "open": [1.0, 2.0, 3.0, 4.0], "high": [5.0, 9.0, 6.0, 4.5],
+                   "low": [0.5, 1.5, 2.5, 0.25], "close": [2.0, 3.0, 4.0, 5.0],
+                   "volume": [10.0, 20.0, 30.0, 40.0]}
+        bars = resample_columns(columns, ["5m", "1d"])
+        self.assertEqual(bars["5m"]["date"], ["2024-01-02 09:30:00", "2024-01-02 09:35:00"])
+        self.assertEqual([list(bars["5m"][name]) for name in COLUMN_ORDER[1:]],
+                         [[1.0, 3.0], [9.0, 6.0], [0.5, 0.25], [3.0, 5.0], [30.0, 70.0]])
+        self.assertEqual(bars["1d"]["date"], ["2024-01-02"])
+        self.assertEqual([bars["1d"][name][0] for name in COLUMN_ORDER[1:]],
+                         [1.0, 9.0, 0.25, 5.0, 100.0])
+
+    def test_matches_naive_grouping(self):
+        timeframes = ["3m", "15m", "1h", "7h", "1d"]
+        bars = resample_columns(self.columns, timeframes)
+        for label in timeframes:
+            with self.subTest(timeframe=label):
+                expected = naive_resample(self.columns, parse_timeframe(label))
+                actual = bars[label]
+                self.assertEqual([date_to_seconds(d) // parse_timeframe(label)
+                                  for d in actual["date"]], list(expected))
+                self.assertEqual([[actual[name][i] for name in COLUMN_ORDER[1:]]
+                                  for i in range(len(actual["date"]))],
+                                 list(expected.values()))
+
+    def test_chunked_feed_matches_one_pass(self):
+        timeframes = ["5m", "1h", "1d"]
+        expected = resample_columns(self.columns, timeframes)
+        rng = random.Random(3)
+        resampler = Resampler(timeframes)
+        actual = {label: {name: [] for name in COLUMN_ORDER} for label in timeframes}
+        start = 0
+        while start < len(self.columns["date"]):
+            stop = start + rng.randint(1, 400)
+            chunk = {name: values[start:stop] for name, values in self.columns.items()}
+            for label, bars in resampler.feed(chunk).items():
+                for name, values in bars.items():
+                    actual[label][name].extend(values)
+            start = stop
+        for label, bars in resampler.finish().items():
+            for name, values in bars.items():
+                actual[label][name].extend(values)
+        for label in timeframes:
+            for name in COLUMN_ORDER:
+                self.assertEqual(list(actual[label][name]), list(expected[label][name]))
+
+    def test_rejects_bad_dates(self):
+        columns = {name: self.columns[name][:3] for name in COLUMN_ORDER}
+        columns["date"] = list(reversed(columns["date"]))
+        with self.assertRaisesRegex(ValueError, "ascending"):
+            resample_columns(columns, ["5m"])
+        columns["date"][1] = "yesterday"
+        with self.assertRaisesRegex(ValueError, "Invalid date 'yesterday'"):
+            resample_columns(columns, ["5m"])
+
+    def test_run_resampled(self):
+        output = os.path.join(self.tmpdir.name, "out.json")
+        row_count, results = run_resampled(self.csv_path, output, ["15m", "1h"],
+                                           chunk_size=250)
+        self.assertEqual(row_count, 3000)
+        bars = resample_columns(self.columns, ["1h"])["1h"]
+        path, bar_count, counts = results["1h"]
+        self.assertEqual(path, os.path.join(self.tmpdir.name, "out_1h.json"))
+        with open(path) as f:
+            records = json.load(f)
+        rsi = calculate_rsi(bars["close"])
+        self.assertEqual(records, [{"date": d, "close": c,
+                                    "rsi": round(r, 2) if r is not None else None,
+                                    "signal": s}
+                                   for d, c, r, s in zip(bars["date"], bars["close"], rsi,
+                                                         generate_signals(rsi))])
+        self.assertEqual(bar_count, len(records))
+        self.assertEqual(sum(counts.values()), bar_count)
+        self.assertEqual(results["15m"][1], 200)
+
+    def test_run_resampled_error_leaves_no_outputs(self):
+        with open(self.csv_path) as f:
+            lines = f.readlines()
+        lines[2501] = lines[2501].replace(lines[2501][:10], "2000-01-01", 1)
+        with open(self.csv_path, "w") as f:
+            f.writelines(lines)
+        output = os.path.join(self.tmpdir.name, "r.json")
+        with self.assertRaisesRegex(ValueError, "ascending"):
+            run_resampled(self.csv_path, output, ["5m", "1h"], chunk_size=100)
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ["minutes.csv"])
+
+    def test_run_resampled_lenient(self):
+        dirty = os.path.join(self.tmpdir.name, "dirty.csv")
+        with open(dirty, "w") as f:
+            f.write("date,open,high,low,close,volume\n"
+                    "2024-01-02 09:30:00,1,2,0.5,1.5,10\n"
+                    "2024-01-02 09:31:00,1,2,0.5,bad,10\n"
+                    "2024-01-02 09:32:00,1,2,0.5,2.5,10\n")
+        output = os.path.join(self.tmpdir.name, "out.json")
+        with self.assertRaisesRegex(ValueError, "Invalid close value 'bad' on line 3"):
+            run_resampled(dirty, output, ["5m"])
+        errors = ParseErrors()
+        row_count, results = run_resampled(dirty, output, ["5m"], errors=errors)
+        self.assertEqual((row_count, results["5m"][:2]), (2, (output, 1)))
+        with open(output) as f:
+            self.assertEqual(json.load(f)[0]["close"], 2.5)
+        self.assertEqual(len(errors.errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
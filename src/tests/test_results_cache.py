@@ -0,0 +1,113 @@
+"""Tests for the memoized results cache."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib import results_cache
+from lib.csv_reader import ParseErrors
+from lib.pipeline import run_in_memory
+from lib.results_cache import ResultsCache
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestResultsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+        self.csv_path = os.path.join(self.tmpdir.name, "input.csv")
+        shutil.copy(SAMPLE, self.csv_path)
+
+    def _run(self, cache, name="out.json", **kwargs):
+        output = os.path.join(self.tmpdir.name, name)
+        result = run_in_memory(self.csv_path, output, results_cache=cache, **kwargs)
+        with open(output, "rb") as f:
+            return result, f.read()
+
+    def test_hits_produce_identical_output(self):
+        cache = ResultsCache(self.cache_dir)
+        expected, expected_text = self._run(None, "plain.json")
+        self.assertEqual(self._run(cache), (expected, expected_text))
+        self.assertEqual(self._run(cache), (expected, expected_text))
+        self.assertEqual(cache.stats(), {"memory_hits": 1, "disk_hits": 0, "misses": 1,
+                                         "memory_entries": 1})
+
+        fresh = ResultsCache(self.cache_dir)
+        self.assertEqual(self._run(fresh), (expected, expected_text))
+        self.assertEqual((fresh.disk_hits, fresh.misses), (1, 0))
+        self.assertEqual(self._run(fresh, "out.col", fmt="columnar")[0], expected)
+
+    def test_nan_rsi_survives_disk_hits(self):
+        with open(SAMPLE) as f:
+            lines = f.readlines()
+        # A NaN close makes every later RSI NaN, unlike the None warm-up
+        lines[20] = "2024-01-20,1,2,0.5,nan,10\n"
+        with open(self.csv_path, "w") as f:
+            f.writelines(lines)
+        expected = self._run(None, "plain.json")
+        self.assertIn(b'"rsi": NaN', expected[1])
+        self.assertIn(b'"rsi": null', expected[1])
+        self._run(ResultsCache(self.cache_dir))
+        fresh = ResultsCache(self.cache_dir)
+        self.assertEqual(self._run(fresh), expected)
+        self.assertEqual(fresh.disk_hits, 1)
+
+    def test_key_covers_input_and_settings(self):
+        cache = ResultsCache(self.cache_dir)
+        key = cache.key(self.csv_path, 14, 30, 70)
+        copy = os.path.join(self.tmpdir.name, "copy.csv")
+        shutil.copy(self.csv_path, copy)
+        self.assertEqual(cache.key(copy, 14, 30, 70), key)
+        self.assertNotEqual(cache.key(self.csv_path, 7, 30, 70), key)
+        self.assertNotEqual(cache.key(self.csv_path, 14, 20, 80), key)
+        self.assertNotEqual(cache.key(self.csv_path, 14, 30, 70, "numpy"), key)
+        with open(self.csv_path, "a") as f:
+            f.write("2024-03-01,1,2,0.5,1.5,10\n")
+        self.assertNotEqual(cache.key(self.csv_path, 14, 30, 70), key)
+        with self.assertRaises(FileNotFoundError):
+            cache.key(os.path.join(self.tmpdir.name, "missing.csv"), 14, 30, 70)
+
+    def test_code_change_invalidates(self):
+        cache = ResultsCache(self.cache_dir)
+        key = cache.key(self.csv_path, 14, 30, 70)
+        saved = dict(results_cache._code_versions)
+        self.addCleanup(results_cache._code_versions.update, saved)
+        results_cache._code_versions["python"] = "0" * 16
+        self.assertNotEqual(cache.key(self.csv_path, 14, 30, 70), key)
+
+    def test_memory_lru_is_bounded(self):
+        cache = ResultsCache(self.cache_dir, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, self.csv_path, ["2024-01-01"], [1.0], [None], bytes(1))
+        self.assertEqual(list(cache._memory), ["b", "c"])
+        cache.get("b", self.csv_path)
+        cache.put("d", self.csv_path, ["2024-01-01"], [1.0], [None], bytes(1))
+        self.assertEqual(list(cache._memory), ["b", "d"])
+        # "a" left memory but is still on disk
+        self.assertEqual(cache.get("a", self.csv_path).rsi, [None])
+        self.assertEqual((cache.memory_hits, cache.disk_hits), (1, 1))
+
+    def test_disk_eviction(self):
+        cache = ResultsCache(self.cache_dir, max_bytes=1)
+        for key in ("a", "b"):
+            cache.put(key, self.csv_path, ["2024-01-01"], [1.0], [50.0], bytes(1))
+        self.assertEqual(os.listdir(self.cache_dir), ["b.res"])
+
+    def test_rebuild_and_lenient_skip_lookup(self):
+        cache = ResultsCache(self.cache_dir)
+        self._run(cache)
+        cache.rebuild = True
+        self._run(cache)
+        self.assertEqual((cache.memory_hits, cache.misses), (0, 2))
+        self._run(cache, errors=ParseErrors())
+        self.assertEqual(cache.misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,14 @@
 """Tests for the RSI calculator module."""
 
+import json
 import os
+import random
 import sys
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from lib.rsi import calculate_rsi
+from lib.rsi import RSIStream, calculate_rsi, calculate_rsi_multi
+from lib.signals import generate_signal
 
 
 class TestRsi(unittest.TestCase):
@@ -86,5 +89,69 @@ class TestRsi(unittest.TestCase):
         self.assertAlmostEqual(rsi[14], 72.98, delta=0.1)
 
 
+class TestRsiMulti(unittest.TestCase):
+
+    def test_columns_match_single_period_runs(self):
+        rng = random.Random(3)
+        prices = [100.0 + rng.uniform(-5.0, 5.0) for _ in range(120)]
+        periods = [2, 7, 14, 21, 50]
+        columns = calculate_rsi_multi(prices, periods)
+        self.assertEqual(len(columns), len(periods))
+        for period, column in zip(periods, columns):
+            self.assertEqual(column, calculate_rsi(prices, period))
+
+    def test_periods_longer_than_series(self):
+        prices = [100.0 + i for i in range(10)]
+        columns = calculate_rsi_multi(prices, [5, 14])
+        self.assertEqual(columns[1], [None] * 10)
+        self.assertEqual(columns[0], calculate_rsi(prices, 5))
+
+    def test_empty_inputs(self):
+        self.assertEqual(calculate_rsi_multi([], [14]), [[]])
+        self.assertEqual(calculate_rsi_multi([1.0, 2.0], []), [])
+
+
+class TestRsiStream(unittest.TestCase):
+
+    def _prices(self, n, seed=7):
+        rng = random.Random(seed)
+        prices = [100.0]
+        for _ in range(n - 1):
+            prices.append(prices[-1] + rng.uniform(-2.0, 2.0))
+        return prices
+
+    def test_matches_calculate_rsi_bar_for_bar(self):
+        for period in (1, 2, 14, 30):
+            prices = self._prices(200, seed=period)
+            stream = RSIStream(period)
+            streamed = [stream.update(p)[0] for p in prices]
+            self.assertEqual(streamed, calculate_rsi(prices, period))
+
+    def test_update_returns_signal(self):
+        stream = RSIStream()
+        for price in self._prices(40):
+            rsi, signal = stream.update(price)
+            self.assertEqual(signal, generate_signal(rsi))
+
+    def test_warmup_returns_none(self):
+        stream = RSIStream()
+        for i in range(14):
+            self.assertEqual(stream.update(100.0 + i), (None, None))
+        self.assertEqual(stream.update(114.0), (100.0, "SELL"))
+        self.assertEqual(stream.count, 15)
+
+    def test_resume_from_serialized_state(self):
+        """A stream restored from JSON continues exactly where it stopped."""
+        prices = self._prices(120)
+        expected = calculate_rsi(prices)
+        for split in (0, 5, 14, 15, 60):
+            stream = RSIStream()
+            results = [stream.update(p)[0] for p in prices[:split]]
+            state = json.loads(json.dumps(stream.to_dict()))
+            resumed = RSIStream.from_dict(state)
+            results.extend(resumed.update(p)[0] for p in prices[split:])
+            self.assertEqual(results, expected, f"split at {split}")
+
+
 if __name__ == "__main__":
     unittest.main()
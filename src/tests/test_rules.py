@@ -0,0 +1,58 @@
+"""Tests for signal rules combining indicator columns."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lib.rsi import calculate_rsi
+from lib.rules import (
+    DEFAULT_BUY_RULE, DEFAULT_SELL_RULE, evaluate_rules, parse_rule, rule_columns,
+)
+from lib.signals import BUY, HOLD, PENDING, SELL, encode_signals
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.csv")
+
+
+class TestParseRule(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_rule("rsi<30, close >= sma_50,macd>-0.5"),
+                         [("rsi", "<", 30.0), ("close", ">=", "sma_50"),
+                          ("macd", ">", -0.5)])
+        self.assertEqual(rule_columns(parse_rule("rsi<30,close<sma"), parse_rule("rsi>70")),
+                         ["rsi", "close", "sma"])
+
+    def test_invalid(self):
+        for text in ("", "rsi", "rsi<", "rsi=30", "rsi<<30", "rsi<30,", "1x<2", "a<b<c"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_rule(text)
+
+
+class TestEvaluateRules(unittest.TestCase):
+
+    def test_default_rules_match_encode_signals(self):
+        from lib.csv_reader import read_csv_columns
+        rsi = calculate_rsi(read_csv_columns(SAMPLE, ("close",))["close"])
+        result = evaluate_rules({"rsi": rsi}, parse_rule(DEFAULT_BUY_RULE),
+                                parse_rule(DEFAULT_SELL_RULE), len(rsi))
+        self.assertEqual(result, encode_signals(rsi))
+
+    def test_combined_conditions(self):
+        columns = {"a": [None, 1.0, 1.0, 5.0, 5.0], "b": [0.0, None, 2.0, 2.0, 9.0]}
+        codes, counts = evaluate_rules(columns, parse_rule("a<b,a<3"), parse_rule("a>b"), 5)
+        self.assertEqual(list(codes), [PENDING, PENDING, BUY, SELL, HOLD])
+        self.assertEqual(counts, [2, 1, 1, 1])
+
+    def test_buy_checked_before_sell(self):
+        codes, _ = evaluate_rules({"a": [1.0]}, parse_rule("a>0"), parse_rule("a>0"), 1)
+        self.assertEqual(list(codes), [BUY])
+
+    def test_unknown_column(self):
+        with self.assertRaisesRegex(ValueError, "unknown columns"):
+            evaluate_rules({"rsi": [1.0]}, parse_rule("macd>0"), parse_rule("rsi>70"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,12 @@
 import os
 import sys
 import unittest
+from array import array
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from lib.signals import generate_signal, generate_signals
+from lib.signals import (BUY, HOLD, PENDING, SELL, SIGNAL_NAMES, decode_signals,
+                         encode_signals, generate_signal, generate_signals,
+                         generate_signals_matrix)
 
 
 class TestSignals(unittest.TestCase):
@@ -52,6 +55,43 @@ class TestSignals(unittest.TestCase):
         self.assertEqual(generate_signal(0.0), "BUY")
         self.assertEqual(generate_signal(100.0), "SELL")
 
+    def test_custom_thresholds(self):
+        self.assertEqual(generate_signal(25.0, lower=20, upper=80), "HOLD")
+        self.assertEqual(generate_signal(19.9, lower=20, upper=80), "BUY")
+        self.assertEqual(generate_signal(80.0, lower=20, upper=80), "HOLD")
+        self.assertEqual(generate_signal(80.1, lower=20, upper=80), "SELL")
+        self.assertEqual(generate_signals([None, 25.0, 85.0], 20, 80), [None, "HOLD", "SELL"])
+
+    def test_signals_matrix_per_column_thresholds(self):
+        columns = [[None, 25.0, 75.0], [None, 25.0, 75.0]]
+        result = generate_signals_matrix(columns, [30, 20], [70, 80])
+        self.assertEqual(result, [[None, "BUY", "SELL"], [None, "HOLD", "HOLD"]])
+
+    def test_signals_matrix_threshold_count_mismatch(self):
+        with self.assertRaises(ValueError):
+            generate_signals_matrix([[50.0]], [30, 20], [70])
+
+    def test_encode_signals_codes_and_counts(self):
+        codes, counts = encode_signals([None, None, 25.0, 50.0, 75.0, 30.0, 70.0, 10.0])
+        self.assertIsInstance(codes, array)
+        self.assertEqual(codes.typecode, "b")
+        self.assertEqual(list(codes), [PENDING, PENDING, BUY, HOLD, SELL, HOLD, HOLD, BUY])
+        self.assertEqual(counts, [2, 2, 1, 3])
+        self.assertEqual(decode_signals(codes),
+                         [None, None, "BUY", "HOLD", "SELL", "HOLD", "HOLD", "BUY"])
+
+    def test_encode_signals_matches_generate_signal(self):
+        rsi_values = [None] + [i / 4 for i in range(401)]
+        codes, counts = encode_signals(rsi_values, 20, 80)
+        expected = [generate_signal(v, 20, 80) for v in rsi_values]
+        self.assertEqual([SIGNAL_NAMES[c] for c in codes], expected)
+        self.assertEqual(counts, [expected.count(name) for name in SIGNAL_NAMES])
+
+    def test_encode_signals_empty(self):
+        codes, counts = encode_signals([])
+        self.assertEqual(len(codes), 0)
+        self.assertEqual(counts, [0, 0, 0, 0])
+
 
 if __name__ == "__main__":
     unittest.main()